@@ -267,7 +267,7 @@ def test_manufacturers():
     print("\n--- Listing all manufacturers ---")
     response = requests.get(f"{BASE_URL}/manufacturers")
     handle_response(response)
-    return response.json() if response.status_code == 200 else []
+    return response.json()['results'] if response.status_code == 200 else []
 
 def main():
     """Run all tests"""
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'registry.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -52,10 +53,81 @@ REST_FRAMEWORK = {
         # 'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_jwt.authentication.JSONWebTokenAuthentication',
+        'registry.auth.JWTClaimsAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'registry.pagination.KeysetPagination',
+}
+
+# List endpoint page sizes (clients may pass ?limit= up to the maximum)
+REGISTRY_PAGE_SIZE = int(os.environ.get('REGISTRY_PAGE_SIZE', '100'))
+REGISTRY_MAX_PAGE_SIZE = int(os.environ.get('REGISTRY_MAX_PAGE_SIZE', '1000'))
+
+# Render GET lists from values() rows with the compiled read-only serializers
+REGISTRY_FAST_SERIALIZATION = os.environ.get('REGISTRY_FAST_SERIALIZATION', 'True') == 'True'
+
+# Rows fetched per server-side cursor round trip by the streaming export endpoints
+REGISTRY_EXPORT_CHUNK_SIZE = int(os.environ.get('REGISTRY_EXPORT_CHUNK_SIZE', '2000'))
+
+# Seconds reference data (manufacturers) stays cached; entries are also dropped on any change
+REGISTRY_REFERENCE_CACHE_TIMEOUT = int(os.environ.get('REGISTRY_REFERENCE_CACHE_TIMEOUT', '86400'))
+
+# RID resolution cache: per-process LRU size and TTL, and the TTL of the shared tier
+REGISTRY_RID_CACHE_SIZE = int(os.environ.get('REGISTRY_RID_CACHE_SIZE', '10000'))
+REGISTRY_RID_CACHE_LOCAL_TTL = int(os.environ.get('REGISTRY_RID_CACHE_LOCAL_TTL', '5'))
+REGISTRY_RID_CACHE_TIMEOUT = int(os.environ.get('REGISTRY_RID_CACHE_TIMEOUT', '3600'))
+
+# Longest any cache entry lives when CACHE_BACKEND is per-process (LocMemCache): a change in one worker cannot
+# invalidate the other workers' copies, they have to age out
+REGISTRY_PROCESS_CACHE_TIMEOUT = int(os.environ.get('REGISTRY_PROCESS_CACHE_TIMEOUT', '5'))
+
+# Most identifiers accepted by one batch RID resolution request
+REGISTRY_RESOLVE_MAX_IDS = int(os.environ.get('REGISTRY_RESOLVE_MAX_IDS', '5000'))
+
+# RID module heartbeats: seconds between write-behind flushes (0 writes at the end of each request),
+# modules per UPDATE statement and most sightings accepted per request
+REGISTRY_HEARTBEAT_FLUSH_INTERVAL = float(os.environ.get('REGISTRY_HEARTBEAT_FLUSH_INTERVAL', '2'))
+REGISTRY_HEARTBEAT_BATCH_SIZE = int(os.environ.get('REGISTRY_HEARTBEAT_BATCH_SIZE', '250'))
+REGISTRY_HEARTBEAT_MAX_SIGHTINGS = int(os.environ.get('REGISTRY_HEARTBEAT_MAX_SIGHTINGS', '10000'))
+
+# Most items accepted by one bulk registration request
+REGISTRY_BULK_MAX_ITEMS = int(os.environ.get('REGISTRY_BULK_MAX_ITEMS', '1000'))
+
+# Per-route request metrics exported at /api/v1/metrics. Under gunicorn point REGISTRY_METRICS_DIR at a directory
+# shared by the workers (emptied on start) so the export covers all of them; snapshots are written at most every
+# REGISTRY_METRICS_FLUSH_INTERVAL seconds. Latency histogram bucket bounds are in seconds.
+REGISTRY_METRICS_ENABLED = os.environ.get('REGISTRY_METRICS_ENABLED', 'True') == 'True'
+REGISTRY_METRICS_DIR = os.environ.get('REGISTRY_METRICS_DIR', '')
+REGISTRY_METRICS_FLUSH_INTERVAL = float(os.environ.get('REGISTRY_METRICS_FLUSH_INTERVAL', '5'))
+REGISTRY_METRICS_BUCKETS = [float(bound) for bound in os.environ.get(
+    'REGISTRY_METRICS_BUCKETS', '0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10').split(',')]
+
+# Application logs are written as JSON lines to stdout by a background thread (registry.logs.AsyncJSONHandler).
+# REGISTRY_LOG_SAMPLE_RATES keeps a fraction of the records below WARNING per logger, e.g. "registry.views=0.1".
+REGISTRY_LOG_LEVEL = os.environ.get('REGISTRY_LOG_LEVEL', 'INFO')
+REGISTRY_LOG_QUEUE_SIZE = int(os.environ.get('REGISTRY_LOG_QUEUE_SIZE', '10000'))
+REGISTRY_LOG_MAX_FIELD_LENGTH = int(os.environ.get('REGISTRY_LOG_MAX_FIELD_LENGTH', '200'))
+REGISTRY_LOG_SAMPLE_RATES = dict(
+    rate.split('=', 1) for rate in os.environ.get('REGISTRY_LOG_SAMPLE_RATES', '').split(',') if '=' in rate)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sampling': {'()': 'registry.logs.SamplingFilter', 'rates': REGISTRY_LOG_SAMPLE_RATES},
+    },
+    'handlers': {
+        'json': {
+            'class': 'registry.logs.AsyncJSONHandler',
+            'filters': ['sampling'],
+            'queue_size': REGISTRY_LOG_QUEUE_SIZE,
+            'max_length': REGISTRY_LOG_MAX_FIELD_LENGTH,
+        },
+    },
+    'loggers': {
+        'registry': {'handlers': ['json'], 'level': REGISTRY_LOG_LEVEL, 'propagate': False},
+    },
 }
 
 ROOT_URLCONF = 'ohio.urls'
@@ -86,6 +158,14 @@ DATABASES = {
     )
 }
 
+# Cache (use a shared backend such as memcached in production so every worker sees the same versions)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'droneregistry'),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -143,6 +223,21 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'registry/static'),
 ]
 
+# Bearer token verification. Signing keys come from a JWKS document given inline, as a file or as a URL such as
+# https://<tenant>/.well-known/jwks.json, and are reloaded when a token names an unknown key ID (at most every
+# REGISTRY_JWT_JWKS_REFRESH_INTERVAL seconds). Without a key source tokens are decoded unverified (development only).
+REGISTRY_JWT_JWKS = os.environ.get('REGISTRY_JWT_JWKS', '')
+REGISTRY_JWT_JWKS_FILE = os.environ.get('REGISTRY_JWT_JWKS_FILE', '')
+REGISTRY_JWT_JWKS_URL = os.environ.get('REGISTRY_JWT_JWKS_URL', '')
+REGISTRY_JWT_JWKS_REFRESH_INTERVAL = int(os.environ.get('REGISTRY_JWT_JWKS_REFRESH_INTERVAL', '60'))
+REGISTRY_JWT_ALGORITHMS = os.environ.get('REGISTRY_JWT_ALGORITHMS', 'RS256').split(',')
+REGISTRY_JWT_AUDIENCE = os.environ.get('REGISTRY_JWT_AUDIENCE', '')
+REGISTRY_JWT_ISSUER = os.environ.get('REGISTRY_JWT_ISSUER', '')
+
+# Decoded token claims cached per worker until the token expires (tokens without exp: the TTL in seconds)
+REGISTRY_JWT_CLAIMS_CACHE_SIZE = int(os.environ.get('REGISTRY_JWT_CLAIMS_CACHE_SIZE', '10000'))
+REGISTRY_JWT_CLAIMS_CACHE_TTL = int(os.environ.get('REGISTRY_JWT_CLAIMS_CACHE_TTL', '300'))
+
 # Authentication bypass for testing
 BYPASS_AUTHENTICATION = os.environ.get('BYPASS_AUTHENTICATION', 'False') == 'True'
 
@@ -40,10 +40,12 @@ urlpatterns = [
     path('api/v1/aircraft', registryviews.AircraftList.as_view()),
     path('api/v1/aircraft/<uuid:pk>', registryviews.AircraftDetail.as_view()),
     path('api/v1/aircraft/esn/<esn>', registryviews.AircraftESNDetails.as_view()),
+    path('api/v1/aircraft/registration/<mark>', registryviews.AircraftRegistrationDetails.as_view()),
     # Aircraft endpoints (plural form for compatibility)
     path('api/v1/aircrafts', registryviews.AircraftList.as_view()),
     path('api/v1/aircrafts/<uuid:pk>', registryviews.AircraftDetail.as_view()),
     path('api/v1/aircrafts/esn/<esn>', registryviews.AircraftESNDetails.as_view()),
+    path('api/v1/aircrafts/registration/<mark>', registryviews.AircraftRegistrationDetails.as_view()),
     
     # Contact endpoints
     path('api/v1/contacts', registryviews.ContactList.as_view()),
@@ -64,8 +66,22 @@ urlpatterns = [
     path('api/v1/rid-modules/<uuid:pk>/rid-id', registryviews.RIDModuleRIDIDUpdate.as_view()),
     path('api/v1/rid-modules/by-rid/<uuid:rid_id>', registryviews.RIDModuleByRIDID.as_view()),
     path('api/v1/rid-modules/by-esn/<str:module_esn>', registryviews.RIDModuleByESN.as_view()),
+    path('api/v1/rid-modules/resolve', registryviews.RIDModuleResolve.as_view()),
+    path('api/v1/rid-modules/heartbeat', registryviews.RIDModuleHeartbeat.as_view()),
+    path('api/v1/rid-modules/cache-stats', registryviews.RIDModuleCacheStats.as_view()),
     path('api/v1/operators/<uuid:pk>/rid-modules', registryviews.OperatorRIDModules.as_view()),
     path('api/v1/aircraft/<uuid:pk>/rid-modules', registryviews.AircraftRIDModules.as_view()),
+
+    # Bulk export endpoints (NDJSON or CSV)
+    path('api/v1/export/operators', registryviews.OperatorExport.as_view()),
+    path('api/v1/export/aircraft', registryviews.AircraftExport.as_view()),
+    path('api/v1/export/rid-modules', registryviews.RIDModuleExport.as_view()),
+
+    # Full-text search
+    path('api/v1/search', registryviews.RegistrySearch.as_view()),
+
+    # Prometheus metrics
+    path('api/v1/metrics', registryviews.RegistryMetrics.as_view()),
     
 ]+ static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
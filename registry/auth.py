@@ -1,43 +1,206 @@
-import os
+import hashlib
 import json
+import logging
+import threading
+import time
+
 import jwt
-from django.http import JsonResponse
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from functools import wraps
+from jwt.algorithms import get_default_algorithms
 from six.moves.urllib import request as req
 from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
 from rest_framework.response import Response
 
+from registry.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Algorithm assumed for keys that do not name one
+KEY_TYPE_ALGORITHMS = {'RSA': 'RS256', 'EC': 'ES256', 'oct': 'HS256'}
+
+
 def get_token_auth_header(request):
     """Obtains the Access Token from the Authorization Header"""
     auth = request.META.get("HTTP_AUTHORIZATION", "")
     parts = auth.split()
-    
+
     if not parts or parts[0].lower() != "bearer":
         return None
-    
+
     token = parts[1] if len(parts) == 2 else None
     return token
 
+
+class JWKSKeySet(object):
+    """
+    Token signing keys by key ID, loaded from REGISTRY_JWT_JWKS (the JWKS document itself), REGISTRY_JWT_JWKS_FILE
+    or REGISTRY_JWT_JWKS_URL and kept in memory. A token signed with an unknown key ID reloads the source, at most
+    once every REGISTRY_JWT_JWKS_REFRESH_INTERVAL seconds, so key rotation is picked up without a restart.
+    """
+
+    def __init__(self):
+        self.keys = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def configured():
+        return bool(settings.REGISTRY_JWT_JWKS or settings.REGISTRY_JWT_JWKS_FILE or settings.REGISTRY_JWT_JWKS_URL)
+
+    def fetch(self):
+        if settings.REGISTRY_JWT_JWKS:
+            document = settings.REGISTRY_JWT_JWKS
+            if isinstance(document, str):
+                document = json.loads(document)
+        elif settings.REGISTRY_JWT_JWKS_FILE:
+            with open(settings.REGISTRY_JWT_JWKS_FILE) as source:
+                document = json.load(source)
+        else:
+            with req.urlopen(settings.REGISTRY_JWT_JWKS_URL, timeout=5) as response:
+                document = json.loads(response.read().decode('utf-8'))
+
+        algorithms = get_default_algorithms()
+        keys = {}
+        for jwk in document.get('keys', []):
+            algorithm = algorithms.get(jwk.get('alg') or KEY_TYPE_ALGORITHMS.get(jwk.get('kty')))
+            if algorithm is None or jwk.get('use', 'sig') != 'sig':
+                continue
+            try:
+                keys[jwk.get('kid')] = algorithm.from_jwk(json.dumps(jwk))
+            except (jwt.PyJWTError, ValueError) as exc:
+                # One malformed key must not take the others down with it.
+                logger.warning("Skipping JWKS key %s: %s", jwk.get('kid'), exc)
+        return keys
+
+    def get(self, kid):
+        """ Key for kid (or the only key when the token names none), None when unknown even after a reload """
+        keys = self.keys
+        if keys is None or (kid not in keys and self.can_refresh()):
+            with self.lock:
+                if self.keys is None or (kid not in self.keys and self.can_refresh()):
+                    self.reload()
+            keys = self.keys
+        if kid is None and len(keys) == 1:
+            return next(iter(keys.values()))
+        return keys.get(kid)
+
+    def can_refresh(self):
+        return time.monotonic() - self.loaded_at >= settings.REGISTRY_JWT_JWKS_REFRESH_INTERVAL
+
+    def reload(self):
+        self.loaded_at = time.monotonic()
+        try:
+            self.keys = self.fetch()
+        except (OSError, ValueError) as exc:
+            # Keep the keys we have, the next unknown key ID retries after the refresh interval.
+            logger.warning("Could not load JWKS: %s", exc)
+            if self.keys is None:
+                self.keys = {}
+
+    def clear(self):
+        with self.lock:
+            self.keys = None
+            self.loaded_at = 0.0
+
+
+jwks = JWKSKeySet()
+
+# Decoded claims by SHA-256 of the token, dropped no later than the token's exp
+claims_cache = LRUCache(settings.REGISTRY_JWT_CLAIMS_CACHE_SIZE, settings.REGISTRY_JWT_CLAIMS_CACHE_TTL)
+
+
+def decode_token(token):
+    """
+    Claims of token, verified against the JWKS keys when a key source is configured (decoded unverified otherwise,
+    for development). Results are cached for REGISTRY_JWT_CLAIMS_CACHE_TTL seconds, never past the token's exp,
+    so a token is verified about once per worker.
+    Raises jwt.PyJWTError for tokens that do not verify.
+    """
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    claims = claims_cache.get(key)
+    if claims is not None:
+        return claims
+
+    if jwks.configured():
+        header = jwt.get_unverified_header(token)
+        signing_key = jwks.get(header.get('kid'))
+        if signing_key is None:
+            raise jwt.InvalidTokenError('Unknown signing key')
+        claims = jwt.decode(token, signing_key, algorithms=settings.REGISTRY_JWT_ALGORITHMS,
+                            audience=settings.REGISTRY_JWT_AUDIENCE or None,
+                            issuer=settings.REGISTRY_JWT_ISSUER or None,
+                            options={'verify_aud': bool(settings.REGISTRY_JWT_AUDIENCE)})
+    else:
+        claims = jwt.decode(token, verify=False)
+
+    ttl = settings.REGISTRY_JWT_CLAIMS_CACHE_TTL
+    if isinstance(claims.get('exp'), (int, float)):
+        ttl = min(ttl, claims['exp'] - time.time())
+    if ttl > 0:
+        claims_cache.set(key, claims, ttl)
+    return claims
+
+
+def get_request_claims(request):
+    """
+    Claims of the request's bearer token, or None without one. The token is decoded once per request, the result
+    is kept on the request (also as request.auth_claims) for the authentication class and the decorators.
+    Raises jwt.PyJWTError for an invalid token.
+    """
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_registry_auth'):
+        token = get_token_auth_header(http_request)
+        claims = error = None
+        if token:
+            try:
+                claims = decode_token(token)
+            except jwt.PyJWTError as exc:
+                error = exc
+        http_request._registry_auth = (claims, error)
+        http_request.auth_claims = claims
+    claims, error = http_request._registry_auth
+    if error is not None:
+        raise error
+    return claims
+
+
+class JWTClaimsAuthentication(BaseAuthentication):
+    """
+    DRF authentication from the bearer token claims, sharing the per-request decode with requires_auth.
+    Sets request.auth to the claims; invalid tokens are left for requires_auth / requires_scope to reject.
+    """
+
+    def authenticate(self, request):
+        try:
+            claims = get_request_claims(request)
+        except jwt.PyJWTError:
+            return None
+        if claims is None:
+            return None
+        return (AnonymousUser(), claims)
+
+    def authenticate_header(self, request):
+        return 'Bearer'
+
+
 def requires_auth(view_func):
     """Determines if the Access Token is valid"""
     @wraps(view_func)
     def decorated(self, request, *args, **kwargs):
         # Check if authentication bypass is enabled
-        bypass_auth = os.environ.get('BYPASS_AUTHENTICATION', 'False') == 'True'
-        if bypass_auth:
+        if settings.BYPASS_AUTHENTICATION:
             return view_func(self, request, *args, **kwargs)
-        
-        token = get_token_auth_header(request)
-        if not token:
-            return Response({"message": "Authorization header is required"}, status=status.HTTP_401_UNAUTHORIZED)
-        
+
         try:
-            # This would validate with Auth0 in a real implementation
-            # For now we're just checking the token exists
-            payload = jwt.decode(token, verify=False)
+            claims = get_request_claims(request)
         except jwt.PyJWTError:
             return Response({"message": "Invalid token"}, status=status.HTTP_401_UNAUTHORIZED)
-            
+        if claims is None:
+            return Response({"message": "Authorization header is required"}, status=status.HTTP_401_UNAUTHORIZED)
+
         return view_func(self, request, *args, **kwargs)
     return decorated
 
@@ -47,26 +210,22 @@ def requires_scope(required_scope):
         @wraps(view_func)
         def decorated(self, request, *args, **kwargs):
             # Check if authentication bypass is enabled
-            bypass_auth = os.environ.get('BYPASS_AUTHENTICATION', 'False') == 'True'
-            if bypass_auth:
+            if settings.BYPASS_AUTHENTICATION:
                 return view_func(self, request, *args, **kwargs)
-            
-            token = get_token_auth_header(request)
-            if not token:
-                return Response({"message": "Authorization header is required"}, status=status.HTTP_401_UNAUTHORIZED)
-            
+
             try:
-                # For demo purposes, we're not verifying the token
-                decoded = jwt.decode(token, verify=False)
+                decoded = get_request_claims(request)
             except jwt.PyJWTError:
                 return Response({"message": "Invalid token"}, status=status.HTTP_401_UNAUTHORIZED)
-                
+            if decoded is None:
+                return Response({"message": "Authorization header is required"}, status=status.HTTP_401_UNAUTHORIZED)
+
             if decoded.get("scope"):
                 token_scopes = decoded["scope"].split()
                 for token_scope in token_scopes:
                     if token_scope == required_scope:
                         return view_func(self, request, *args, **kwargs)
-            
+
             return Response({"message": "You don't have access to this resource"}, status=status.HTTP_403_FORBIDDEN)
         return decorated
     return require_scope
@@ -0,0 +1,185 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+def process_local():
+    """ True when the cache backend lives in each worker process, where invalidations reach no other worker """
+    return isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def shared_timeout(timeout):
+    """ timeout for an entry that other workers must stop serving once invalidated """
+    if process_local():
+        return min(timeout, settings.REGISTRY_PROCESS_CACHE_TIMEOUT)
+    return timeout
+
+
+def version_key(namespace):
+    return 'registry:%s:version' % namespace
+
+
+def get_cache_version(namespace):
+    """ Current version of a cached namespace, every entry key includes it """
+    key = version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted version never comes back as one that was used before.
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(namespace):
+    """ Invalidate every entry of a namespace at once """
+    try:
+        return cache.incr(version_key(namespace))
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(version_key(namespace), version, None)
+        return version
+
+
+def versioned_key(namespace, *parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return 'registry:%s:%s:%s' % (namespace, get_cache_version(namespace), digest)
+
+
+class LRUCache(object):
+    """ Bounded in-process LRU with a per-entry TTL, safe to share between threads """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class RIDResolutionCache(object):
+    """
+    Two-tier cache of serialized RID modules keyed by rid_id and by module_esn.
+    Lookups try the process-local LRU, then the shared Django cache, then the database.
+    Invalidation drops both tiers in this process and the shared tier for every worker;
+    other workers' local tiers age out after REGISTRY_RID_CACHE_LOCAL_TTL seconds. With a per-process backend
+    the "shared" tier is not shared and its entries age out after REGISTRY_PROCESS_CACHE_TIMEOUT seconds too.
+
+    Every invalidation also gives the keys a new generation stamp, once right away and once more when the
+    transaction commits. Readers take the stamp before reading the database and set() drops their result if it
+    changed meanwhile, so a row read before a change committed is not cached after it.
+    """
+    def __init__(self):
+        self.local = LRUCache(settings.REGISTRY_RID_CACHE_SIZE, settings.REGISTRY_RID_CACHE_LOCAL_TTL)
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(('local_hits', 'shared_hits', 'misses', 'invalidations'), 0)
+
+    def key(self, kind, value):
+        if kind == 'rid':
+            return 'registry:rid-module:rid:%s' % str(value).lower()
+        # ESNs come straight from the URL, hash them so the key is always safe for memcached.
+        return 'registry:rid-module:esn:%s' % hashlib.sha1(str(value).encode('utf-8')).hexdigest()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def get(self, kind, value):
+        key = self.key(kind, value)
+        data = self.local.get(key)
+        if data is not None:
+            self.count('local_hits')
+            return data
+        data = cache.get(key)
+        if data is not None:
+            self.local.set(key, data)
+            self.count('shared_hits')
+            return data
+        self.count('misses')
+        return None
+
+    def generation(self, kind, value):
+        """ Stamp to hand to set(), taken before the module is read from the database """
+        return cache.get(self.key(kind, value) + ':generation')
+
+    def set(self, kind, value, data, generation):
+        key = self.key(kind, value)
+        if cache.get(key + ':generation') != generation:
+            # Invalidated while data was being read, it may predate the change.
+            return
+        self.local.set(key, data)
+        cache.set(key, data, shared_timeout(settings.REGISTRY_RID_CACHE_TIMEOUT))
+
+    def invalidate(self, pairs):
+        """ Drop cached modules given (rid_id, module_esn) pairs """
+        keys = []
+        for rid_id, module_esn in pairs:
+            if rid_id is not None:
+                keys.append(self.key('rid', rid_id))
+            if module_esn is not None:
+                keys.append(self.key('esn', module_esn))
+        if keys:
+            self.drop(keys)
+            # Readers that started before the change committed still see the old row.
+            transaction.on_commit(lambda: self.drop(keys))
+            self.count('invalidations', len(keys))
+
+    def drop(self, keys):
+        for key in keys:
+            self.local.delete(key)
+        cache.delete_many(keys)
+        generation = uuid.uuid4().hex
+        cache.set_many({key + ':generation': generation for key in keys},
+                       shared_timeout(settings.REGISTRY_RID_CACHE_TIMEOUT))
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['local_hits'] + stats['shared_hits']) / lookups, 4) if lookups else None
+        stats['local_size'] = len(self.local)
+        return stats
+
+    def clear(self):
+        self.local.clear()
+        with self.lock:
+            for name in self.counters:
+                self.counters[name] = 0
+
+
+rid_cache = RIDResolutionCache()
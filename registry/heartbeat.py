@@ -0,0 +1,112 @@
+import atexit
+import logging
+import operator
+import threading
+from functools import reduce
+
+from django.conf import settings
+from django.db import close_old_connections, models
+from django.db.models import Case, F, Q, Value, When
+
+from registry.models import RIDModule
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatBuffer(object):
+    """
+    Write-behind buffer for RIDModule.last_seen_at.
+    Sightings are coalesced in memory per identifier (only the latest is kept) and flushed every
+    REGISTRY_HEARTBEAT_FLUSH_INTERVAL seconds by a background thread: one SELECT resolves the identifiers,
+    then one UPDATE ... CASE per REGISTRY_HEARTBEAT_BATCH_SIZE modules writes last_seen_at of the modules whose
+    last_seen_at moves forward. An interval of 0 flushes at the end of every request instead.
+    Sightings write nothing else: updated_at, and with it the ?updated_since= change feeds and the ETag /
+    Last-Modified validators, follows registration changes only, and registry.cache.rid_cache is left alone
+    (cached resolutions keep the last_seen_at they were cached with until they expire or the module is saved).
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.thread = None
+        self.wakeup = threading.Event()
+
+    def add(self, sightings):
+        """ Buffers (kind, identifier, seen_at) tuples, kind being 'rid' or 'esn' """
+        self.merge(sightings)
+        if settings.REGISTRY_HEARTBEAT_FLUSH_INTERVAL <= 0:
+            self.flush()
+        else:
+            self.start()
+
+    def merge(self, sightings):
+        """ Keeps the latest seen_at of each (kind, identifier) """
+        with self.lock:
+            for kind, identifier, seen_at in sightings:
+                key = (kind, identifier)
+                current = self.pending.get(key)
+                if current is None or seen_at > current:
+                    self.pending[key] = seen_at
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='registry-heartbeat', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while not self.wakeup.wait(settings.REGISTRY_HEARTBEAT_FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception:
+                # The sightings went back to the buffer, the next flush retries them.
+                logger.exception("Heartbeat flush failed")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """ Writes every buffered sighting, returns the number of modules whose last_seen_at moved """
+        with self.flush_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            if not pending:
+                return 0
+            try:
+                return self.write(pending)
+            except Exception:
+                self.merge((kind, identifier, seen_at) for (kind, identifier), seen_at in pending.items())
+                raise
+
+    def write(self, pending):
+        """ Writes {(kind, identifier): seen_at} sightings """
+        rid_ids = [identifier for kind, identifier in pending if kind == 'rid']
+        module_esns = [identifier for kind, identifier in pending if kind == 'esn']
+        latest = {}
+        modules = RIDModule.objects.filter(Q(rid_id__in=rid_ids) | Q(module_esn__in=module_esns))
+        for pk, rid_id, module_esn in modules.values_list('id', 'rid_id', 'module_esn'):
+            seen = [pending.get(('rid', str(rid_id))), pending.get(('esn', module_esn))]
+            latest[pk] = max(seen_at for seen_at in seen if seen_at is not None)
+
+        updated = 0
+        batch_size = settings.REGISTRY_HEARTBEAT_BATCH_SIZE
+        ids = list(latest)
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            # Only move last_seen_at forward, another worker may already have written a later sighting.
+            moved = reduce(operator.or_, [
+                Q(pk=pk) & (Q(last_seen_at__isnull=True) | Q(last_seen_at__lt=latest[pk])) for pk in batch])
+            last_seen_at = Case(*[When(pk=pk, then=Value(latest[pk])) for pk in batch],
+                                default=F('last_seen_at'), output_field=models.DateTimeField())
+            updated += RIDModule.objects.filter(moved).update(last_seen_at=last_seen_at)
+        return updated
+
+    def stop(self):
+        self.wakeup.set()
+        self.flush()
+
+
+heartbeats = HeartbeatBuffer()
+atexit.register(heartbeats.stop)
@@ -0,0 +1,161 @@
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+
+# Keys whose values are personal data, replaced before a payload is logged (line_1 to line_3 are the short
+# address keys registration forms send)
+REDACTED_FIELDS = frozenset([
+    'email', 'phone_number', 'first_name', 'middle_name', 'last_name', 'address_line_1', 'address_line_2',
+    'address_line_3', 'line_1', 'line_2', 'line_3', 'postcode', 'date_of_birth', 'vat_number', 'insurance_number',
+    'password', 'token',
+])
+
+
+def sanitize(value, max_length, depth=0):
+    """
+    Copy of a request payload that is safe and small to log: personal fields are redacted (in JSON objects sent
+    as strings, such as form-encoded addresses, too), long strings cut to max_length characters and lists to their
+    first 10 items.
+    """
+    if depth > 5:
+        return '...'
+    if hasattr(value, 'dict'):
+        # QueryDict
+        value = value.dict()
+    if isinstance(value, dict):
+        return {str(key): '[redacted]' if str(key).lower() in REDACTED_FIELDS else sanitize(item, max_length, depth + 1)
+                for key, item in list(value.items())[:50]}
+    if isinstance(value, (list, tuple)):
+        items = [sanitize(item, max_length, depth + 1) for item in value[:10]]
+        if len(value) > 10:
+            items.append('... %d more' % (len(value) - 10))
+        return items
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    value = str(value)
+    if value.lstrip().startswith('{'):
+        try:
+            return sanitize(json.loads(value), max_length, depth + 1)
+        except ValueError:
+            pass
+    if len(value) > max_length:
+        return '%s... [%d chars]' % (value[:max_length], len(value))
+    return value
+
+
+class JSONFormatter(logging.Formatter):
+    """ One JSON object per line: time, level, logger, message, the record's payload and any traceback """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload = getattr(record, 'payload', None)
+        if payload is not None:
+            entry['payload'] = payload
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records below WARNING per logger: rates maps a logger name to the fraction kept for it
+    and its children (the most specific name wins). Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = sorted(((name, float(rate)) for name, rate in (rates or {}).items()),
+                            key=lambda item: len(item[0]), reverse=True)
+
+    def rate(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class AsyncJSONHandler(QueueHandler):
+    """
+    Logging handler that never blocks the request thread on I/O: records are reduced to plain data (message,
+    sanitized payload, traceback text) and put on a bounded queue, and a QueueListener thread formats them as JSON
+    and writes them to stream (stdout by default). When the queue is full the record is dropped and counted.
+
+    The listener starts on the first record of each process, so gunicorn workers forked after configuration get
+    their own thread.
+    """
+
+    def __init__(self, stream=None, queue_size=10000, max_length=200):
+        super().__init__(queue.Queue(queue_size))
+        self.stream = stream
+        self.max_length = max_length
+        self.dropped = 0
+        self.listener = None
+        self.pid = None
+        self.start_lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def start(self):
+        with self.start_lock:
+            if self.pid == os.getpid():
+                return
+            target = logging.StreamHandler(self.stream or sys.stdout)
+            target.setFormatter(JSONFormatter())
+            self.listener = QueueListener(self.queue, target, respect_handler_level=False)
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def stop(self):
+        with self.start_lock:
+            if self.listener is not None and self.pid == os.getpid():
+                self.listener.stop()
+            self.listener = self.pid = None
+
+    def prepare(self, record):
+        # Everything that refers to live objects is resolved here, on the calling thread; JSON is left to the listener.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        record.stack_info = None
+        if getattr(record, 'payload', None) is not None:
+            record.payload = sanitize(record.payload, self.max_length)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        if self.pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def flush(self):
+        """ Waits until the listener has written every queued record """
+        if self.pid == os.getpid():
+            self.queue.join()
@@ -0,0 +1,183 @@
+import json
+import re
+import time
+from urllib.parse import quote
+
+import jwt
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, get_resolver
+
+from registry.cache import rid_cache
+from registry.models import Aircraft, Contact, Operator, Pilot, RIDModule
+from registry.synthetic import RegistryGenerator
+
+# First path segment after api/v1/ and the model whose primary keys fill <uuid:pk>
+PK_MODELS = {'operators': Operator, 'aircraft': Aircraft, 'aircrafts': Aircraft, 'contacts': Contact,
+             'pilots': Pilot, 'rid-modules': RIDModule}
+
+PARAMETER = re.compile(r'<(?:(?P<converter>[^>:]+):)?(?P<name>[^>]+)>')
+
+
+def percentile(values, p):
+    """ Nearest-rank percentile of an ascending list """
+    if not values:
+        return 0
+    rank = max(int(round(p / 100.0 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks every endpoint in ohio/urls.py with the Django test client against a synthetic registry '
+            '(generated from a fixed seed in a transaction that is rolled back) and reports p50/p95/p99 latency '
+            'and database queries per endpoint.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint (default 50)')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint (default 2)')
+        parser.add_argument('--operators', type=int, default=200, help='Synthetic operators (default 200)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default 1)')
+        parser.add_argument('--existing', action='store_true',
+                            help='Benchmark the data already in the database instead of generating it')
+        parser.add_argument('--filter', default='', help='Only endpoints whose route contains this text')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file')
+        parser.add_argument('--token', help='Bearer token to send (required when a JWKS is configured, defaults to '
+                                            'an unsigned privileged token)')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1')
+        try:
+            setup_test_environment()
+            own_environment = True
+        except RuntimeError:
+            # Already set up by the test runner.
+            own_environment = False
+        # A private cache keeps benchmark entries (of rolled-back rows) out of the configured cache.
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                              'LOCATION': 'registry-benchmark'}}
+        try:
+            with override_settings(CACHES=caches, REGISTRY_HEARTBEAT_FLUSH_INTERVAL=0), transaction.atomic():
+                rid_cache.clear()
+                if not options['existing']:
+                    counts = RegistryGenerator(seed=options['seed']).generate(operators=options['operators'])
+                    self.stdout.write('Generated %d rows (seed %d)' % (sum(counts.values()), options['seed']))
+                results = self.run(options)
+                transaction.set_rollback(True)
+        finally:
+            rid_cache.clear()
+            if own_environment:
+                teardown_test_environment()
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as out:
+                json.dump(results, out, indent=2)
+
+    def run(self, options):
+        samples = self.samples()
+        token = options['token'] or jwt.encode({'email': 'benchmark@example.com', 'scope': 'read:privileged'},
+                                               'benchmark', algorithm='HS256')
+        if isinstance(token, bytes):
+            token = token.decode('utf-8')
+        client = Client(HTTP_AUTHORIZATION='Bearer ' + token)
+
+        self.stdout.write('%-48s %-6s %5s %8s %8s %8s %8s %8s' % (
+            'endpoint', 'method', 'status', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'max q'))
+        results = []
+        for route, view_class in self.endpoints():
+            if options['filter'] not in route:
+                continue
+            method, body = self.request_for(view_class, samples)
+            if method is None:
+                self.stdout.write('/%-47s skipped (no GET or benchmark body)' % route)
+                continue
+            urls = self.urls(route, samples)
+            if not urls:
+                self.stdout.write('/%-47s skipped (no sample data)' % route)
+                continue
+
+            timings, queries, statuses = [], [], set()
+            for i in range(options['warmup'] + options['requests']):
+                url = urls[i % len(urls)]
+                # The query log is a bounded deque, start each request from an empty one.
+                reset_queries()
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    if method == 'GET':
+                        response = client.get(url)
+                    else:
+                        response = client.post(url, body, content_type='application/json')
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    elapsed = time.perf_counter() - start
+                if i >= options['warmup']:
+                    timings.append(elapsed * 1000)
+                    queries.append(len(captured))
+                    statuses.add(response.status_code)
+
+            timings.sort()
+            queries.sort()
+            result = {'endpoint': '/' + route, 'method': method, 'status': sorted(statuses),
+                      'p50_ms': percentile(timings, 50), 'p95_ms': percentile(timings, 95),
+                      'p99_ms': percentile(timings, 99), 'queries': percentile(queries, 50),
+                      'max_queries': queries[-1]}
+            results.append(result)
+            self.stdout.write('%-48s %-6s %5s %8.2f %8.2f %8.2f %8d %8d' % (
+                result['endpoint'], method, ','.join(str(code) for code in result['status']), result['p50_ms'],
+                result['p95_ms'], result['p99_ms'], result['queries'], result['max_queries']))
+        return results
+
+    def endpoints(self):
+        """ (route, view class) of every URL pattern, format-suffix duplicates, admin and static excluded """
+        for pattern in get_resolver().url_patterns:
+            if not isinstance(pattern, URLPattern):
+                continue
+            route = str(pattern.pattern)
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if view_class is None or 'format' in pattern.pattern.converters or route.startswith('^'):
+                continue
+            yield route, view_class
+
+    def samples(self, size=50):
+        modules = list(RIDModule.objects.order_by('id').values_list('rid_id', 'module_esn')[:size])
+        samples = {name: [str(pk) for pk in model.objects.order_by('id').values_list('pk', flat=True)[:size]]
+                   for name, model in PK_MODELS.items()}
+        samples['rid_id'] = [str(rid_id) for rid_id, esn in modules]
+        samples['module_esn'] = [esn for rid_id, esn in modules]
+        samples['esn'] = list(Aircraft.objects.order_by('id').values_list('esn', flat=True)[:size])
+        names = Operator.objects.order_by('id').values_list('company_name', flat=True)[:size]
+        samples['search'] = [quote(name.split()[0][:4]) for name in names]
+        samples['mark'] = list(Aircraft.objects.exclude(registration_mark=None).order_by('id')
+                               .values_list('registration_mark', flat=True)[:size])
+        return samples
+
+    def urls(self, route, samples):
+        parameters = list(PARAMETER.finditer(route))
+        if route == 'api/v1/search':
+            return ['/%s?q=%s' % (route, word) for word in samples['search']]
+        if not parameters:
+            return ['/' + route]
+        segment = route.split('/')[2] if route.count('/') >= 2 else ''
+        values = []
+        for match in parameters:
+            name = match.group('name')
+            values.append(samples.get(segment if name == 'pk' else name, []))
+        urls = []
+        for i in range(min(len(pool) for pool in values)):
+            url = route
+            for match, pool in zip(parameters, values):
+                url = url.replace(match.group(0), pool[i], 1)
+            urls.append('/' + url)
+        return urls
+
+    def request_for(self, view_class, samples):
+        """ GET where the view has one; the read-style POST endpoints get a generated body """
+        if hasattr(view_class, 'get'):
+            return 'GET', None
+        if view_class.__name__ == 'RIDModuleResolve':
+            return 'POST', {'rid_ids': samples['rid_id'][:25], 'module_esns': samples['module_esn'][25:]}
+        if view_class.__name__ == 'RIDModuleHeartbeat':
+            return 'POST', {'sightings': [{'rid_id': rid_id} for rid_id in samples['rid_id']]}
+        return None, None
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from registry.logs import AsyncJSONHandler, JSONFormatter
+from registry.management.commands.benchmark_endpoints import percentile
+
+
+class SlowStream(object):
+    """ File wrapper whose writes take at least latency seconds, like a stdout pipe under backpressure """
+
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def sample_payload(size):
+    """ An operator registration body of about size bytes """
+    return {
+        'company_name': 'Benchmark Aviation Ltd', 'website': 'https://benchmark.example', 'operator_type': 2,
+        'email': 'ops@benchmark.example', 'phone_number': '+441234567890',
+        'address': {'address_line_1': '1 Runway Road', 'address_line_2': '-', 'address_line_3': '-',
+                    'city': 'Testville', 'country': 'GB', 'postcode': 'TE5 7AA'},
+        'notes': 'x' * max(size - 400, 0),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Compares the request-thread cost of logging a registration payload with print(..., flush=True), a '
+            'synchronous JSON StreamHandler and the queued AsyncJSONHandler, from several threads at once. '
+            'Reports p50/p99 latency per call and the time to write everything out.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent logging threads (default 8)')
+        parser.add_argument('--records', type=int, default=500, help='Records per thread (default 500)')
+        parser.add_argument('--payload-bytes', type=int, default=2000, help='Approximate payload size (default 2000)')
+        parser.add_argument('--sink-latency', type=float, default=0.2,
+                            help='Milliseconds each write to the sink takes (default 0.2, 0 for a plain file)')
+        parser.add_argument('--queue-size', type=int, default=10000, help='AsyncJSONHandler queue size (default 10000)')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1 or options['records'] < 1:
+            raise CommandError('--threads and --records must be at least 1')
+        payload = sample_payload(options['payload_bytes'])
+
+        self.stdout.write('%-10s %10s %10s %10s %12s %8s' % ('method', 'p50 us', 'p99 us', 'max us', 'written s',
+                                                            'dropped'))
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for method in ('print', 'sync', 'queued'):
+                with open(os.path.join(directory, method + '.log'), 'w') as sink:
+                    stream = SlowStream(sink, options['sink_latency'] / 1000.0)
+                    result = self.measure(method, stream, payload, options)
+                results.append(result)
+                self.stdout.write('%-10s %10.1f %10.1f %10.1f %12.3f %8d' % (
+                    method, result['p50_us'], result['p99_us'], result['max_us'], result['written_s'],
+                    result['dropped']))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as out:
+                json.dump(results, out, indent=2)
+
+    def measure(self, method, stream, payload, options):
+        handler = None
+        if method == 'print':
+            def emit():
+                print("Received POST data:", payload, file=stream, flush=True)
+        else:
+            if method == 'sync':
+                handler = logging.StreamHandler(stream)
+                handler.setFormatter(JSONFormatter())
+            else:
+                handler = AsyncJSONHandler(stream=stream, queue_size=options['queue_size'])
+            logger = logging.Logger('registry.benchmark.%s' % method)
+            logger.addHandler(handler)
+
+            def emit():
+                logger.info("Operator registration received", extra={'payload': payload})
+
+        timings = [[] for _ in range(options['threads'])]
+
+        def work(samples):
+            for _ in range(options['records']):
+                start = time.perf_counter()
+                emit()
+                samples.append((time.perf_counter() - start) * 1000000)
+
+        threads = [threading.Thread(target=work, args=(samples,)) for samples in timings]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if handler is not None:
+            handler.flush()
+            handler.close()
+            if isinstance(handler, AsyncJSONHandler):
+                handler.stop()
+        written = time.perf_counter() - start
+
+        samples = sorted(sample for thread_samples in timings for sample in thread_samples)
+        return {'method': method, 'calls': len(samples), 'p50_us': percentile(samples, 50),
+                'p99_us': percentile(samples, 99), 'max_us': samples[-1], 'written_s': written,
+                'dropped': getattr(handler, 'dropped', 0)}
@@ -0,0 +1,70 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from registry.models import Address, Aircraft, Manufacturer, Operator, RIDModule, TypeCertificate
+from registry.serializers import AircraftSerializer, ManufacturerSerializer, OperatorSerializer, RIDModuleSerializer
+
+
+class Command(BaseCommand):
+    help = ('Compares the ModelSerializer list path with the compiled values() fast path. '
+            'Benchmark rows are created inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Rows per model (default 2000)')
+        parser.add_argument('--repeat', type=int, default=3, help='Best-of repetitions (default 3)')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        with transaction.atomic():
+            self.seed(rows)
+            self.stdout.write('%-24s %12s %12s %8s' % ('serializer', 'model (ms)', 'fast (ms)', 'speedup'))
+            for serializer_class, queryset in (
+                (OperatorSerializer, Operator.objects.all()),
+                (ManufacturerSerializer, Manufacturer.objects.all()),
+                (AircraftSerializer, Aircraft.objects.select_related('type_certificate')),
+                (RIDModuleSerializer, RIDModule.objects.select_related('operator', 'aircraft__type_certificate')),
+            ):
+                slow = self.best_of(repeat, lambda: JSONRenderer().render(serializer_class(queryset.all(), many=True).data))
+                reader = serializer_class.fast_reader()
+                fast = self.best_of(repeat, lambda: JSONRenderer().render(reader.render(reader.values(queryset.all()))))
+                self.stdout.write('%-24s %12.1f %12.1f %7.1fx' % (serializer_class.__name__, slow * 1000, fast * 1000, slow / fast))
+            transaction.set_rollback(True)
+
+    def best_of(self, repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def seed(self, rows):
+        address = Address.objects.create(address_line_1='1 Bench Street', address_line_2='-', address_line_3='-',
+                                         city='Benchville', country='GB')
+        operators = Operator.objects.bulk_create([
+            Operator(company_name='Bench Operator %d' % i, website='https://bench%d.example' % i,
+                     email='ops%d@bench.example' % i, address=address)
+            for i in range(rows)
+        ])
+        Manufacturer.objects.bulk_create([
+            Manufacturer(full_name='Bench Manufacturer %d' % i, common_name='Bench %d' % i) for i in range(rows)
+        ])
+        manufacturer = Manufacturer.objects.first()
+        certificates = TypeCertificate.objects.bulk_create([
+            TypeCertificate(type_certificate_id='TC%d' % i, type_certificate_issuing_country='GB',
+                            type_certificate_holder='Holder', type_certificate_holder_country='GB')
+            for i in range(rows)
+        ])
+        aircraft = Aircraft.objects.bulk_create([
+            Aircraft(operator=operators[i], manufacturer=manufacturer, mass=5, model='Bench %d' % i,
+                     maci_number='MACI%d' % i, type_certificate=certificates[i])
+            for i in range(rows)
+        ])
+        RIDModule.objects.bulk_create([
+            RIDModule(rid_id=uuid.uuid4(), operator=operators[i], aircraft=aircraft[i], module_esn='BENCH%08d' % i)
+            for i in range(rows)
+        ])
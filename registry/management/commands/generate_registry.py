@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from registry.cache import bump_cache_version
+from registry.synthetic import RegistryGenerator
+
+
+class Command(BaseCommand):
+    help = ('Generates a synthetic registry (operators with addresses, contacts, pilots, aircraft and RID modules '
+            'plus reference data) from a fixed seed, for reproducing production-scale performance locally.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operators', type=int, default=1000, help='Operators to create (default 1000)')
+        parser.add_argument('--aircraft-per-operator', type=float, default=5, help='Mean fleet size (default 5)')
+        parser.add_argument('--pilots-per-operator', type=float, default=2, help='Mean pilots per operator (default 2)')
+        parser.add_argument('--contacts-per-operator', type=float, default=1,
+                            help='Mean contacts per operator (default 1)')
+        parser.add_argument('--rid-module-ratio', type=float, default=0.6,
+                            help='Share of aircraft fitted with an RID module (default 0.6)')
+        parser.add_argument('--manufacturers', type=int, default=10, help='Manufacturers to create (default 10)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default 1)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Operators per chunk (default 1000)')
+
+    def handle(self, *args, **options):
+        if options['operators'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--operators must be positive and --batch-size at least 1')
+        start = time.perf_counter()
+
+        def progress(counts):
+            rows = sum(counts.values())
+            self.stdout.write('%d operators, %d rows, %.0f rows/s' % (
+                counts.get('Operator', 0), rows, rows / (time.perf_counter() - start)))
+
+        generator = RegistryGenerator(seed=options['seed'], batch_size=options['batch_size'])
+        with transaction.atomic():
+            counts = generator.generate(
+                operators=options['operators'], aircraft_per_operator=options['aircraft_per_operator'],
+                pilots_per_operator=options['pilots_per_operator'], contacts_per_operator=options['contacts_per_operator'],
+                rid_module_ratio=options['rid_module_ratio'], manufacturers=options['manufacturers'], progress=progress)
+        # bulk_create bypasses the signals that version the manufacturer cache.
+        bump_cache_version('manufacturers')
+
+        for name, count in counts.items():
+            self.stdout.write('%-36s %10d' % (name, count))
+        self.stdout.write(self.style.SUCCESS('Generated %d rows in %.1fs (seed %d)' % (
+            sum(counts.values()), time.perf_counter() - start, options['seed'])))
@@ -0,0 +1,71 @@
+import json
+import sys
+import time
+from itertools import chain, islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from registry.serializers import OperatorCreateSerializer
+
+
+class Command(BaseCommand):
+    help = ('Bulk imports operators with nested addresses from a JSON array or NDJSON file. '
+            'Each batch is normalized and validated, then addresses and operators are bulk-inserted '
+            'in one transaction; invalid records are reported and skipped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON array or newline-delimited JSON file, "-" for stdin')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Records per transaction (default 1000)')
+        parser.add_argument('--max-errors', type=int, default=20, help='Invalid records to print (default 20)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        records = self.read(options['path'])
+
+        created = failed = 0
+        start = time.perf_counter()
+        offset = 0
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            serializer = OperatorCreateSerializer(data=batch, many=True, context={'bulk_max_items': batch_size})
+            if not serializer.is_valid():
+                raise CommandError('Batch starting at record %d is not a list of objects: %s' % (offset, serializer.errors))
+            if serializer.validated_data:
+                created += len(serializer.save())
+            for error in serializer.item_errors:
+                if failed < options['max_errors']:
+                    self.stderr.write('record %d: %s' % (offset + error['index'], json.dumps(error['errors'])))
+                failed += 1
+            offset += len(batch)
+            self.stdout.write('%d records, %d created, %d failed, %.0f rows/s'
+                              % (offset, created, failed, created / (time.perf_counter() - start)))
+
+        elapsed = time.perf_counter() - start
+        rate = created / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            'Imported %d operators (%d failed) in %.2fs, %.0f rows/s' % (created, failed, elapsed, rate)))
+
+    def read(self, path):
+        """ Yields records lazily for NDJSON, a JSON array is parsed in one go """
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            first = stream.read(1)
+            while first and first.isspace():
+                first = stream.read(1)
+            if first == '[':
+                yield from json.loads(first + stream.read())
+                return
+            lines = chain([first + stream.readline()], stream) if first else stream
+            for number, line in enumerate(lines, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as exc:
+                        raise CommandError('line %d: %s' % (number, exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
@@ -0,0 +1,260 @@
+import csv
+import io
+import json
+import sys
+import time
+from itertools import chain
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from registry import search, summaries
+from registry.cache import bump_cache_version
+from registry.models import Aircraft, NormalizedCharField, Operator, Person, Pilot
+from registry.summaries import COUNTED
+
+
+class TableLoader(object):
+    """
+    Converts fixture / CSV rows for one model into tuples of database values and buffers them.
+    Missing fields get their model default (auto_now fields get the load time).
+    """
+
+    def __init__(self, model, connection, now):
+        self.model = model
+        self.connection = connection
+        self.now = now
+        self.fields = model._meta.concrete_fields
+        self.by_name = {}
+        for field in self.fields:
+            self.by_name[field.name] = field
+            self.by_name[field.attname] = field
+        self.by_name['pk'] = model._meta.pk
+        self.foreign_keys = [field for field in self.fields if field.is_relation]
+        self.unique_fields = [field for field in self.fields if field.unique and not field.primary_key]
+        self.ignored = set(field.name for field in model._meta.many_to_many)
+        self.rows = []
+        self.loaded = self.skipped = 0
+
+    def convert(self, values):
+        """ Returns (python values by attname, database row); raises ValidationError for unusable values """
+        unknown = set(values) - set(self.by_name) - self.ignored
+        if unknown:
+            raise ValidationError('unknown field(s) %s' % ', '.join(sorted(unknown)))
+        python = {}
+        for name, raw in values.items():
+            if name in self.ignored:
+                continue
+            field = self.by_name[name]
+            if raw == '' and not field.empty_strings_allowed:
+                continue
+            python[field.attname] = field.to_python(raw)
+
+        row = []
+        for field in self.fields:
+            if isinstance(field, NormalizedCharField):
+                # Derived from a field converted earlier in the row, as pre_save would on save()
+                value = field.normalize(python.get(field.source))
+            elif field.attname in python:
+                value = python[field.attname]
+            elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                value = self.now
+            elif field.has_default():
+                value = field.get_default()
+            elif field.null:
+                value = None
+            elif field.blank and field.empty_strings_allowed:
+                value = ''
+            else:
+                raise ValidationError('%s is required' % field.name)
+            python[field.attname] = value
+            row.append(field.get_db_prep_save(value, self.connection))
+        return python, tuple(row)
+
+
+class Command(BaseCommand):
+    help = ('Streams NDJSON fixtures (one {"model", "pk", "fields"} object per line, as written by '
+            'tools/arn-to-registry-json.py) or CSV files into the registry tables. PostgreSQL loads with COPY, '
+            'other databases with batched executemany; everything runs in one transaction. Foreign keys are '
+            'checked against in-memory key sets, rows with unknown references or existing keys are skipped, '
+            'and the secondary indexes of the tables loaded are dropped during the load and rebuilt at the end, as '
+            'are the search entries of the types loaded and the operator summaries.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='.jsonl / .ndjson / .csv files, "-" for NDJSON on stdin')
+        parser.add_argument('--model', help='Model of CSV files, e.g. registry.aircraft')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per COPY / executemany (default 5000)')
+        parser.add_argument('--keep-indexes', action='store_true', help='Do not drop secondary indexes while loading')
+        parser.add_argument('--max-errors', type=int, default=20, help='Skipped rows to print (default 20)')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.connection = connections[options['database']]
+        self.batch_size = options['batch_size']
+        self.max_errors = options['max_errors']
+        self.now = timezone.now()
+        self.loaders = {}
+        self.known = {}
+        self.keep_indexes = options['keep_indexes']
+        self.indexes = []
+        self.errors = 0
+        self.total = 0
+        self.start = time.perf_counter()
+
+        records = chain.from_iterable(self.read(path, options['model']) for path in options['paths'])
+        with transaction.atomic(using=options['database']), self.connection.cursor() as cursor:
+            self.cursor = cursor
+            for number, (label, pk, fields) in enumerate(records, 1):
+                self.add(number, label, pk, fields)
+            for loader in self.loaders.values():
+                self.flush(loader)
+            # Search entries before the indexes, so the full-text index is built once.
+            kinds = self.search_kinds()
+            if kinds:
+                counts = search.rebuild(kinds)
+                self.stdout.write('Rebuilt the search entries of %s (%d)' % (', '.join(kinds), sum(counts.values())))
+            if self.indexes:
+                self.stdout.write('Rebuilding %d indexes' % len(self.indexes))
+                for sql in self.indexes:
+                    cursor.execute(sql)
+            # Operator summaries after the indexes, they are counted through the operator foreign keys.
+            if any(loader.loaded and (loader.model in COUNTED or loader.model is Operator)
+                   for loader in self.loaders.values()):
+                self.stdout.write('Rebuilt %d operator summaries' % summaries.rebuild())
+
+        # Bulk loads bypass model signals, drop what the caches hold.
+        bump_cache_version('manufacturers')
+        elapsed = time.perf_counter() - self.start
+        for loader in self.loaders.values():
+            self.stdout.write('%-24s %10d loaded %10d skipped' % (loader.model._meta.label_lower, loader.loaded,
+                                                                 loader.skipped))
+        loaded = sum(loader.loaded for loader in self.loaders.values())
+        self.stdout.write(self.style.SUCCESS('Loaded %d rows in %.1fs, %.0f rows/s' % (
+            loaded, elapsed, loaded / elapsed if elapsed else 0)))
+
+    def search_kinds(self):
+        """ Search entry types made stale by the rows loaded, pilots being found by their person's name """
+        loaded = set(loader.model for loader in self.loaders.values() if loader.loaded)
+        return [kind for kind, models in (('operator', {Operator}), ('aircraft', {Aircraft}), ('pilot', {Pilot, Person}))
+                if loaded & models]
+
+    def read(self, path, model_label):
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        try:
+            if path.endswith('.csv'):
+                if not model_label:
+                    raise CommandError('--model is required for CSV files')
+                for row in csv.DictReader(stream):
+                    pk = row.pop('pk', None) or row.pop('id', None)
+                    yield model_label, pk, row
+            else:
+                for line in stream:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record['model'], record.get('pk'), record.get('fields', {})
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    def get_loader(self, label):
+        loader = self.loaders.get(label.lower())
+        if loader is None:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError('Unknown model %r' % label)
+            if model._meta.app_label != 'registry':
+                raise CommandError('Only registry models can be loaded, got %r' % label)
+            loader = self.loaders[label.lower()] = TableLoader(model, self.connection, self.now)
+            if not self.keep_indexes:
+                # Before the first row of the model is written; tables absent from the input keep theirs.
+                self.indexes.extend(self.drop_indexes(model._meta.db_table))
+        return loader
+
+    def known_keys(self, model, attname=None):
+        """
+        Primary keys, or values of the unique field attname, present in the table before the load plus those
+        added by it
+        """
+        attname = attname or model._meta.pk.attname
+        keys = self.known.get((model, attname))
+        if keys is None:
+            keys = self.known[(model, attname)] = set(
+                model._default_manager.exclude(**{attname: None}).values_list(attname, flat=True).iterator())
+        return keys
+
+    def add(self, number, label, pk, fields):
+        loader = self.get_loader(label)
+        values = dict(fields)
+        if pk not in (None, ''):
+            values['pk'] = pk
+        try:
+            python, row = loader.convert(values)
+            key = python[loader.model._meta.pk.attname]
+            if key in self.known_keys(loader.model):
+                raise ValidationError('%s already exists' % key)
+            for field in loader.foreign_keys:
+                value = python[field.attname]
+                if value is not None and value not in self.known_keys(field.related_model):
+                    raise ValidationError('%s %s does not exist' % (field.name, value))
+            for field in loader.unique_fields:
+                value = python[field.attname]
+                if value is not None and value in self.known_keys(loader.model, field.attname):
+                    raise ValidationError('%s %s already exists' % (field.name, value))
+        except (ValidationError, ValueError, TypeError) as exc:
+            loader.skipped += 1
+            if self.errors < self.max_errors:
+                messages = exc.messages if isinstance(exc, ValidationError) else [str(exc)]
+                self.stderr.write('record %d (%s): %s' % (number, label, '; '.join(messages)))
+            self.errors += 1
+            return
+
+        self.known_keys(loader.model).add(key)
+        for field in loader.unique_fields:
+            if python[field.attname] is not None:
+                self.known_keys(loader.model, field.attname).add(python[field.attname])
+        loader.rows.append(row)
+        if len(loader.rows) >= self.batch_size:
+            self.flush(loader)
+
+    def flush(self, loader):
+        if not loader.rows:
+            return
+        table = self.connection.ops.quote_name(loader.model._meta.db_table)
+        columns = ', '.join(self.connection.ops.quote_name(field.column) for field in loader.fields)
+        if self.connection.vendor == 'postgresql':
+            buffer = io.StringIO()
+            # QUOTE_NONNUMERIC leaves None as a bare empty value, which COPY reads as NULL,
+            # and quotes empty strings so they stay strings.
+            csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(loader.rows)
+            buffer.seek(0)
+            self.cursor.copy_expert('COPY %s (%s) FROM STDIN WITH (FORMAT csv)' % (table, columns), buffer)
+        else:
+            placeholders = ', '.join(['%s'] * len(loader.fields))
+            self.cursor.executemany('INSERT INTO %s (%s) VALUES (%s)' % (table, columns, placeholders), loader.rows)
+        loader.loaded += len(loader.rows)
+        self.total += len(loader.rows)
+        loader.rows = []
+        elapsed = time.perf_counter() - self.start
+        self.stdout.write('%d rows, %.0f rows/s' % (self.total, self.total / elapsed if elapsed else 0))
+
+    def drop_indexes(self, table):
+        """
+        Drops the non-unique secondary indexes of table and returns the SQL that recreates them.
+        Primary keys and unique constraints stay, the loader relies on them.
+        """
+        if self.connection.vendor == 'postgresql':
+            self.cursor.execute("SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() "
+                                "AND tablename = %s AND indexdef NOT LIKE 'CREATE UNIQUE%%'", [table])
+        elif self.connection.vendor == 'sqlite':
+            self.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+                                "AND tbl_name = %s AND sql NOT LIKE 'CREATE UNIQUE%%'", [table])
+        else:
+            return []
+        indexes = self.cursor.fetchall()
+        for name, sql in indexes:
+            self.cursor.execute('DROP INDEX %s' % self.connection.ops.quote_name(name))
+        return [sql for name, sql in indexes]
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from registry import summaries
+
+
+class Command(BaseCommand):
+    help = ('Recounts the aircraft, active RID modules, pilots and contacts of every operator into the '
+            'OperatorSummary table. Saves, deletes and the bulk endpoints keep the summaries current on their own; '
+            'run it after loading fixtures or changing rows with raw SQL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Summaries per INSERT (default 2000)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = summaries.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Rebuilt %d operator summaries in %.1fs' % (
+            count, time.perf_counter() - start)))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from registry import search
+
+
+class Command(BaseCommand):
+    help = ('Recreates the full-text search entries of operators, aircraft and pilots from the registry tables. '
+            'Run it after migrating an existing registry and after loading fixtures; saves through the API and '
+            'the bulk endpoints keep the index current on their own.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', dest='kinds', action='append', choices=sorted(search.DOCUMENTS),
+                            help='Only rebuild this type (repeatable, default all)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Entries per INSERT (default 2000)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        counts = search.rebuild(options['kinds'], batch_size=options['batch_size'])
+        for kind, count in counts.items():
+            self.stdout.write('%-10s %10d entries' % (kind, count))
+        self.stdout.write(self.style.SUCCESS('Indexed %d entries in %.1fs' % (
+            sum(counts.values()), time.perf_counter() - start)))
@@ -0,0 +1,265 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+class RouteStats(object):
+    """ Cumulative counters of one (route, method) pair """
+
+    __slots__ = ('statuses', 'buckets', 'duration', 'queries', 'query_seconds', 'response_bytes')
+
+    def __init__(self, bucket_count):
+        self.statuses = {}
+        self.buckets = [0] * bucket_count
+        self.duration = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.response_bytes = 0
+
+
+class RequestMetrics(object):
+    """
+    Per-route request metrics of this worker: request count by status, a latency histogram, database queries and
+    query time, and response bytes.
+
+    Recording only touches in-memory counters. With REGISTRY_METRICS_DIR set, every worker also rewrites its own
+    snapshot file there (at most every REGISTRY_METRICS_FLUSH_INTERVAL seconds, and on exit) and the exporter sums
+    the snapshots of all workers, so gunicorn's workers report as one process. Snapshots of workers that are no
+    longer running are deleted when they are collected, their counts leave the totals (Prometheus sees a counter
+    reset). Without it only the worker that serves the scrape is reported.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.routes = {}
+        self.last_flush = 0.0
+        self.buckets = tuple(settings.REGISTRY_METRICS_BUCKETS)
+
+    def record(self, route, method, status, duration, queries, query_seconds, response_bytes):
+        with self.lock:
+            stats = self.routes.get((route, method))
+            if stats is None:
+                stats = self.routes[(route, method)] = RouteStats(len(self.buckets) + 1)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.buckets[bisect_left(self.buckets, duration)] += 1
+            stats.duration += duration
+            stats.queries += queries
+            stats.query_seconds += query_seconds
+            stats.response_bytes += response_bytes
+        interval = settings.REGISTRY_METRICS_FLUSH_INTERVAL
+        if settings.REGISTRY_METRICS_DIR and time.monotonic() - self.last_flush >= interval:
+            self.flush(interval)
+
+    def snapshot(self):
+        with self.lock:
+            return {'buckets': list(self.buckets), 'routes': [
+                {'route': route, 'method': method, 'statuses': {str(code): count for code, count in stats.statuses.items()},
+                 'buckets': list(stats.buckets), 'duration': stats.duration, 'queries': stats.queries,
+                 'query_seconds': stats.query_seconds, 'response_bytes': stats.response_bytes}
+                for (route, method), stats in self.routes.items()
+            ]}
+
+    def flush(self, interval=0):
+        """ Atomically replaces this worker's snapshot file, unless a thread did in the last interval seconds """
+        directory = settings.REGISTRY_METRICS_DIR
+        if not directory:
+            return
+        with self.flush_lock:
+            if time.monotonic() - self.last_flush < interval:
+                return
+            self.last_flush = time.monotonic()
+            path = os.path.join(directory, 'metrics-%d.json' % os.getpid())
+            temporary = '%s.%d.tmp' % (path, threading.get_ident())
+            with open(temporary, 'w') as out:
+                json.dump(self.snapshot(), out)
+            os.replace(temporary, path)
+
+    def collect(self):
+        """ Snapshots of every worker (or just this one) merged per route """
+        directory = settings.REGISTRY_METRICS_DIR
+        if directory:
+            self.flush()
+            snapshots = []
+            for name in os.listdir(directory):
+                pid = snapshot_pid(name)
+                if pid is not None and not running(pid):
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError:
+                        pass
+                elif pid is not None and name.endswith('.json'):
+                    try:
+                        with open(os.path.join(directory, name)) as source:
+                            snapshots.append(json.load(source))
+                    except (OSError, ValueError):
+                        continue
+        else:
+            snapshots = [self.snapshot()]
+
+        merged = {}
+        for snapshot in snapshots:
+            if snapshot['buckets'] != list(self.buckets):
+                continue
+            for entry in snapshot['routes']:
+                key = (entry['route'], entry['method'])
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = dict(entry, statuses=dict(entry['statuses']), buckets=list(entry['buckets']))
+                    continue
+                for code, count in entry['statuses'].items():
+                    total['statuses'][code] = total['statuses'].get(code, 0) + count
+                total['buckets'] = [a + b for a, b in zip(total['buckets'], entry['buckets'])]
+                for name in ('duration', 'queries', 'query_seconds', 'response_bytes'):
+                    total[name] += entry[name]
+        return [merged[key] for key in sorted(merged)]
+
+    def render(self):
+        """ Prometheus text exposition format (version 0.0.4) """
+        routes = self.collect()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s %s' % (name, kind))
+
+        family('registry_http_requests_total', 'counter', 'Requests handled, by route, method and status.')
+        for entry in routes:
+            for code in sorted(entry['statuses']):
+                lines.append('registry_http_requests_total{%s,status="%s"} %d' % (
+                    labels(entry), code, entry['statuses'][code]))
+
+        family('registry_http_request_duration_seconds', 'histogram', 'Time from request to response.')
+        for entry in routes:
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ['+Inf'], entry['buckets']):
+                cumulative += count
+                lines.append('registry_http_request_duration_seconds_bucket{%s,le="%s"} %d' % (
+                    labels(entry), bound, cumulative))
+            lines.append('registry_http_request_duration_seconds_sum{%s} %.6f' % (labels(entry), entry['duration']))
+            lines.append('registry_http_request_duration_seconds_count{%s} %d' % (labels(entry), cumulative))
+
+        for name, key, kind, help_text, fmt in (
+            ('registry_db_queries_total', 'queries', 'counter', 'Database queries run while handling requests.', '%d'),
+            ('registry_db_query_duration_seconds_total', 'query_seconds', 'counter',
+             'Time spent in database queries while handling requests.', '%.6f'),
+            ('registry_http_response_size_bytes_total', 'response_bytes', 'counter', 'Response body bytes sent.', '%d'),
+        ):
+            family(name, kind, help_text)
+            for entry in routes:
+                lines.append(('%s{%s} ' + fmt) % (name, labels(entry), entry[key]))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+def snapshot_pid(name):
+    """ Worker pid of a snapshot file name (metrics-<pid>.json, or a temporary file of it), None for other files """
+    if not name.startswith('metrics-'):
+        return None
+    pid = name[len('metrics-'):].split('.', 1)[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Running under another user.
+        return True
+    return True
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(entry):
+    return 'route="%s",method="%s"' % (escape(entry['route']), escape(entry['method']))
+
+
+request_metrics = RequestMetrics()
+atexit.register(request_metrics.flush)
+
+
+class QueryTimer(object):
+    """ Database execute wrapper counting queries and their time """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware(object):
+    """
+    Records every request in ``request_metrics`` under its URL pattern (the route, or the URL name when the
+    pattern has one). Streaming responses are recorded once their content has been sent.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REGISTRY_METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        timer = QueryTimer()
+        databases = list(connections.all())
+        for connection in databases:
+            # Drop timers of streaming responses that were never consumed.
+            connection.execute_wrappers[:] = [wrapper for wrapper in connection.execute_wrappers
+                                              if not isinstance(wrapper, QueryTimer)]
+            connection.execute_wrappers.append(timer)
+
+        def detach():
+            for connection in databases:
+                if timer in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(timer)
+
+        def finish(response_bytes):
+            detach()
+            match = getattr(request, 'resolver_match', None)
+            route = (match.url_name or match.route) if match is not None else 'unmatched'
+            request_metrics.record(route, request.method, response.status_code, time.perf_counter() - start,
+                                   timer.queries, timer.seconds, response_bytes)
+
+        try:
+            response = self.get_response(request)
+        except Exception:
+            detach()
+            raise
+
+        if response.streaming:
+            response.streaming_content = counted(response.streaming_content, finish)
+        else:
+            finish(len(response.content))
+        return response
+
+
+def counted(content, finish):
+    sent = 0
+    try:
+        for chunk in content:
+            sent += len(chunk)
+            yield chunk
+    finally:
+        finish(sent)
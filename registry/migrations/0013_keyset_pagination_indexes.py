@@ -0,0 +1,61 @@
+# Generated by Django 3.2.25 on 2026-10-17 03:28
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0012_auto_20251116_1935'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='manufacturer',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='manufacturer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='aircraft',
+            index=models.Index(fields=['created_at', 'id'], name='registry_ai_created_0820aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aircraft',
+            index=models.Index(fields=['operator', 'created_at', 'id'], name='registry_ai_operato_f0ae57_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['created_at', 'id'], name='registry_co_created_2cf02d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manufacturer',
+            index=models.Index(fields=['created_at', 'id'], name='registry_ma_created_297abf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operator',
+            index=models.Index(fields=['created_at', 'id'], name='registry_op_created_ce6350_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pilot',
+            index=models.Index(fields=['created_at', 'id'], name='registry_pi_created_268e80_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ridmodule',
+            index=models.Index(fields=['created_at', 'id'], name='rid_modules_created_e4aac3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ridmodule',
+            index=models.Index(fields=['operator', 'created_at', 'id'], name='rid_modules_operato_bdbda1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ridmodule',
+            index=models.Index(fields=['aircraft', 'created_at', 'id'], name='rid_modules_aircraf_ad651b_idx'),
+        ),
+    ]
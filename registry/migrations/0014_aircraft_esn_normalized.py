@@ -0,0 +1,46 @@
+# Generated by Django 3.2.25 on 2026-10-17 04:03
+
+from django.db import migrations
+import registry.models
+
+
+def backfill_esn_normalized(apps, schema_editor):
+    Aircraft = apps.get_model('registry', 'Aircraft')
+    seen, duplicates, batch = {}, [], []
+    for aircraft in Aircraft.objects.only('id', 'esn').order_by('created_at', 'id').iterator(chunk_size=2000):
+        aircraft.esn_normalized = registry.models.normalize_esn(aircraft.esn)
+        if aircraft.esn_normalized is not None:
+            if aircraft.esn_normalized in seen:
+                duplicates.append('%s (aircraft %s and %s)' % (aircraft.esn_normalized, seen[aircraft.esn_normalized],
+                                                              aircraft.id))
+                continue
+            seen[aircraft.esn_normalized] = aircraft.id
+        batch.append(aircraft)
+        if len(batch) >= 2000:
+            Aircraft.objects.bulk_update(batch, ['esn_normalized'])
+            batch = []
+    Aircraft.objects.bulk_update(batch, ['esn_normalized'])
+    if duplicates:
+        raise RuntimeError('ESNs must be unique once trimmed and upper-cased, correct these aircraft and migrate '
+                           'again: %s' % ', '.join(duplicates[:50]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aircraft',
+            name='esn_normalized',
+            field=registry.models.NormalizedCharField(editable=False, max_length=48, normalize=registry.models.normalize_esn, null=True, source='esn'),
+        ),
+        migrations.RunPython(backfill_esn_normalized, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='aircraft',
+            name='esn_normalized',
+            field=registry.models.NormalizedCharField(editable=False, max_length=48, normalize=registry.models.normalize_esn, null=True, source='esn', unique=True),
+        ),
+    ]
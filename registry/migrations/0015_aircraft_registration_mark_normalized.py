@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-17 04:05
+
+from django.db import migrations
+import registry.models
+
+
+def backfill_registration_mark_normalized(apps, schema_editor):
+    Aircraft = apps.get_model('registry', 'Aircraft')
+    batch = []
+    for aircraft in Aircraft.objects.exclude(registration_mark=None).only('id', 'registration_mark').iterator(chunk_size=2000):
+        aircraft.registration_mark_normalized = registry.models.normalize_registration_mark(aircraft.registration_mark)
+        batch.append(aircraft)
+        if len(batch) >= 2000:
+            Aircraft.objects.bulk_update(batch, ['registration_mark_normalized'])
+            batch = []
+    Aircraft.objects.bulk_update(batch, ['registration_mark_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0014_aircraft_esn_normalized'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aircraft',
+            name='registration_mark_normalized',
+            field=registry.models.NormalizedCharField(db_index=True, editable=False, max_length=10, normalize=registry.models.normalize_registration_mark, null=True, source='registration_mark'),
+        ),
+        migrations.RunPython(backfill_registration_mark_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 3.2.25 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+POSTGRESQL_INDEX = [
+    # 'simple': names and serial numbers, no stemming or stop words
+    """ALTER TABLE registry_searchentry ADD COLUMN document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', names), 'A') || setweight(to_tsvector('simple', details), 'B')) STORED""",
+    'CREATE INDEX registry_searchentry_document ON registry_searchentry USING gin (document)',
+]
+
+# SQLite rebuilds a table for most schema changes, which drops these triggers: a later migration that alters
+# registry_searchentry has to create them again.
+SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE registry_searchentry_fts USING fts5(
+        names, details, content='registry_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER registry_searchentry_fts_insert AFTER INSERT ON registry_searchentry BEGIN
+        INSERT INTO registry_searchentry_fts (rowid, names, details) VALUES (new.id, new.names, new.details);
+    END""",
+    """CREATE TRIGGER registry_searchentry_fts_delete AFTER DELETE ON registry_searchentry BEGIN
+        INSERT INTO registry_searchentry_fts (registry_searchentry_fts, rowid, names, details)
+        VALUES ('delete', old.id, old.names, old.details);
+    END""",
+    """CREATE TRIGGER registry_searchentry_fts_update AFTER UPDATE ON registry_searchentry BEGIN
+        INSERT INTO registry_searchentry_fts (registry_searchentry_fts, rowid, names, details)
+        VALUES ('delete', old.id, old.names, old.details);
+        INSERT INTO registry_searchentry_fts (rowid, names, details) VALUES (new.id, new.names, new.details);
+    END""",
+]
+
+
+def create_full_text_index(apps, schema_editor):
+    statements = {'postgresql': POSTGRESQL_INDEX, 'sqlite': SQLITE_INDEX}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_full_text_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('ALTER TABLE registry_searchentry DROP COLUMN document')
+    elif schema_editor.connection.vendor == 'sqlite':
+        for suffix in ('insert', 'delete', 'update'):
+            schema_editor.execute('DROP TRIGGER registry_searchentry_fts_%s' % suffix)
+        schema_editor.execute('DROP TABLE registry_searchentry_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0015_aircraft_registration_mark_normalized'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('operator', 'Operator'), ('aircraft', 'Aircraft'), ('pilot', 'Pilot')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('label', models.CharField(max_length=600)),
+                ('names', models.TextField()),
+                ('details', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry'),
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
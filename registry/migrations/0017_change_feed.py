@@ -0,0 +1,46 @@
+# Generated by Django 3.2.25 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0016_search_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('operator', 'Operator'), ('aircraft', 'Aircraft'), ('pilot', 'Pilot'), ('contact', 'Contact'), ('rid_module', 'RID Module')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='aircraft',
+            index=models.Index(fields=['updated_at', 'id'], name='registry_ai_updated_6692d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['updated_at', 'id'], name='registry_co_updated_59face_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operator',
+            index=models.Index(fields=['updated_at', 'id'], name='registry_op_updated_b918a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pilot',
+            index=models.Index(fields=['updated_at', 'id'], name='registry_pi_updated_9fe8d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ridmodule',
+            index=models.Index(fields=['updated_at', 'id'], name='rid_modules_updated_b3b494_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'deleted_at', 'object_id'], name='registry_to_kind_c6e2de_idx'),
+        ),
+    ]
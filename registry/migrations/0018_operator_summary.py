@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-17 04:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def create_summaries(apps, schema_editor):
+    Operator = apps.get_model('registry', 'Operator')
+    OperatorSummary = apps.get_model('registry', 'OperatorSummary')
+    counted = {'aircraft_count': ('Aircraft', {}), 'active_rid_module_count': ('RIDModule', {'status': 'active'}),
+               'pilot_count': ('Pilot', {}), 'contact_count': ('Contact', {})}
+    counts = {}
+    for field, (model, conditions) in counted.items():
+        rows = apps.get_model('registry', model).objects.filter(operator=OuterRef('pk'), **conditions)
+        rows = rows.order_by().values('operator').annotate(count=Count('pk')).values('count')
+        counts[field] = Coalesce(Subquery(rows), Value(0))
+    batch = []
+    for row in Operator.objects.order_by().annotate(**counts).values('pk', *counts).iterator(chunk_size=2000):
+        batch.append(OperatorSummary(operator_id=row.pop('pk'), **row))
+        if len(batch) >= 2000:
+            OperatorSummary.objects.bulk_create(batch)
+            batch = []
+    OperatorSummary.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0017_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperatorSummary',
+            fields=[
+                ('operator', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='registry.operator')),
+                ('aircraft_count', models.PositiveIntegerField(default=0)),
+                ('active_rid_module_count', models.PositiveIntegerField(default=0)),
+                ('pilot_count', models.PositiveIntegerField(default=0)),
+                ('contact_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-17 09:12
+
+from django.db import migrations
+
+
+def index_registry(apps, schema_editor):
+    # 0016 created the search index empty. The entries are built from the current models, as
+    # rebuild_search_index does: the columns it reads all exist from 0015 on.
+    from registry import search
+    search.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0018_operator_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_registry, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 import uuid
 # Create your models here.
 from datetime import date
@@ -10,7 +10,93 @@ import string, random
 from django.core.validators import RegexValidator
 
 
-class Person(models.Model):
+def normalize_esn(value):
+    """ ESN in the form it is stored and looked up by: trimmed and upper-cased. None for blanks and the all-zero placeholder """
+    if value is None:
+        return None
+    value = str(value).strip().upper()
+    if not value.strip('0'):
+        return None
+    return value
+
+
+def normalize_registration_mark(value):
+    """ Registration mark as looked up: upper-cased without whitespace or dashes (g-dron, G DRON: GDRON). None when blank """
+    if value is None:
+        return None
+    value = ''.join(str(value).split()).replace('-', '').upper()
+    return value or None
+
+
+class NormalizedCharField(models.CharField):
+    """
+    Copy of the source field in the canonical form given by normalize, for indexed lookups. It is recomputed
+    whenever the row is saved, bulk_create included (both call pre_save). Raw saves (loaddata) skip pre_save and
+    are filled in by registry.signals.normalize_raw_save; queryset.update() does not touch it.
+    """
+
+    def __init__(self, *args, source=None, normalize=None, **kwargs):
+        self.source = source
+        self.normalize = normalize
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('null', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        kwargs['normalize'] = self.normalize
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = self.normalize(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class AtomicSaveMixin(object):
+    """
+    Saves in a transaction (the caller's, when there is one), so what the post_save receivers write, such as the
+    operator summaries, commits or rolls back with the row. Deletes always run in one.
+    """
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class LoadedValuesMixin(object):
+    """
+    Remembers the values the row was loaded (or last saved) with, so receivers in registry.signals can act on the
+    fields a save changes only. Instances built in code rather than loaded count every field as changed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def changed_fields(self, attnames):
+        """ The attnames whose value differs from the loaded one; deferred fields that were not set are unchanged """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return list(attnames)
+        return [name for name in attnames
+                if name in self.__dict__ and (name not in loaded or loaded[name] != self.__dict__[name])]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        saved = kwargs.get('update_fields')
+        fields = self._meta.concrete_fields if saved is None else [self._meta.get_field(name) for name in saved]
+        loaded = getattr(self, '_loaded_values', None) or {}
+        loaded.update((field.attname, self.__dict__[field.attname]) for field in fields
+                      if field.attname in self.__dict__)
+        self._loaded_values = loaded
+
+
+class Person(LoadedValuesMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     first_name = models.CharField(max_length=30)
     middle_name = models.CharField(max_length=30, null = True, blank = True)
@@ -83,7 +169,7 @@ class Authorization(models.Model):
     def __str__(self):
         return self.title
 
-class Operator(models.Model):
+class Operator(LoadedValuesMixin, AtomicSaveMixin, models.Model):
     COUNTRY_CHOICES_ISO3166=(('AF','AFGHANISTAN'),('AX','ÅLAND ISLANDS'),('AL','ALBANIA'),('DZ','ALGERIA'),('AS','AMERICAN SAMOA'),('AD','ANDORRA'),('AO','ANGOLA'),('AI','ANGUILLA'),('AQ','ANTARCTICA'),('AG','ANTIGUA AND BARBUDA'),('AR','ARGENTINA'),('AM','ARMENIA'),('AW','ARUBA'),('AU','AUSTRALIA'),('AT','AUSTRIA'),('AZ','AZERBAIJAN'),('BS','BAHAMAS'),('BH','BAHRAIN'),('BD','BANGLADESH'),('BB','BARBADOS'),('BY','BELARUS'),('BE','BELGIUM'),('BZ','BELIZE'),('BJ','BENIN'),('BM','BERMUDA'),('BT','BHUTAN'),('BO','BOLIVIA, PLURINATIONAL STATE OF'),('BQ','BONAIRE, SINT EUSTATIUS AND SABA'),('BA','BOSNIA AND HERZEGOVINA'),('BW','BOTSWANA'),('BV','BOUVET ISLAND'),('BR','BRAZIL'),('IO','BRITISH INDIAN OCEAN TERRITORY'),('BN','BRUNEI DARUSSALAM'),('BG','BULGARIA'),('BF','BURKINA FASO'),('BI','BURUNDI'),('KH','CAMBODIA'),('CM','CAMEROON'),('CA','CANADA'),('CV','CAPE VERDE'),('KY','CAYMAN ISLANDS'),('CF','CENTRAL AFRICAN REPUBLIC'),('TD','CHAD'),('CL','CHILE'),('CN','CHINA'),('CX','CHRISTMAS ISLAND'),('CC','COCOS (KEELING) ISLANDS'),('CO','COLOMBIA'),('KM','COMOROS'),('CG','CONGO'),('CD','CONGO, THE DEMOCRATIC REPUBLIC OF THE'),('CK','COOK ISLANDS'),('CR','COSTA RICA'),('CI','CÔTE D\'IVOIRE'),('HR','CROATIA'),('CU','CUBA'),('CW','CURAÇAO'),('CY','CYPRUS'),('CZ','CZECH REPUBLIC'),('DK','DENMARK'),('DJ','DJIBOUTI'),('DM','DOMINICA'),('DO','DOMINICAN REPUBLIC'),('EC','ECUADOR'),('EG','EGYPT'),('SV','EL SALVADOR'),('GQ','EQUATORIAL GUINEA'),('ER','ERITREA'),('EE','ESTONIA'),('ET','ETHIOPIA'),('FK','FALKLAND ISLANDS (MALVINAS)'),('FO','FAROE ISLANDS'),('FJ','FIJI'),('FI','FINLAND'),('FR','FRANCE'),('GF','FRENCH GUIANA'),('PF','FRENCH POLYNESIA'),('TF','FRENCH SOUTHERN TERRITORIES'),('GA','GABON'),('GM','GAMBIA'),('GE','GEORGIA'),('DE','GERMANY'),('GH','GHANA'),('GI','GIBRALTAR'),('GR','GREECE'),('GL','GREENLAND'),('GD','GRENADA'),('GP','GUADELOUPE'),('GU','GUAM'),('GT','GUATEMALA'),('GG','GUERNSEY'),('GN','GUINEA'),('GW','GUINEA-BISSAU'),('GY','GUYANA'),('HT','HAITI'),('HM','HEARD ISLAND AND MCDONALD ISLANDS'),('VA','HOLY SEE (VATICAN CITY STATE)'),('HN','HONDURAS'),('HK','HONG KONG'),('HU','HUNGARY'),('IS','ICELAND'),('IN','INDIA'),('ID','INDONESIA'),('IR','IRAN, ISLAMIC REPUBLIC OF'),('IQ','IRAQ'),('IE','IRELAND'),('IM','ISLE OF MAN'),('IL','ISRAEL'),('IT','ITALY'),('JM','JAMAICA'),('JP','JAPAN'),('JE','JERSEY'),('JO','JORDAN'),('KZ','KAZAKHSTAN'),('KE','KENYA'),('KI','KIRIBATI'),('KP','KOREA, DEMOCRATIC PEOPLE\'S REPUBLIC OF'),('KR','KOREA, REPUBLIC OF'),('KW','KUWAIT'),('KG','KYRGYZSTAN'),('LA','LAO PEOPLE\'S DEMOCRATIC REPUBLIC'),('LV','LATVIA'),('LB','LEBANON'),('LS','LESOTHO'),('LR','LIBERIA'),('LY','LIBYAN ARAB JAMAHIRIYA'),('LI','LIECHTENSTEIN'),('LT','LITHUANIA'),('LU','LUXEMBOURG'),('MO','MACAO'),('MK','MACEDONIA, THE FORMER YUGOSLAV REPUBLIC OF'),('MG','MADAGASCAR'),('MW','MALAWI'),('MY','MALAYSIA'),('MV','MALDIVES'),('ML','MALI'),('MT','MALTA'),('MH','MARSHALL ISLANDS'),('MQ','MARTINIQUE'),('MR','MAURITANIA'),('MU','MAURITIUS'),('YT','MAYOTTE'),('MX','MEXICO'),('FM','MICRONESIA, FEDERATED STATES OF'),('MD','MOLDOVA, REPUBLIC OF'),('MC','MONACO'),('MN','MONGOLIA'),('ME','MONTENEGRO'),('MS','MONTSERRAT'),('MA','MOROCCO'),('MZ','MOZAMBIQUE'),('MM','MYANMAR'),('NA','NAMIBIA'),('NR','NAURU'),('NP','NEPAL'),('NL','NETHERLANDS'),('NC','NEW CALEDONIA'),('NZ','NEW ZEALAND'),('NI','NICARAGUA'),('NE','NIGER'),('NG','NIGERIA'),('NU','NIUE'),('NF','NORFOLK ISLAND'),('MP','NORTHERN MARIANA ISLANDS'),('NO','NORWAY'),('OM','OMAN'),('PK','PAKISTAN'),('PW','PALAU'),('PS','PALESTINIAN TERRITORY, OCCUPIED'),('PA','PANAMA'),('PG','PAPUA NEW GUINEA'),('PY','PARAGUAY'),('PE','PERU'),('PH','PHILIPPINES'),('PN','PITCAIRN'),('PL','POLAND'),('PT','PORTUGAL'),('PR','PUERTO RICO'),('QA','QATAR'),('RE','RÉUNION'),('RO','ROMANIA'),('RU','RUSSIAN FEDERATION'),('RW','RWANDA'),('BL','SAINT BARTHÉLEMY'),('SH','SAINT HELENA, ASCENSION AND TRISTAN DA CUNHA'),('KN','SAINT KITTS AND NEVIS'),('LC','SAINT LUCIA'),('MF','SAINT MARTIN (FRENCH PART)'),('PM','SAINT PIERRE AND MIQUELON'),('VC','SAINT VINCENT AND THE GRENADINES'),('WS','SAMOA'),('SM','SAN MARINO'),('ST','SAO TOME AND PRINCIPE'),('SA','SAUDI ARABIA'),('SN','SENEGAL'),('RS','SERBIA'),('SC','SEYCHELLES'),('SL','SIERRA LEONE'),('SG','SINGAPORE'),('SX','SINT MAARTEN (DUTCH PART)'),('SK','SLOVAKIA'),('SI','SLOVENIA'),('SB','SOLOMON ISLANDS'),('SO','SOMALIA'),('ZA','SOUTH AFRICA'),('GS','SOUTH GEORGIA AND THE SOUTH SANDWICH ISLANDS'),('SS','SOUTH SUDAN'),('ES','SPAIN'),('LK','SRI LANKA'),('SD','SUDAN'),('SR','SURINAME'),('SJ','SVALBARD AND JAN MAYEN'),('SZ','SWAZILAND'),('SE','SWEDEN'),('CH','SWITZERLAND'),('SY','SYRIAN ARAB REPUBLIC'),('TW','TAIWAN, PROVINCE OF CHINA'),('TJ','TAJIKISTAN'),('TZ','TANZANIA, UNITED REPUBLIC OF'),('TH','THAILAND'),('TL','TIMOR-LESTE'),('TG','TOGO'),('TK','TOKELAU'),('TO','TONGA'),('TT','TRINIDAD AND TOBAGO'),('TN','TUNISIA'),('TR','TURKEY'),('TM','TURKMENISTAN'),('TC','TURKS AND CAICOS ISLANDS'),('TV','TUVALU'),('UG','UGANDA'),('UA','UKRAINE'),('AE','UNITED ARAB EMIRATES'),('GB','UNITED KINGDOM'),('US','UNITED STATES'),('UM','UNITED STATES MINOR OUTLYING ISLANDS'),('UY','URUGUAY'),('UZ','UZBEKISTAN'),('VU','VANUATU'),('VE','VENEZUELA, BOLIVARIAN REPUBLIC OF'),('VN','VIET NAM'),('VG','VIRGIN ISLANDS, BRITISH'),('VI','VIRGIN ISLANDS, U.S.'),('WF','WALLIS AND FUTUNA'),('EH','WESTERN SAHARA'),('YE','YEMEN'),('ZM','ZAMBIA'),('ZW','ZIMBABWE'),)    
     OPTYPE_CHOICES = ((0, _('NA')),(1, _('LUC')),(2, _('Non-LUC')),(3, _('AUTH')),(4, _('DEC')),)
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -104,13 +190,19 @@ class Operator(models.Model):
     company_number = models.CharField(max_length=25, blank=True, null=True)
     country = models.CharField(max_length = 2, choices=COUNTRY_CHOICES_ISO3166, default = 'NA')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
     def __unicode__(self):
        return self.company_name
 
     def __str__(self):
         return self.company_name
 
-class Contact(models.Model):
+class Contact(LoadedValuesMixin, AtomicSaveMixin, models.Model):
     COUNTRY_CHOICES_ISO3166=(('AF','AFGHANISTAN'),('AX','ÅLAND ISLANDS'),('AL','ALBANIA'),('DZ','ALGERIA'),('AS','AMERICAN SAMOA'),('AD','ANDORRA'),('AO','ANGOLA'),('AI','ANGUILLA'),('AQ','ANTARCTICA'),('AG','ANTIGUA AND BARBUDA'),('AR','ARGENTINA'),('AM','ARMENIA'),('AW','ARUBA'),('AU','AUSTRALIA'),('AT','AUSTRIA'),('AZ','AZERBAIJAN'),('BS','BAHAMAS'),('BH','BAHRAIN'),('BD','BANGLADESH'),('BB','BARBADOS'),('BY','BELARUS'),('BE','BELGIUM'),('BZ','BELIZE'),('BJ','BENIN'),('BM','BERMUDA'),('BT','BHUTAN'),('BO','BOLIVIA, PLURINATIONAL STATE OF'),('BQ','BONAIRE, SINT EUSTATIUS AND SABA'),('BA','BOSNIA AND HERZEGOVINA'),('BW','BOTSWANA'),('BV','BOUVET ISLAND'),('BR','BRAZIL'),('IO','BRITISH INDIAN OCEAN TERRITORY'),('BN','BRUNEI DARUSSALAM'),('BG','BULGARIA'),('BF','BURKINA FASO'),('BI','BURUNDI'),('KH','CAMBODIA'),('CM','CAMEROON'),('CA','CANADA'),('CV','CAPE VERDE'),('KY','CAYMAN ISLANDS'),('CF','CENTRAL AFRICAN REPUBLIC'),('TD','CHAD'),('CL','CHILE'),('CN','CHINA'),('CX','CHRISTMAS ISLAND'),('CC','COCOS (KEELING) ISLANDS'),('CO','COLOMBIA'),('KM','COMOROS'),('CG','CONGO'),('CD','CONGO, THE DEMOCRATIC REPUBLIC OF THE'),('CK','COOK ISLANDS'),('CR','COSTA RICA'),('CI','CÔTE D\'IVOIRE'),('HR','CROATIA'),('CU','CUBA'),('CW','CURAÇAO'),('CY','CYPRUS'),('CZ','CZECH REPUBLIC'),('DK','DENMARK'),('DJ','DJIBOUTI'),('DM','DOMINICA'),('DO','DOMINICAN REPUBLIC'),('EC','ECUADOR'),('EG','EGYPT'),('SV','EL SALVADOR'),('GQ','EQUATORIAL GUINEA'),('ER','ERITREA'),('EE','ESTONIA'),('ET','ETHIOPIA'),('FK','FALKLAND ISLANDS (MALVINAS)'),('FO','FAROE ISLANDS'),('FJ','FIJI'),('FI','FINLAND'),('FR','FRANCE'),('GF','FRENCH GUIANA'),('PF','FRENCH POLYNESIA'),('TF','FRENCH SOUTHERN TERRITORIES'),('GA','GABON'),('GM','GAMBIA'),('GE','GEORGIA'),('DE','GERMANY'),('GH','GHANA'),('GI','GIBRALTAR'),('GR','GREECE'),('GL','GREENLAND'),('GD','GRENADA'),('GP','GUADELOUPE'),('GU','GUAM'),('GT','GUATEMALA'),('GG','GUERNSEY'),('GN','GUINEA'),('GW','GUINEA-BISSAU'),('GY','GUYANA'),('HT','HAITI'),('HM','HEARD ISLAND AND MCDONALD ISLANDS'),('VA','HOLY SEE (VATICAN CITY STATE)'),('HN','HONDURAS'),('HK','HONG KONG'),('HU','HUNGARY'),('IS','ICELAND'),('IN','INDIA'),('ID','INDONESIA'),('IR','IRAN, ISLAMIC REPUBLIC OF'),('IQ','IRAQ'),('IE','IRELAND'),('IM','ISLE OF MAN'),('IL','ISRAEL'),('IT','ITALY'),('JM','JAMAICA'),('JP','JAPAN'),('JE','JERSEY'),('JO','JORDAN'),('KZ','KAZAKHSTAN'),('KE','KENYA'),('KI','KIRIBATI'),('KP','KOREA, DEMOCRATIC PEOPLE\'S REPUBLIC OF'),('KR','KOREA, REPUBLIC OF'),('KW','KUWAIT'),('KG','KYRGYZSTAN'),('LA','LAO PEOPLE\'S DEMOCRATIC REPUBLIC'),('LV','LATVIA'),('LB','LEBANON'),('LS','LESOTHO'),('LR','LIBERIA'),('LY','LIBYAN ARAB JAMAHIRIYA'),('LI','LIECHTENSTEIN'),('LT','LITHUANIA'),('LU','LUXEMBOURG'),('MO','MACAO'),('MK','MACEDONIA, THE FORMER YUGOSLAV REPUBLIC OF'),('MG','MADAGASCAR'),('MW','MALAWI'),('MY','MALAYSIA'),('MV','MALDIVES'),('ML','MALI'),('MT','MALTA'),('MH','MARSHALL ISLANDS'),('MQ','MARTINIQUE'),('MR','MAURITANIA'),('MU','MAURITIUS'),('YT','MAYOTTE'),('MX','MEXICO'),('FM','MICRONESIA, FEDERATED STATES OF'),('MD','MOLDOVA, REPUBLIC OF'),('MC','MONACO'),('MN','MONGOLIA'),('ME','MONTENEGRO'),('MS','MONTSERRAT'),('MA','MOROCCO'),('MZ','MOZAMBIQUE'),('MM','MYANMAR'),('NA','NAMIBIA'),('NR','NAURU'),('NP','NEPAL'),('NL','NETHERLANDS'),('NC','NEW CALEDONIA'),('NZ','NEW ZEALAND'),('NI','NICARAGUA'),('NE','NIGER'),('NG','NIGERIA'),('NU','NIUE'),('NF','NORFOLK ISLAND'),('MP','NORTHERN MARIANA ISLANDS'),('NO','NORWAY'),('OM','OMAN'),('PK','PAKISTAN'),('PW','PALAU'),('PS','PALESTINIAN TERRITORY, OCCUPIED'),('PA','PANAMA'),('PG','PAPUA NEW GUINEA'),('PY','PARAGUAY'),('PE','PERU'),('PH','PHILIPPINES'),('PN','PITCAIRN'),('PL','POLAND'),('PT','PORTUGAL'),('PR','PUERTO RICO'),('QA','QATAR'),('RE','RÉUNION'),('RO','ROMANIA'),('RU','RUSSIAN FEDERATION'),('RW','RWANDA'),('BL','SAINT BARTHÉLEMY'),('SH','SAINT HELENA, ASCENSION AND TRISTAN DA CUNHA'),('KN','SAINT KITTS AND NEVIS'),('LC','SAINT LUCIA'),('MF','SAINT MARTIN (FRENCH PART)'),('PM','SAINT PIERRE AND MIQUELON'),('VC','SAINT VINCENT AND THE GRENADINES'),('WS','SAMOA'),('SM','SAN MARINO'),('ST','SAO TOME AND PRINCIPE'),('SA','SAUDI ARABIA'),('SN','SENEGAL'),('RS','SERBIA'),('SC','SEYCHELLES'),('SL','SIERRA LEONE'),('SG','SINGAPORE'),('SX','SINT MAARTEN (DUTCH PART)'),('SK','SLOVAKIA'),('SI','SLOVENIA'),('SB','SOLOMON ISLANDS'),('SO','SOMALIA'),('ZA','SOUTH AFRICA'),('GS','SOUTH GEORGIA AND THE SOUTH SANDWICH ISLANDS'),('SS','SOUTH SUDAN'),('ES','SPAIN'),('LK','SRI LANKA'),('SD','SUDAN'),('SR','SURINAME'),('SJ','SVALBARD AND JAN MAYEN'),('SZ','SWAZILAND'),('SE','SWEDEN'),('CH','SWITZERLAND'),('SY','SYRIAN ARAB REPUBLIC'),('TW','TAIWAN, PROVINCE OF CHINA'),('TJ','TAJIKISTAN'),('TZ','TANZANIA, UNITED REPUBLIC OF'),('TH','THAILAND'),('TL','TIMOR-LESTE'),('TG','TOGO'),('TK','TOKELAU'),('TO','TONGA'),('TT','TRINIDAD AND TOBAGO'),('TN','TUNISIA'),('TR','TURKEY'),('TM','TURKMENISTAN'),('TC','TURKS AND CAICOS ISLANDS'),('TV','TUVALU'),('UG','UGANDA'),('UA','UKRAINE'),('AE','UNITED ARAB EMIRATES'),('GB','UNITED KINGDOM'),('US','UNITED STATES'),('UM','UNITED STATES MINOR OUTLYING ISLANDS'),('UY','URUGUAY'),('UZ','UZBEKISTAN'),('VU','VANUATU'),('VE','VENEZUELA, BOLIVARIAN REPUBLIC OF'),('VN','VIET NAM'),('VG','VIRGIN ISLANDS, BRITISH'),('VI','VIRGIN ISLANDS, U.S.'),('WF','WALLIS AND FUTUNA'),('EH','WESTERN SAHARA'),('YE','YEMEN'),('ZM','ZAMBIA'),('ZW','ZIMBABWE'),)  
     ROLE_CHOICES = ((0, _('Other')),(1, _('Responsible')))
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -121,6 +213,12 @@ class Contact(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
     def __unicode__(self):
         return f"{self.person} - {self.get_role_type_display()}"
 
@@ -143,7 +241,7 @@ class Test(models.Model):
     def __unicode__(self):
        return self.name
 
-class Pilot(models.Model):
+class Pilot(LoadedValuesMixin, AtomicSaveMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     operator = models.ForeignKey(Operator, models.CASCADE)    
     person = models.ForeignKey(Person, models.CASCADE)
@@ -153,6 +251,12 @@ class Pilot(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default =0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
 
 class TestValidity(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -176,9 +280,16 @@ class Manufacturer(models.Model):
     acronym = models.CharField(max_length =10, default = 'NA')
     role = models.CharField(max_length = 140, default = 'NA')
     country = models.CharField(max_length =3, default = 'NA')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
 
   
-class Aircraft(models.Model):
+class Aircraft(LoadedValuesMixin, AtomicSaveMixin, models.Model):
     AIRCRAFT_CATEGORY = ((0, _('Other')),(1, _('FIXED WING')),(2, _('ROTORCRAFT')),(3, _('LIGHTER-THAN-AIR')),(4, _('HYBRID LIFT')),)
     AIRCRAFT_SUB_CATEGORY = ((0, _('Other')),(1, _('AIRPLANE')),(2, _('NONPOWERED GLIDER')),(3, _('POWERED GLIDER')),(4, _('HELICOPTER')),(5, _('GYROPLANE')),(6, _('BALLOON')),(6, _('AIRSHIP')),(7, _('UAV')),)
     STATUS_CHOICES = ((0, _('Inactive')),(1, _('Active')),)
@@ -194,6 +305,8 @@ class Aircraft(models.Model):
     manufacturer = models.ForeignKey(Manufacturer, models.CASCADE)
     category = models.IntegerField(choices=AIRCRAFT_CATEGORY, default = 0)
     registration_mark = models.CharField(max_length= 10, blank= True, null=True)
+    registration_mark_normalized = NormalizedCharField(max_length=10, db_index=True, source='registration_mark',
+                                                       normalize=normalize_registration_mark)
     sub_category = models.IntegerField(choices=AIRCRAFT_SUB_CATEGORY, default = 7)
     icao_aircraft_type_designator = models.CharField(max_length =4, default = '0000')
     max_certified_takeoff_weight = models.DecimalField(decimal_places = 3, max_digits=10, default = 0.00)
@@ -201,11 +314,21 @@ class Aircraft(models.Model):
     type_certificate = models.ForeignKey(TypeCertificate, models.CASCADE, blank= True, null= True)
     model = models.CharField(max_length = 280)
     esn = models.CharField(max_length = 48, default='000000000000000000000000000000000000000000000000')
+    # Unique apart from blank and placeholder ESNs, which are stored as NULL
+    esn_normalized = NormalizedCharField(max_length=48, unique=True, source='esn', normalize=normalize_esn)
     maci_number = models.CharField(max_length = 280)
     status = models.IntegerField(choices=STATUS_CHOICES, default = 1)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['operator', 'created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
     def __unicode__(self):
        return self.model
 
@@ -213,7 +336,7 @@ class Aircraft(models.Model):
         return self.model
 
 
-class RIDModule(models.Model):
+class RIDModule(LoadedValuesMixin, AtomicSaveMixin, models.Model):
     """
     Remote ID (RID) Module model for managing aircraft RID modules separately from aircraft records.
     Tracks module hardware, activation status, and lifecycle.
@@ -268,10 +391,76 @@ class RIDModule(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['module_esn']),
             models.Index(fields=['rid_id']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['operator', 'created_at', 'id']),
+            models.Index(fields=['aircraft', 'created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
         return f"RID Module {self.module_esn} ({self.rid_id})"
     
     def __unicode__(self):
-        return f"RID Module {self.module_esn} ({self.rid_id})"
\ No newline at end of file
+        return f"RID Module {self.module_esn} ({self.rid_id})"
+
+class SearchEntry(models.Model):
+    """
+    Searchable text of one operator, aircraft or pilot, kept current by registry.signals (see registry.search).
+    The full-text index over names and details is created by the migration: a generated tsvector column with a
+    GIN index on PostgreSQL, an FTS5 table kept in step by triggers on SQLite.
+    """
+    KIND_CHOICES = (('operator', _('Operator')), ('aircraft', _('Aircraft')), ('pilot', _('Pilot')),)
+
+    # Integer key, it is the rowid of the SQLite FTS5 index
+    id = models.AutoField(primary_key=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    label = models.CharField(max_length=600)
+    names = models.TextField()
+    details = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+
+    def __str__(self):
+        return '%s %s' % (self.kind, self.label)
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted operator, aircraft, pilot, contact or RID module, written by registry.signals so the
+    ?updated_since= change feeds can tell mirrors to drop it.
+    """
+    KIND_CHOICES = (('operator', _('Operator')), ('aircraft', _('Aircraft')), ('pilot', _('Pilot')),
+                    ('contact', _('Contact')), ('rid_module', _('RID Module')),)
+
+    id = models.AutoField(primary_key=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'deleted_at', 'object_id']),
+        ]
+
+    def __str__(self):
+        return '%s %s deleted %s' % (self.kind, self.object_id, self.deleted_at)
+
+
+class OperatorSummary(models.Model):
+    """
+    Fleet counts of one operator for dashboards, kept current by registry.signals in the transaction that saves or
+    deletes the counted rows (see registry.summaries). Only active RID modules are counted.
+    """
+    operator = models.OneToOneField(Operator, models.CASCADE, primary_key=True, related_name='summary')
+    aircraft_count = models.PositiveIntegerField(default=0)
+    active_rid_module_count = models.PositiveIntegerField(default=0)
+    pilot_count = models.PositiveIntegerField(default=0)
+    contact_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return 'Summary of %s' % self.operator_id
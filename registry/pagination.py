@@ -0,0 +1,215 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor (keyset) pagination ordered on the indexed ``(created_at, id)`` key.
+
+    Every page is a single range scan on the index, so page N costs the same as page 1.
+    Clients follow the ``next``/``previous`` links and never build cursors themselves.
+    The page size defaults to ``settings.REGISTRY_PAGE_SIZE`` and can be lowered or raised
+    per request with ``?limit=`` up to ``settings.REGISTRY_MAX_PAGE_SIZE``.
+    """
+    ordering = ('created_at', 'id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        page_size = getattr(settings, 'REGISTRY_PAGE_SIZE', 100)
+        max_page_size = getattr(settings, 'REGISTRY_MAX_PAGE_SIZE', 1000)
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        if requested <= 0:
+            return page_size
+        return min(requested, max_page_size)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'k': position[0].isoformat(), 'i': str(position[1]), 'r': int(reverse)})
+        return urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            key = parse_datetime(payload['k'])
+            if key is None:
+                raise ValueError(payload['k'])
+            return key, payload['i'], bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        key_field, tie_field = self.ordering
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor[2])
+
+        if self.reverse:
+            queryset = queryset.order_by('-' + key_field, '-' + tie_field)
+        else:
+            queryset = queryset.order_by(key_field, tie_field)
+
+        if cursor:
+            key, tie, _ = cursor
+            op = 'lt' if self.reverse else 'gt'
+            queryset = queryset.filter(
+                Q(**{'%s__%s' % (key_field, op): key}) |
+                Q(**{key_field: key, '%s__%s' % (tie_field, op): tie})
+            )
+
+        # Fetch one extra row to learn whether another page follows without a COUNT(*).
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.first_position = self.get_position(results[0]) if results else None
+        self.last_position = self.get_position(results[-1]) if results else None
+        if not results and cursor:
+            # Empty page reached from a cursor: keep the client able to step back.
+            self.first_position = self.last_position = cursor[:2]
+        return results
+
+    def get_position(self, item):
+        key_field, tie_field = self.ordering
+        if isinstance(item, dict):
+            return item[key_field], item[tie_field]
+        return getattr(item, key_field), getattr(item, tie_field)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   self.encode_cursor(self.last_position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   self.encode_cursor(self.first_position, reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque pagination cursor taken from a previous next/previous link.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class Deletion(namedtuple('Deletion', ('id', 'deleted_at', 'reason'))):
+    """ Tombstone entry of a change feed page """
+
+    def data(self):
+        return OrderedDict([('id', str(self.id)), ('deleted', True), ('reason', self.reason),
+                            ('deleted_at', self.deleted_at)])
+
+
+class ChangeFeedPagination(KeysetPagination):
+    """
+    Forward-only keyset pagination for the ``?updated_since=`` change feeds, ordered on the indexed
+    ``(updated_at, id)`` key.
+
+    The view's tombstone querysets (``get_tombstone_querysets()``, each with its own key and tie fields) are read
+    with the same cursor as the changed rows and merged into the page as ``Deletion`` entries, one range scan per
+    source. The response carries a ``watermark``: the key of the last entry (``updated_since`` itself on an empty
+    feed), to send as ``updated_since`` once ``next`` runs out.
+    """
+    ordering = ('updated_at', 'id')
+
+    def after(self, queryset, fields, position):
+        key_field, tie_field = fields
+        queryset = queryset.order_by(key_field, tie_field)
+        if position:
+            key, tie = position
+            queryset = queryset.filter(Q(**{'%s__gt' % key_field: key}) |
+                                       Q(**{key_field: key, '%s__gt' % tie_field: tie}))
+        return queryset[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        position = cursor[:2] if cursor else None
+
+        # Ties are broken on the text of the id, which sorts UUIDs the way both databases do.
+        entries = [((key, str(tie)), item) for item in self.after(queryset, self.ordering, position)
+                   for key, tie in [self.get_position(item)]]
+        for tombstones, fields, reason in view.get_tombstone_querysets():
+            for key, tie in self.after(tombstones, fields, position).values_list(*fields):
+                entries.append(((key, str(tie)), Deletion(tie, key, reason)))
+        entries.sort(key=lambda entry: entry[0])
+
+        self.has_next = len(entries) > self.page_size
+        self.has_previous = False
+        entries = entries[:self.page_size]
+        self.last_position = entries[-1][0] if entries else position
+        self.watermark = self.last_position[0] if self.last_position else view.get_updated_since()
+        return [item for _, item in entries]
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', None),
+            ('watermark', self.watermark.isoformat()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response['properties']['watermark'] = {'type': 'string', 'format': 'date-time'}
+        return response
@@ -0,0 +1,100 @@
+import csv
+import json
+from io import StringIO
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def flatten_plan(plan, prefix=''):
+    """ Column headers and row paths for a compiled read plan, nested objects become dotted columns """
+    columns = []
+    for name, key, convert, nested in plan:
+        if nested is not None:
+            columns.extend(flatten_plan(nested, prefix + name + '.'))
+        else:
+            columns.append(prefix + name)
+    return columns
+
+
+def flatten_row(data, prefix='', out=None):
+    out = {} if out is None else out
+    for name, value in data.items():
+        if isinstance(value, dict):
+            flatten_row(value, prefix + name + '.', out)
+        else:
+            out[prefix + name] = value
+    return out
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Base for the export renderers. render() handles the small non-streaming responses
+    (errors, auth failures); stream() turns an iterator of rendered rows into text chunks.
+    The first row is flushed on its own so clients get the first byte straight away.
+    """
+    charset = 'utf-8'
+
+    def stream(self, plan, items, chunk_size):
+        out = StringIO()
+        write = self.get_writer(out, plan)
+        for count, data in enumerate(items, 1):
+            write(data)
+            if count == 1 or count % chunk_size == 0:
+                yield out.getvalue()
+                out.seek(0)
+                out.truncate()
+        if out.tell():
+            yield out.getvalue()
+
+    def get_writer(self, out, plan):
+        raise NotImplementedError
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """ Newline-delimited JSON, one object per line """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def get_writer(self, out, plan):
+        encode = JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+        def write(data):
+            out.write(encode(data))
+            out.write('\n')
+        return write
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n').encode(self.charset)
+
+
+class CSVRenderer(StreamingRenderer):
+    """ CSV with a header row, nested objects are flattened into dotted column names """
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def get_writer(self, out, plan):
+        columns = flatten_plan(plan)
+        writer = csv.writer(out)
+        writer.writerow(columns)
+
+        def write(data):
+            flat = flatten_row(data)
+            writer.writerow(['' if flat.get(column) is None else flat[column] for column in columns])
+        return write
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = [data]
+        rows = [flatten_row(item) for item in data]
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        out = StringIO()
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(['' if row.get(column) is None else row[column] for column in columns])
+        return out.getvalue().encode(self.charset)
@@ -0,0 +1,143 @@
+import re
+import uuid
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from registry.models import Aircraft, Operator, Pilot, SearchEntry
+
+# Words of the query that are searched, at most MAX_TERMS of them; every one has to match (as a prefix)
+TERM = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+
+def join(*values):
+    return ' '.join(str(value).strip() for value in values if value and str(value).strip())
+
+
+def operator_document(operator):
+    return operator.company_name, operator.company_name, join(operator.company_number)
+
+
+def aircraft_document(aircraft):
+    names = join(aircraft.popular_name, aircraft.model)
+    return join(names, aircraft.registration_mark), names, join(aircraft.maci_number, aircraft.registration_mark)
+
+
+def pilot_document(pilot):
+    name = join(pilot.person.first_name, pilot.person.middle_name, pilot.person.last_name)
+    return name, name, ''
+
+
+# kind: (model, fields loaded to build the entry, function returning (label, names, details))
+DOCUMENTS = {
+    'operator': (Operator, ('company_name', 'company_number'), operator_document),
+    'aircraft': (Aircraft, ('model', 'popular_name', 'maci_number', 'registration_mark'), aircraft_document),
+    'pilot': (Pilot, ('person', 'person__first_name', 'person__middle_name', 'person__last_name'), pilot_document),
+}
+
+
+def index_queryset(kind, queryset):
+    """ The queryset of kind, restricted to what the search entries are built from """
+    model, fields, document = DOCUMENTS[kind]
+    related = sorted(set(field.split('__')[0] for field in fields if '__' in field))
+    return queryset.select_related(*related).only(*fields)
+
+
+def entries(kind, objects):
+    document = DOCUMENTS[kind][2]
+    for obj in objects:
+        label, names, details = document(obj)
+        yield SearchEntry(kind=kind, object_id=obj.pk, label=label[:600], names=names, details=details)
+
+
+def add_objects(kind, objects):
+    """ Indexes new objects of model kind, which have no entries yet (bulk creates): one INSERT """
+    SearchEntry.objects.bulk_create(list(entries(kind, objects)))
+
+
+def index_objects(kind, objects):
+    """ Adds or replaces the search entries of objects of model kind: one DELETE and one INSERT """
+    new = list(entries(kind, objects))
+    if not new:
+        return
+    with transaction.atomic(savepoint=False):
+        SearchEntry.objects.filter(kind=kind, object_id__in=[entry.object_id for entry in new]).delete()
+        SearchEntry.objects.bulk_create(new)
+
+
+def remove_objects(kind, pks):
+    SearchEntry.objects.filter(kind=kind, object_id__in=list(pks)).delete()
+
+
+def rebuild(kinds=None, batch_size=2000):
+    """ Recreates the entries of kinds (all by default) from the registry tables, returns the number per kind """
+    counts = {}
+    with transaction.atomic():
+        for kind in kinds or DOCUMENTS:
+            model = DOCUMENTS[kind][0]
+            SearchEntry.objects.filter(kind=kind).delete()
+            batch, counts[kind] = [], 0
+            for entry in entries(kind, index_queryset(kind, model.objects.order_by()).iterator(chunk_size=batch_size)):
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    counts[kind] += len(batch)
+                    batch = []
+            SearchEntry.objects.bulk_create(batch)
+            counts[kind] += len(batch)
+    return counts
+
+
+def search_terms(query):
+    return [term.lower() for term in TERM.findall(query or '')][:MAX_TERMS]
+
+
+def fts_available():
+    """ Whether the SQLite FTS5 index of migration 0016 exists (SQLite builds without FTS5 fall back to LIKE) """
+    if not hasattr(connection, '_registry_fts'):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'registry_searchentry_fts'")
+            connection._registry_fts = cursor.fetchone() is not None
+    return connection._registry_fts
+
+
+def search(query, kinds=None, limit=20):
+    """
+    Ranked matches of query as (kind, object_id, label, rank) tuples, best first. Every word of the query has to
+    start a word of the entry; matches in names (company name, aircraft model and popular name, pilot name) rank
+    above matches in details (company number, MACI number, registration mark).
+
+    PostgreSQL ranks with ts_rank over the GIN-indexed tsvector, SQLite with FTS5's bm25; other databases (and
+    SQLite without FTS5) fall back to an unranked LIKE scan.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    kinds = [kind for kind in (kinds or DOCUMENTS) if kind in DOCUMENTS]
+    if not kinds:
+        return []
+    kind_filter = 'AND e.kind IN (%s)' % ', '.join(['%s'] * len(kinds))
+
+    if connection.vendor == 'postgresql':
+        sql = ("SELECT e.kind, e.object_id, e.label, ts_rank(e.document, q.query) AS rank "
+               "FROM registry_searchentry e, to_tsquery('simple', %%s) AS q(query) "
+               "WHERE e.document @@ q.query %s ORDER BY rank DESC, e.label LIMIT %%s" % kind_filter)
+        params = [' & '.join('%s:*' % term for term in terms)] + kinds + [limit]
+    elif connection.vendor == 'sqlite' and fts_available():
+        # bm25 is lower for better matches; names weigh five times as much as details.
+        sql = ("SELECT e.kind, e.object_id, e.label, -bm25(registry_searchentry_fts, 5.0, 1.0) AS rank "
+               "FROM registry_searchentry_fts JOIN registry_searchentry e ON e.id = registry_searchentry_fts.rowid "
+               "WHERE registry_searchentry_fts MATCH %%s %s ORDER BY rank DESC, e.label LIMIT %%s" % kind_filter)
+        params = [' '.join('"%s"*' % term for term in terms)] + kinds + [limit]
+    else:
+        queryset = SearchEntry.objects.filter(kind__in=kinds)
+        for term in terms:
+            queryset = queryset.filter(Q(names__icontains=term) | Q(details__icontains=term))
+        return [(kind, object_id, label, 0.0) for kind, object_id, label
+                in queryset.order_by('label').values_list('kind', 'object_id', 'label')[:limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(kind, object_id if isinstance(object_id, uuid.UUID) else uuid.UUID(str(object_id)), label, rank)
+                for kind, object_id, label, rank in cursor.fetchall()]
@@ -1,5 +1,279 @@
-from rest_framework import serializers
-from registry.models import Activity, Authorization, Operator, Contact, Aircraft, Pilot, Address, Person, Test, TypeCertificate, Manufacturer, RIDModule
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from registry import search, summaries
+from registry.models import Operator, OperatorSummary, Contact, Aircraft, Pilot, Address, Person, Test, TypeCertificate, Manufacturer, RIDModule, normalize_esn
+
+
+def requested_fields(request, param='fields'):
+    """ Returns the field names asked for with ?fields=a,b,c on a GET request, or None """
+    if request is None or request.method != 'GET':
+        return None
+    raw = request.query_params.get(param)
+    if not raw:
+        return None
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+
+def requested_includes(request):
+    """ Returns the optional fields asked for with ?include=a,b on a GET request, or None """
+    return requested_fields(request, 'include')
+
+
+class SparseProjectionError(Exception):
+    """ Raised when a requested field cannot be mapped onto model columns """
+
+
+def sparse_projection(serializer, names, prefix=''):
+    """
+    Maps serializer field names onto the columns (for .only()) and forward joins (for .select_related())
+    needed to render them. Nested serializers pull in all of their own fields.
+    """
+    model = serializer.Meta.model
+    columns, joins = {prefix + model._meta.pk.name}, set()
+    for name in names:
+        field = serializer.fields.get(name)
+        if field is None:
+            continue
+        if field.source == '*' or isinstance(field, serializers.ListSerializer):
+            raise SparseProjectionError(name)
+        current = model
+        path = field.source.split('.')
+        for depth, attr in enumerate(path):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise SparseProjectionError(name)
+            if model_field.many_to_many or model_field.one_to_many:
+                raise SparseProjectionError(name)
+            lookup = prefix + '__'.join(path[:depth + 1])
+            columns.add(lookup)
+            if not model_field.is_relation:
+                break
+            if depth < len(path) - 1:
+                joins.add(lookup)
+                current = model_field.related_model
+            elif isinstance(field, serializers.BaseSerializer):
+                joins.add(lookup)
+                nested_columns, nested_joins = sparse_projection(field, list(field.fields), lookup + '__')
+                columns |= nested_columns
+                joins |= nested_joins
+    return columns, joins
+
+
+class SparseFieldsetMixin:
+    """
+    Read serializer mixin that trims the output to ?fields=a,b,c and adds the optional fields of includable
+    asked for with ?include=a,b on top. Unknown names are rejected with a 400.
+    Views use sparse_queryset() to push the same projection down to the database.
+    """
+    # Optional fields by name: read-only serializers of a forward or one-to-one relation of that name
+    includable = {}
+
+    def __init__(self, *args, **kwargs):
+        requested = kwargs.pop('fields', None)
+        include = kwargs.pop('include', None)
+        super().__init__(*args, **kwargs)
+        if requested is None:
+            requested = requested_fields(self.context.get('request'))
+        if include is None:
+            include = requested_includes(self.context.get('request'))
+        if requested:
+            unknown = [name for name in requested if name not in self.fields]
+            if unknown:
+                raise serializers.ValidationError({'fields': ['Unknown field(s): %s' % ', '.join(unknown)]})
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+        if include:
+            unknown = [name for name in include if name not in self.includable]
+            if unknown:
+                raise serializers.ValidationError({'include': ['Unknown include(s): %s' % ', '.join(unknown)]})
+            for name in include:
+                self.fields[name] = self.includable[name](read_only=True)
+
+    @classmethod
+    def sparse_queryset(cls, queryset, requested, keep=(), include=None):
+        """
+        Restricts queryset to the columns and joins needed for the requested (and included) fields.
+        The queryset is returned unchanged when a field cannot be expressed as columns (M2M, method fields).
+        """
+        try:
+            columns, joins = sparse_projection(cls(include=include), list(requested) + list(include or ()))
+        except SparseProjectionError:
+            return queryset
+        columns.update(keep)
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        return queryset.only(*columns)
+
+
+# Field types whose to_representation() returns database values from values() unchanged.
+FAST_IDENTITY_FIELDS = (serializers.CharField, serializers.EmailField, serializers.URLField, serializers.IntegerField,
+                        serializers.ChoiceField, serializers.BooleanField)
+
+
+def utc_datetime_converter(field):
+    """
+    Equivalent of DateTimeField.to_representation for ISO 8601 output while the current timezone is UTC.
+    Values that are not UTC fall back to the field itself.
+    """
+    slow = field.to_representation
+    zero = timedelta(0)
+
+    def convert(value):
+        if isinstance(value, datetime) and value.utcoffset() == zero:
+            return value.isoformat()[:-6] + 'Z'
+        return slow(value)
+    return convert
+
+
+def compile_read_plan(serializer, prefix='', utc=True):
+    """
+    Compiles a serializer into a flat plan of (output name, values() key, converter, nested plan).
+    Simple types are copied as-is, UUIDs are stringified and anything else (decimals, non-UTC dates) goes
+    through the DRF field's own to_representation, so the output matches the serializer exactly.
+    """
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or field.source == '*' \
+                or isinstance(field, serializers.ListSerializer):
+            raise ImproperlyConfigured('%s.%s cannot be read from values() rows' % (serializer.__class__.__name__, name))
+        key = prefix + field.source.replace('.', '__')
+        if isinstance(field, serializers.BaseSerializer):
+            nested_prefix = key + '__'
+            plan.append((name, nested_prefix + field.Meta.model._meta.pk.name, None,
+                         compile_read_plan(field, nested_prefix, utc)))
+        elif type(field) in FAST_IDENTITY_FIELDS:
+            plan.append((name, key, None, None))
+        elif type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+            plan.append((name, key, None, None))
+        elif type(field) is serializers.UUIDField and field.uuid_format == 'hex_verbose':
+            plan.append((name, key, str, None))
+        elif utc and type(field) is serializers.DateTimeField and \
+                getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601 and not hasattr(field, 'timezone'):
+            plan.append((name, key, utc_datetime_converter(field), None))
+        else:
+            plan.append((name, key, field.to_representation, None))
+    return tuple(plan)
+
+
+def plan_columns(plan):
+    """ All values() keys a compiled plan reads """
+    columns = []
+    for name, key, convert, nested in plan:
+        columns.append(key)
+        if nested is not None:
+            columns.extend(plan_columns(nested))
+    return columns
+
+
+def render_row(plan, row):
+    data = {}
+    for name, key, convert, nested in plan:
+        value = row[key]
+        if value is None:
+            data[name] = None
+        elif nested is not None:
+            data[name] = render_row(nested, row)
+        elif convert is None:
+            data[name] = value
+        else:
+            data[name] = convert(value)
+    return data
+
+
+class FastReader(object):
+    """
+    Renders values() rows with a compiled plan, without instantiating models or serializers.
+    Holds a second plan without the UTC datetime shortcut for requests running under another timezone.
+    """
+
+    def __init__(self, serializer):
+        self.utc_plan = compile_read_plan(serializer, utc=True)
+        self.plan = compile_read_plan(serializer, utc=False)
+        self.columns = tuple(dict.fromkeys(plan_columns(self.plan)))
+
+    def values(self, queryset, keep=()):
+        """ Turns queryset into a values() queryset carrying every column the plan (and the caller) needs """
+        return queryset.values(*dict.fromkeys(self.columns + tuple(keep)))
+
+    def current_plan(self):
+        return self.utc_plan if timezone.get_current_timezone_name() == 'UTC' else self.plan
+
+    def render(self, rows):
+        plan = self.current_plan()
+        return [render_row(plan, row) for row in rows]
+
+    def iter_render(self, rows):
+        """ Lazy render() for streaming responses """
+        plan = self.current_plan()
+        for row in rows:
+            yield render_row(plan, row)
+
+
+@lru_cache(maxsize=128)
+def compiled_reader(serializer_class, fields=None, include=None):
+    return FastReader(serializer_class(fields=list(fields) if fields else None,
+                                       include=list(include) if include else None))
+
+
+class FastReadMixin(object):
+    """
+    Read-only fast path for list endpoints. fast_reader() returns a reader compiled once per
+    (serializer, ?fields=, ?include=) combination that renders values() rows straight into dicts.
+    """
+
+    @classmethod
+    def fast_reader(cls, requested=None, include=None):
+        if requested or include:
+            # Validate the names up front, the cache below is only keyed on valid field sets.
+            cls(fields=requested, include=include)
+        return compiled_reader(cls, tuple(requested) if requested else None, tuple(include) if include else None)
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """
+    Base for many=True create serializers that accept partially valid batches. Invalid items are collected
+    in item_errors by index instead of failing the whole batch; valid_indexes maps validated_data back to
+    the input. Subclasses load shared related objects in prefetch(), see every valid item in accept() before the
+    next one is validated and insert everything in create().
+    """
+
+    def prefetch(self, data):
+        pass
+
+    def accept(self, item):
+        pass
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Expected a list of items."]})
+        limit = self.context.get('bulk_max_items', settings.REGISTRY_BULK_MAX_ITEMS)
+        if not data or len(data) > limit:
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [f"Send between 1 and {limit} items per request."]})
+        self.prefetch(data)
+
+        self.valid_indexes, self.item_errors, validated = [], [], []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors.append({'index': index, 'errors': exc.detail})
+                continue
+            self.valid_indexes.append(index)
+            self.accept(validated[-1])
+        return validated
 
 
 class AddressSerializer(serializers.ModelSerializer):
@@ -44,12 +318,109 @@ class TestsSerializer(serializers.ModelSerializer):
         model = Test
         fields = ('id', 'test_type','taken_at', 'name','created_at','updated_at')
 
-class OperatorSerializer(serializers.ModelSerializer):
-    ''' This is the default serializer for Operator '''
+class FleetSummarySerializer(serializers.ModelSerializer):
+    ''' Counts of an operator's fleet, from the OperatorSummary table '''
+    class Meta:
+        model = OperatorSummary
+        fields = ('aircraft_count', 'active_rid_module_count', 'pilot_count', 'contact_count', 'updated_at')
+
+class OperatorSerializer(FastReadMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    ''' This is the default serializer for Operator, ?include=summary adds the fleet counts '''
+    includable = {'summary': FleetSummarySerializer}
+
     class Meta:
         model = Operator
         fields = ('id', 'company_name', 'website', 'email', 'phone_number')
 
+OPERATOR_TYPE_NAMES = {'na': 0, 'luc': 1, 'non-luc': 2, 'auth': 3, 'dec': 4, 'private': 2}
+COUNTRY_NAMES = {
+    'uae': 'AE',
+    'united arab emirates': 'AE',
+    'usa': 'US',
+    'united states': 'US',
+    'uk': 'GB',
+    'united kingdom': 'GB'
+}
+
+
+def normalize_operator_data(data):
+    """
+    Cleans up an operator payload the way the registration UIs send it: operator type names, websites
+    without a scheme, formatted phone numbers, short address keys, missing address lines and country names.
+    Returns a new dict, the input is not modified.
+    """
+    data = dict(data)
+
+    # Handle operator_type conversion
+    if isinstance(data.get('operator_type'), str):
+        op_type = data['operator_type'].lower()
+        if op_type in OPERATOR_TYPE_NAMES:
+            data['operator_type'] = OPERATOR_TYPE_NAMES[op_type]
+
+    # Handle website format
+    if data.get('website') and not data['website'].startswith(('http://', 'https://')):
+        data['website'] = 'https://' + data['website']
+
+    # Handle phone number - remove any spaces, dashes and brackets
+    if data.get('phone_number'):
+        phone = str(data['phone_number']).strip()
+        data['phone_number'] = phone.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+
+    # Handle address fields
+    if isinstance(data.get('address'), dict):
+        addr_data = dict(data['address'])
+
+        # Convert line_1 to address_line_1 if needed
+        if 'line_1' in addr_data and 'address_line_1' not in addr_data:
+            addr_data['address_line_1'] = addr_data.pop('line_1')
+
+        # Set default values for required address fields if missing
+        if not addr_data.get('address_line_2'):
+            addr_data['address_line_2'] = '-'
+        if not addr_data.get('address_line_3'):
+            addr_data['address_line_3'] = '-'
+
+        # Ensure postcode has a default if missing
+        if not addr_data.get('postcode'):
+            addr_data['postcode'] = '0'
+
+        # Handle country code conversion
+        if 'country' in addr_data:
+            country = str(addr_data['country']).lower()
+            if country in COUNTRY_NAMES:
+                addr_data['country'] = COUNTRY_NAMES[country]
+
+        data['address'] = addr_data
+    return data
+
+
+class OperatorBulkCreateSerializer(BulkCreateListSerializer):
+    """
+    many=True for OperatorCreateSerializer. Items are normalized with normalize_operator_data, then the
+    valid ones are inserted with two bulk_create calls (addresses, then operators), and indexed for search and
+    given their fleet summaries, in one transaction.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            data = [normalize_operator_data(item) if isinstance(item, dict) else item for item in data]
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        addresses, operators = [], []
+        for item in validated_data:
+            item = dict(item)
+            address = Address(**item.pop('address'))
+            addresses.append(address)
+            operators.append(Operator(address=address, **item))
+        with transaction.atomic():
+            Address.objects.bulk_create(addresses)
+            created = Operator.objects.bulk_create(operators)
+            search.add_objects('operator', created)
+            summaries.create_for(created)
+            return created
+
+
 class OperatorCreateSerializer(serializers.ModelSerializer):
     ''' Serializer for creating a new operator '''
     address = AddressSerializer()
@@ -57,6 +428,7 @@ class OperatorCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Operator
+        list_serializer_class = OperatorBulkCreateSerializer
         fields = ('company_name', 'website', 'email', 'phone_number', 
                   'operator_type', 'address', 'vat_number', 
                   'insurance_number', 'company_number', 'country')
@@ -79,35 +451,19 @@ class OperatorCreateSerializer(serializers.ModelSerializer):
         return operator
 
 
-class PrivilagedOperatorSerializer(serializers.ModelSerializer):
-    ''' This is the privilaged serializer for Operator specially for law enforcement and other privilaged operators '''
-    authorized_activities = serializers.SerializerMethodField()
-    operational_authorizations = serializers.SerializerMethodField()
+class PrivilagedOperatorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    ''' This is the privilaged serializer for Operator specially for law enforcement and other privilaged operators.
+    The M2M fields read from the prefetch cache, see OperatorDetailPrivilaged.queryset '''
+    authorized_activities = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+    operational_authorizations = serializers.SlugRelatedField(many=True, read_only=True, slug_field='title')
     address = AddressSerializer(read_only=True)
-   
-    def get_authorized_activities(self, response):
-        activities = []
-        o = Operator.objects.get(id=response.id)
-        oa = o.authorized_activities.all()
-        for activity in oa: 
-            activities.append(activity.name)
-        return activities
-
-    def get_operational_authorizations(self, response):
-        authorizations = []
-        o = Operator.objects.get(id=response.id)
-        oa = o.operational_authorizations.all()
-        for authorization in oa: 
-            authorizations.append(authorization.title)
-        return authorizations
-
 
     class Meta:
         model = Operator
         fields = ('id', 'company_name', 'website', 'email', 'operator_type', 'address', 'operational_authorizations', 'authorized_activities', 'created_at', 'updated_at')
 
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     person = PersonSerializer(read_only=True)
     operator = OperatorSerializer(read_only=True)
     class Meta:
@@ -137,7 +493,7 @@ class ContactCreateSerializer(serializers.ModelSerializer):
         )
         return contact
 
-class PilotSerializer(serializers.ModelSerializer):
+class PilotSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     person = PersonSerializer(read_only=True)
     operator = OperatorSerializer(read_only=True)
     tests = TestsSerializer(read_only=True)
@@ -168,7 +524,32 @@ class PilotCreateSerializer(serializers.ModelSerializer):
         )
         return pilot
 
-class AircraftSerializer(serializers.ModelSerializer):
+class UniqueESNMixin(object):
+    """
+    Rejects an ESN already registered to another aircraft, compared trimmed and upper-cased (the unique
+    esn_normalized column). Blank and all-zero placeholder ESNs may repeat. Bulk creates check against the
+    taken_esns set AircraftBulkCreateSerializer keeps (registered ESNs and those of the valid items before this
+    one) instead of one query per item.
+    """
+
+    def validate_esn(self, value):
+        esn = normalize_esn(value)
+        if esn is None:
+            return value
+        taken = self.context.get('taken_esns')
+        if taken is None:
+            others = Aircraft.objects.filter(esn_normalized=esn)
+            if self.instance is not None:
+                others = others.exclude(pk=self.instance.pk)
+            duplicate = others.exists()
+        else:
+            duplicate = esn in taken
+        if duplicate:
+            raise serializers.ValidationError("An aircraft with ESN %s is already registered." % esn)
+        return value
+
+
+class AircraftSerializer(UniqueESNMixin, FastReadMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     type_certificate = TypeCertificateSerializer(read_only= True)
     class Meta:
         model = Aircraft
@@ -176,15 +557,115 @@ class AircraftSerializer(serializers.ModelSerializer):
         
         
 
-class AircraftCreateSerializer(serializers.ModelSerializer):
+def default_manufacturer():
+    """ The first manufacturer, or a default one (and its address) when there are none """
+    manufacturer = Manufacturer.objects.all().first()
+    if manufacturer is not None:
+        return manufacturer
+    # Create a default address
+    address = Address.objects.create(
+        address_line_1="Default Address",
+        address_line_2="",
+        address_line_3="",
+        postcode="00000",
+        city="Default City",
+        country="US"
+    )
+    # Create a default manufacturer
+    return Manufacturer.objects.create(
+        full_name="Default Manufacturer",
+        common_name="Default",
+        address=address,
+        acronym="DEF",
+        role="Manufacturer",
+        country="US"
+    )
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that looks objects up in the context's related_objects map when a bulk
+    serializer has loaded them up front, instead of running one query per item.
+    """
+
+    def to_internal_value(self, data):
+        loaded = self.context.get('related_objects', {}).get(self.get_queryset().model)
+        if loaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = loaded.get(str(data).lower())
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class AircraftBulkCreateSerializer(BulkCreateListSerializer):
+    """
+    many=True for AircraftCreateSerializer. Operators and manufacturers referenced by the batch, and those of its
+    ESNs that are already registered, are loaded with one query each and the valid aircraft are inserted with
+    bulk_create, indexed for search and counted in their operators' summaries, in one transaction.
+    """
+
+    def related_pks(self, data, name):
+        pks = set()
+        for item in data:
+            value = item.get(name) if isinstance(item, dict) else None
+            try:
+                pks.add(str(uuid.UUID(str(value))))
+            except ValueError:
+                pass
+        return pks
+
+    def prefetch(self, data):
+        related = {}
+        for name, model in (('operator', Operator), ('manufacturer', Manufacturer)):
+            objects = model.objects.in_bulk(self.related_pks(data, name))
+            related[model] = {str(pk): obj for pk, obj in objects.items()}
+        self._context['related_objects'] = related
+        esns = set(normalize_esn(item.get('esn')) for item in data if isinstance(item, dict)) - {None}
+        self._context['taken_esns'] = set(
+            Aircraft.objects.filter(esn_normalized__in=esns).values_list('esn_normalized', flat=True))
+
+    def accept(self, item):
+        # Only items that will be created claim their ESN.
+        esn = normalize_esn(item.get('esn'))
+        if esn is not None:
+            self._context['taken_esns'].add(esn)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            fallback = None
+            certificates, aircraft = [], []
+            for item in validated_data:
+                item = dict(item)
+                certificate_data = item.pop('type_certificate', None)
+                if certificate_data:
+                    item['type_certificate'] = TypeCertificate(**certificate_data)
+                    certificates.append(item['type_certificate'])
+                if not item.get('manufacturer'):
+                    if fallback is None:
+                        fallback = default_manufacturer()
+                    item['manufacturer'] = fallback
+                aircraft.append(Aircraft(**item))
+            TypeCertificate.objects.bulk_create(certificates)
+            created = Aircraft.objects.bulk_create(aircraft)
+            search.add_objects('aircraft', created)
+            summaries.add_objects(created)
+            return created
+
+
+class AircraftCreateSerializer(UniqueESNMixin, serializers.ModelSerializer):
     ''' Serializer for creating a new aircraft '''
     type_certificate = TypeCertificateSerializer(required=False, allow_null=True)
     registration_mark = serializers.CharField(required=False, allow_blank=True, max_length=10)
     icao_aircraft_type_designator = serializers.CharField(required=False, allow_blank=True, max_length=4, default='0000')
-    manufacturer = serializers.PrimaryKeyRelatedField(queryset=Manufacturer.objects.all(), required=False, allow_null=True)
+    operator = BulkPrimaryKeyRelatedField(queryset=Operator.objects.all())
+    manufacturer = BulkPrimaryKeyRelatedField(queryset=Manufacturer.objects.all(), required=False, allow_null=True)
     
     class Meta:
         model = Aircraft
+        list_serializer_class = AircraftBulkCreateSerializer
         fields = ('operator', 'mass', 'manufacturer', 'model', 'esn', 'maci_number',
                  'registration_mark', 'category', 'sub_category', 'is_airworthy',
                  'icao_aircraft_type_designator', 'max_certified_takeoff_weight', 'status',
@@ -211,29 +692,7 @@ class AircraftCreateSerializer(serializers.ModelSerializer):
         
         # Handle missing or empty manufacturer
         if 'manufacturer' not in validated_data or not validated_data['manufacturer']:
-            # Get the first manufacturer or create a default one if none exists
-            manufacturers = Manufacturer.objects.all()
-            if manufacturers.exists():
-                validated_data['manufacturer'] = manufacturers.first()
-            else:
-                # Create a default address
-                address = Address.objects.create(
-                    address_line_1="Default Address",
-                    address_line_2="",
-                    address_line_3="",
-                    postcode="00000",
-                    city="Default City",
-                    country="US"
-                )
-                # Create a default manufacturer
-                validated_data['manufacturer'] = Manufacturer.objects.create(
-                    full_name="Default Manufacturer",
-                    common_name="Default",
-                    address=address,
-                    acronym="DEF",
-                    role="Manufacturer",
-                    country="US"
-                )
+            validated_data['manufacturer'] = default_manufacturer()
         
         # Create the aircraft
         aircraft = Aircraft.objects.create(**validated_data)
@@ -245,7 +704,7 @@ class AircraftCreateSerializer(serializers.ModelSerializer):
         
         return aircraft
 
-class AircraftESNSerializer(serializers.ModelSerializer):
+class AircraftESNSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Aircraft
@@ -253,60 +712,44 @@ class AircraftESNSerializer(serializers.ModelSerializer):
         lookup_field = 'esn'
         
         
-class PrivilagedPilotSerializer(serializers.ModelSerializer):
+class PrivilagedPilotSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     ''' This is the privilaged serializer for Pilot specially for law enforcement and other privilaged interested parties '''
-    tests = serializers.SerializerMethodField()
-    operator_id = serializers.SerializerMethodField()
-	
-    def get_tests(self, response):
-        tests = []
-        p = Pilot.objects.get(id=response.id)
-        all_tests = p.tests.all()
-        for test in all_tests: 
-            tests.append(test.name)
-        return tests
+    tests = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+    first_name = serializers.CharField(source='person.first_name', read_only=True)
+    last_name = serializers.CharField(source='person.last_name', read_only=True)
+    email = serializers.EmailField(source='person.email', read_only=True)
+    phone_number = serializers.CharField(source='person.phone_number', read_only=True)
 
     class Meta:
         model = Pilot
         fields = ('id',  'operator', 'first_name','is_active', 'last_name', 'email','phone_number','tests', 'updated_at')
 
 
-class PrivilagedContactSerializer(serializers.ModelSerializer):
+class PrivilagedContactSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     ''' This is the privilaged serializer for Contact model specially for law enforcement and other privilaged interested parties '''
-
-    authorized_activities = serializers.SerializerMethodField()
-    operational_authorizations = serializers.SerializerMethodField()
-
-    def get_authorized_activities(self, response):
-        activities = []
-        c = Contact.objects.get(id =response.id)
-        o = c.operator
-        oa = o.authorized_activities.all()
-        for activity in oa: 
-            activities.append(activity.name)
-        return activities
-
-    def get_operational_authorizations(self, response):
-        authorizations = []
-        c = Contact.objects.get(id =response.id)
-        o = c.operator
-        oa = o.operational_authorizations.all()
-        for authorization in oa: 
-            authorizations.append(authorization.title)
-        return authorizations
+    company_name = serializers.CharField(source='operator.company_name', read_only=True)
+    website = serializers.URLField(source='operator.website', read_only=True)
+    email = serializers.EmailField(source='operator.email', read_only=True)
+    operator_type = serializers.IntegerField(source='operator.operator_type', read_only=True)
+    phone_number = serializers.CharField(source='operator.phone_number', read_only=True)
+    address = serializers.CharField(source='address.address_line_1', read_only=True)
+    postcode = serializers.CharField(source='address.postcode', read_only=True)
+    city = serializers.CharField(source='address.city', read_only=True)
+    authorized_activities = serializers.SlugRelatedField(source='operator.authorized_activities', many=True, read_only=True, slug_field='name')
+    operational_authorizations = serializers.SlugRelatedField(source='operator.operational_authorizations', many=True, read_only=True, slug_field='title')
 
     class Meta:
         model = Contact
         fields = ('id', 'company_name', 'operator','website', 'email', 'operator_type', 'phone_number', 'address',
                   'postcode', 'city', 'operational_authorizations', 'authorized_activities', 'created_at', 'updated_at')
 
-class ManufacturerSerializer(serializers.ModelSerializer):
+class ManufacturerSerializer(FastReadMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Manufacturer
         fields = ('id', 'full_name', 'common_name', 'acronym', 'role', 'country')
 
 
-class RIDModuleSerializer(serializers.ModelSerializer):
+class RIDModuleSerializer(FastReadMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for RID Module list and detail views"""
     operator = OperatorSerializer(read_only=True)
     aircraft = AircraftSerializer(read_only=True)
@@ -322,6 +765,86 @@ class RIDModuleSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'rid_id', 'created_at', 'updated_at')
 
 
+class OperatorSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Operator
+        fields = ('id', 'company_name')
+
+
+class AircraftSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Aircraft
+        fields = ('id', 'registration_mark', 'model', 'esn', 'status')
+
+
+class RIDModuleResolutionSerializer(FastReadMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact RID module representation returned by the batch resolve endpoint"""
+    operator = OperatorSummarySerializer(read_only=True)
+    aircraft = AircraftSummarySerializer(read_only=True)
+
+    class Meta:
+        model = RIDModule
+        fields = ('id', 'rid_id', 'module_esn', 'status', 'activation_status', 'last_seen_at', 'operator', 'aircraft')
+
+
+class RIDModuleResolveSerializer(serializers.Serializer):
+    """Identifiers to resolve in one batch"""
+    rid_ids = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+    module_esns = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+    def validate(self, attrs):
+        total = len(attrs['rid_ids']) + len(attrs['module_esns'])
+        if not total:
+            raise serializers.ValidationError("Provide at least one rid_id or module_esn")
+        limit = settings.REGISTRY_RESOLVE_MAX_IDS
+        if total > limit:
+            raise serializers.ValidationError(f"At most {limit} identifiers can be resolved per request")
+        return attrs
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Query parameters of /api/v1/search"""
+    q = serializers.CharField(max_length=200)
+    type = serializers.CharField(required=False, default='')
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=100)
+
+    def validate_q(self, value):
+        if not search.search_terms(value):
+            raise serializers.ValidationError("Enter at least one word to search for")
+        return value
+
+    def validate_type(self, value):
+        kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+        unknown = sorted(set(kinds) - set(search.DOCUMENTS))
+        if unknown:
+            raise serializers.ValidationError(
+                "Unknown type(s) %s, use %s" % (', '.join(unknown), ', '.join(search.DOCUMENTS)))
+        return kinds
+
+
+class HeartbeatSightingSerializer(serializers.Serializer):
+    """One sighting of a RID module, identified by rid_id or module_esn"""
+    rid_id = serializers.UUIDField(required=False)
+    module_esn = serializers.CharField(required=False)
+    seen_at = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if ('rid_id' in attrs) == ('module_esn' in attrs):
+            raise serializers.ValidationError("Provide exactly one of rid_id or module_esn")
+        return attrs
+
+
+class RIDModuleHeartbeatSerializer(serializers.Serializer):
+    """Batch of sightings reported by a receiver"""
+    sightings = HeartbeatSightingSerializer(many=True, allow_empty=False)
+
+    def validate_sightings(self, value):
+        limit = settings.REGISTRY_HEARTBEAT_MAX_SIGHTINGS
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} sightings can be sent per request")
+        return value
+
+
 class RIDModuleCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating a new RID Module"""
     rid_id = serializers.UUIDField(required=False, help_text="RID ID (UUID v4). If not provided, will be generated.")
@@ -0,0 +1,195 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from registry import search, summaries
+from registry.cache import bump_cache_version, rid_cache
+from registry.models import (Aircraft, Contact, Manufacturer, NormalizedCharField, Operator, Person, Pilot, RIDModule,
+                             Tombstone, TypeCertificate)
+from registry.serializers import AircraftSerializer, OperatorSerializer, PersonSerializer
+
+SEARCH_KINDS = {Operator: 'operator', Aircraft: 'aircraft', Pilot: 'pilot'}
+TOMBSTONE_KINDS = {Operator: 'operator', Aircraft: 'aircraft', Pilot: 'pilot', Contact: 'contact',
+                   RIDModule: 'rid_module'}
+
+
+@receiver(pre_save, sender=Aircraft)
+def normalize_raw_save(sender, instance, raw=False, **kwargs):
+    # Raw saves (fixtures) store attribute values as they are, without calling Field.pre_save.
+    if raw:
+        for field in sender._meta.concrete_fields:
+            if isinstance(field, NormalizedCharField):
+                field.pre_save(instance, instance._state.adding)
+
+
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+def invalidate_manufacturers(sender, **kwargs):
+    bump_cache_version('manufacturers')
+
+
+def invalidate_rid_modules(queryset):
+    rid_cache.invalidate(queryset.values_list('rid_id', 'module_esn'))
+
+
+@receiver(pre_save, sender=RIDModule)
+def remember_rid_module_keys(sender, instance, raw=False, **kwargs):
+    # The identifiers may be changing, the entries under the old ones have to go as well.
+    if not instance._state.adding:
+        instance._cached_rid_keys = list(RIDModule.objects.filter(pk=instance.pk).values_list('rid_id', 'module_esn'))
+
+
+@receiver(post_save, sender=RIDModule)
+def invalidate_saved_rid_module(sender, instance, **kwargs):
+    keys = getattr(instance, '_cached_rid_keys', [])
+    instance._cached_rid_keys = []
+    rid_cache.invalidate(keys + [(instance.rid_id, instance.module_esn)])
+
+
+@receiver(post_delete, sender=RIDModule)
+def invalidate_deleted_rid_module(sender, instance, **kwargs):
+    rid_cache.invalidate([(instance.rid_id, instance.module_esn)])
+
+
+@receiver(post_save, sender=Operator)
+def invalidate_operator_rid_modules(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_rid_modules(RIDModule.objects.filter(operator=instance))
+
+
+@receiver(post_save, sender=Aircraft)
+@receiver(pre_delete, sender=Aircraft)
+def invalidate_aircraft_rid_modules(sender, instance, created=False, **kwargs):
+    # pre_delete: the modules are detached with a plain UPDATE (SET_NULL), which sends no signals.
+    if not created:
+        invalidate_rid_modules(RIDModule.objects.filter(aircraft=instance))
+
+
+@receiver(post_save, sender=TypeCertificate)
+def invalidate_type_certificate_rid_modules(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_rid_modules(RIDModule.objects.filter(aircraft__type_certificate=instance))
+
+
+@receiver(post_save, sender=Operator)
+@receiver(post_save, sender=Aircraft)
+@receiver(post_save, sender=Pilot)
+def index_for_search(sender, instance, raw=False, **kwargs):
+    # Fixtures (raw saves) and bulk loads are indexed by rebuild_search_index.
+    if not raw:
+        search.index_objects(SEARCH_KINDS[sender], [instance])
+
+
+@receiver(post_delete, sender=Operator)
+@receiver(post_delete, sender=Aircraft)
+@receiver(post_delete, sender=Pilot)
+def remove_from_search(sender, instance, **kwargs):
+    search.remove_objects(SEARCH_KINDS[sender], [instance.pk])
+
+
+@receiver(post_save, sender=Person)
+def index_person_pilots(sender, instance, created=False, raw=False, **kwargs):
+    # Pilots are found by the name of their person.
+    if not created and not raw:
+        search.index_objects('pilot', search.index_queryset('pilot', Pilot.objects.filter(person=instance)))
+
+
+@receiver(post_delete, sender=Operator)
+@receiver(post_delete, sender=Aircraft)
+@receiver(post_delete, sender=Pilot)
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=RIDModule)
+def record_tombstone(sender, instance, **kwargs):
+    # Sent for cascaded deletes too: a model with post_delete receivers is never fast-deleted.
+    Tombstone.objects.create(kind=TOMBSTONE_KINDS[sender], object_id=instance.pk)
+
+
+def touch(*querysets):
+    now = timezone.now()
+    for queryset in querysets:
+        queryset.update(updated_at=now)
+
+
+def rendered_fields(model, serializer_class):
+    return tuple(model._meta.get_field(name).attname for name in dict.fromkeys(serializer_class.Meta.fields)
+                 if name not in ('id', 'created_at', 'updated_at'))
+
+
+# Pilots, contacts and RID modules render their operator, person or aircraft: bumping their updated_at puts them
+# back in the ?updated_since= change feeds when a field they render changes (saves that change none of them, the
+# timestamps aside, leave the dependents alone).
+RENDERED_FIELDS = {Operator: rendered_fields(Operator, OperatorSerializer),
+                   Person: rendered_fields(Person, PersonSerializer),
+                   Aircraft: rendered_fields(Aircraft, AircraftSerializer)}
+
+
+def rendered_change(sender, instance, created, raw):
+    return not created and not raw and bool(instance.changed_fields(RENDERED_FIELDS[sender]))
+
+
+@receiver(post_save, sender=Operator)
+def touch_operator_dependents(sender, instance, created=False, raw=False, **kwargs):
+    if rendered_change(sender, instance, created, raw):
+        touch(Pilot.objects.filter(operator=instance), Contact.objects.filter(operator=instance),
+              RIDModule.objects.filter(operator=instance))
+
+
+@receiver(post_save, sender=Person)
+def touch_person_dependents(sender, instance, created=False, raw=False, **kwargs):
+    if rendered_change(sender, instance, created, raw):
+        touch(Pilot.objects.filter(person=instance), Contact.objects.filter(person=instance))
+
+
+@receiver(post_save, sender=Aircraft)
+def touch_aircraft_rid_modules(sender, instance, created=False, raw=False, **kwargs):
+    if rendered_change(sender, instance, created, raw):
+        touch(RIDModule.objects.filter(aircraft=instance))
+
+
+@receiver(pre_delete, sender=Aircraft)
+def touch_detached_rid_modules(sender, instance, **kwargs):
+    # The modules lose their aircraft in a plain UPDATE (SET_NULL).
+    touch(RIDModule.objects.filter(aircraft=instance))
+
+
+@receiver(post_save, sender=Operator)
+def create_operator_summary(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        summaries.create_for([instance])
+
+
+@receiver(pre_save, sender=Aircraft)
+@receiver(pre_save, sender=RIDModule)
+@receiver(pre_save, sender=Pilot)
+@receiver(pre_save, sender=Contact)
+def remember_counting_operator(sender, instance, raw=False, **kwargs):
+    instance._counted_by = None
+    if raw or instance._state.adding:
+        return
+    fields = ('operator_id',) + tuple(summaries.COUNTED[sender][1])
+    if not instance.changed_fields(fields):
+        # Counted as loaded: nothing to adjust, and no query.
+        instance._counted_by = summaries.counted_by(instance)
+        return
+    # The row stays locked until the save commits (AtomicSaveMixin), concurrent saves cannot both count a move.
+    previous = sender.objects.select_for_update().only(*fields).filter(pk=instance.pk).first()
+    instance._counted_by = summaries.counted_by(previous) if previous is not None else None
+
+
+@receiver(post_save, sender=Aircraft)
+@receiver(post_save, sender=RIDModule)
+@receiver(post_save, sender=Pilot)
+@receiver(post_save, sender=Contact)
+def count_in_operator_summary(sender, instance, raw=False, **kwargs):
+    if not raw:
+        before, after = getattr(instance, '_counted_by', None), summaries.counted_by(instance)
+        if before != after:
+            summaries.adjust(summaries.COUNTED[sender][0], {before: -1, after: 1})
+
+
+@receiver(post_delete, sender=Aircraft)
+@receiver(post_delete, sender=RIDModule)
+@receiver(post_delete, sender=Pilot)
+@receiver(post_delete, sender=Contact)
+def uncount_in_operator_summary(sender, instance, **kwargs):
+    summaries.adjust(summaries.COUNTED[sender][0], {summaries.counted_by(instance): -1})
@@ -0,0 +1,87 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from registry.models import Aircraft, Contact, Operator, OperatorSummary, Pilot, RIDModule
+
+# Counted model: (OperatorSummary field, conditions a row has to meet to be counted)
+COUNTED = {
+    Aircraft: ('aircraft_count', {}),
+    RIDModule: ('active_rid_module_count', {'status': 'active'}),
+    Pilot: ('pilot_count', {}),
+    Contact: ('contact_count', {}),
+}
+
+
+def counted_by(instance):
+    """ Id of the operator whose summary counts instance, None when it is not counted (a RID module not active) """
+    field, conditions = COUNTED[type(instance)]
+    if all(getattr(instance, name) == value for name, value in conditions.items()):
+        return instance.operator_id
+    return None
+
+
+def adjust(field, deltas):
+    """
+    Adds deltas ({operator id: n}) to field of the summaries, one UPDATE per distinct n (a bulk create of one
+    aircraft for each of many operators is a single UPDATE). Counts never go below zero, whatever a summary that
+    went stale says.
+    """
+    operators = {}
+    for operator_id, delta in deltas.items():
+        if operator_id is not None and delta:
+            operators.setdefault(delta, []).append(operator_id)
+    now = timezone.now()
+    for delta, operator_ids in operators.items():
+        OperatorSummary.objects.filter(operator_id__in=operator_ids).update(
+            **{field: Greatest(F(field) + delta, Value(0)), 'updated_at': now})
+
+
+def build(operators, *groups):
+    """ Unsaved summaries of new operators, counting the new objects in groups (lists of counted models) """
+    built = {operator.pk: OperatorSummary(operator_id=operator.pk) for operator in operators}
+    for objects in groups:
+        for obj in objects:
+            summary = built.get(counted_by(obj))
+            if summary is not None:
+                field = COUNTED[type(obj)][0]
+                setattr(summary, field, getattr(summary, field) + 1)
+    return list(built.values())
+
+
+def create_for(operators):
+    """ Empty summaries of new operators: one INSERT """
+    OperatorSummary.objects.bulk_create(build(operators), ignore_conflicts=True)
+
+
+def add_objects(objects):
+    """ Counts new objects of one counted model (bulk creates, which send no signals) """
+    objects = list(objects)
+    if objects:
+        deltas = Counter(counted_by(obj) for obj in objects)
+        adjust(COUNTED[type(objects[0])][0], deltas)
+
+
+def count_subquery(model, conditions):
+    rows = model.objects.filter(operator=OuterRef('pk'), **conditions).order_by().values('operator')
+    return Coalesce(Subquery(rows.annotate(count=Count('pk')).values('count')), Value(0))
+
+
+def rebuild(batch_size=2000):
+    """ Recreates every summary from the registry tables, returns the number of summaries """
+    counts = {field: count_subquery(model, conditions) for model, (field, conditions) in COUNTED.items()}
+    rows = Operator.objects.order_by().annotate(**counts).values('pk', *counts)
+    total = 0
+    with transaction.atomic():
+        OperatorSummary.objects.all().delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(OperatorSummary(operator_id=row.pop('pk'), **row))
+            if len(batch) >= batch_size:
+                total += len(OperatorSummary.objects.bulk_create(batch))
+                batch = []
+        total += len(OperatorSummary.objects.bulk_create(batch))
+    return total
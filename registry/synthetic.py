@@ -0,0 +1,205 @@
+"""
+Seeded synthetic registry data for local performance work.
+
+Every value, primary keys included, is drawn from one ``random.Random(seed)``, so the same seed and volumes
+produce the same registry (``created_at`` / ``updated_at`` aside). Rows are bulk-inserted one chunk of operators
+at a time, together with their addresses, contacts, pilots, aircraft and RID modules.
+"""
+import random
+import string
+import uuid
+from datetime import timedelta
+
+from django.utils import timezone
+
+from registry import search, summaries
+from registry.models import (Activity, Address, Aircraft, Authorization, Contact, Manufacturer, Operator,
+                             OperatorSummary, Person, Pilot, RIDModule, SearchEntry, Test, TestValidity,
+                             TypeCertificate)
+
+COUNTRIES = ['GB', 'US', 'DE', 'FR', 'IN', 'NL', 'ES', 'IT', 'CA', 'AU', 'JP', 'CH', 'SE', 'IE', 'PL']
+# Roughly how operators are spread over countries, the registry is UK-heavy.
+COUNTRY_WEIGHTS = [30, 15, 8, 8, 8, 5, 5, 5, 4, 3, 3, 2, 2, 1, 1]
+CITIES = ['London', 'Manchester', 'Bristol', 'Leeds', 'Berlin', 'Paris', 'Bengaluru', 'Amsterdam', 'Madrid',
+          'Milan', 'Toronto', 'Sydney', 'Osaka', 'Zurich', 'Stockholm', 'Dublin', 'Warsaw', 'Austin', 'Denver']
+STREETS = ['High Street', 'Station Road', 'Church Lane', 'Mill Road', 'Airfield Way', 'Hangar Row', 'Park Avenue',
+           'Market Square', 'Bridge Street', 'Runway Close']
+FIRST_NAMES = ['Alex', 'Sam', 'Priya', 'Jordan', 'Maria', 'Chen', 'Fatima', 'Tom', 'Aisha', 'Lukas', 'Sofia',
+               'Kenji', 'Olivia', 'Ravi', 'Emma', 'Noah', 'Zara', 'Mateo', 'Ingrid', 'Oscar']
+LAST_NAMES = ['Smith', 'Patel', 'Garcia', 'Müller', 'Dubois', 'Kowalski', 'Tanaka', 'Okafor', 'Jones', 'Rossi',
+              'Andersson', 'Murphy', 'Khan', 'Nguyen', 'Silva', 'Brown', 'Schmidt', 'Singh', 'Walker', 'Evans']
+COMPANY_WORDS = ['Sky', 'Aero', 'Vertical', 'Falcon', 'Horizon', 'Survey', 'Rotor', 'Vision', 'Atlas', 'Nimbus',
+                 'Summit', 'Delta', 'Apex', 'Orbit', 'Kestrel', 'Pioneer', 'Meridian', 'Zephyr']
+COMPANY_SUFFIXES = ['Ltd', 'LLC', 'GmbH', 'SAS', 'Pvt Ltd', 'BV', 'Inc', 'Aerial Services', 'Drones', 'Robotics']
+MANUFACTURERS = [('SZ DJI Technology Co., Ltd.', 'DJI', 'CN'), ('Parrot Drones SAS', 'Parrot', 'FR'),
+                 ('Autel Robotics', 'Autel', 'CN'), ('Skydio Inc.', 'Skydio', 'US'), ('senseFly SA', 'senseFly', 'CH'),
+                 ('Yuneec International', 'Yuneec', 'CN'), ('Wingtra AG', 'Wingtra', 'CH'),
+                 ('Quantum-Systems GmbH', 'Quantum', 'DE'), ('ideaForge Technology', 'ideaForge', 'IN'),
+                 ('Teal Drones', 'Teal', 'US')]
+MODELS = ['Mavic 3', 'Matrice 300 RTK', 'Phantom 4 Pro', 'Anafi USA', 'EVO II Pro', 'X2D', 'eBee X', 'H520E',
+          'WingtraOne Gen II', 'Trinity F90+', 'Q6 UAV', 'Golden Eagle', 'Inspire 2', 'Mini 3 Pro']
+RID_MODULE_STATUSES = ['active'] * 8 + ['inactive', 'lost', 'decommissioned']
+
+
+class RegistryGenerator(object):
+    """ Builds a registry of configurable size from a fixed seed """
+
+    def __init__(self, seed=1, batch_size=1000):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.counts = {}
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def code(self, length, alphabet=string.ascii_uppercase + string.digits):
+        return ''.join(self.rng.choice(alphabet) for _ in range(length))
+
+    def phone(self):
+        return '+44%010d' % self.rng.randrange(10 ** 10)
+
+    def create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def generate(self, operators=1000, aircraft_per_operator=5, pilots_per_operator=2, contacts_per_operator=1,
+                 rid_module_ratio=0.6, manufacturers=10, progress=None):
+        """
+        Inserts ``operators`` operators and, on average, the given number of aircraft, pilots and contacts for each
+        (actual numbers vary per operator). ``rid_module_ratio`` of the aircraft get an RID module.
+        ``progress`` is called with the counts after every chunk. Returns the counts per model.
+        """
+        self.reference_data(manufacturers)
+        done = 0
+        while done < operators:
+            chunk = min(self.batch_size, operators - done)
+            self.operator_chunk(chunk, aircraft_per_operator, pilots_per_operator, contacts_per_operator,
+                                rid_module_ratio)
+            done += chunk
+            if progress is not None:
+                progress(dict(self.counts))
+        return dict(self.counts)
+
+    def reference_data(self, manufacturers):
+        self.activities = self.create(Activity, [
+            Activity(id=self.uuid(), name=name, activity_type=kind)
+            for name, kind in (('Aerial photography', 1), ('Agriculture', 2), ('Inspection', 2), ('Mapping', 1),
+                               ('Delivery', 2), ('Recreational', 1))
+        ])
+        self.authorizations = self.create(Authorization, [
+            Authorization(id=self.uuid(), title='%s operations %d' % (kind, i), operation_max_height=self.rng.choice([60, 120, 400]),
+                          airspace_type=self.rng.randrange(3), risk_type=self.rng.randrange(3))
+            for i, kind in enumerate(['Open', 'Specific', 'Certified', 'BVLOS'])
+        ])
+        self.tests = self.create(Test, [
+            Test(id=self.uuid(), name=name, test_type=kind, taken_at=kind)
+            for name, kind in (('Online theory test', 0), ('Flight competency assessment', 1), ('BVLOS module', 2))
+        ])
+        self.manufacturers = self.create(Manufacturer, [
+            Manufacturer(id=self.uuid(), full_name=full_name, common_name=common_name, acronym=common_name[:10].upper(),
+                         role='Drone Manufacturer', country=country)
+            for full_name, common_name, country in (MANUFACTURERS[i % len(MANUFACTURERS)] for i in range(manufacturers))
+        ])
+
+    def address(self, country):
+        return Address(id=self.uuid(), address_line_1='%d %s' % (self.rng.randint(1, 300), self.rng.choice(STREETS)),
+                       address_line_2='Unit %d' % self.rng.randint(1, 40), address_line_3='-',
+                       postcode=self.code(6), city=self.rng.choice(CITIES), country=country)
+
+    def person(self):
+        first_name, last_name = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        return Person(id=self.uuid(), first_name=first_name, last_name=last_name,
+                      email='%s.%s%d@example.com' % (first_name.lower(), last_name.lower(), self.rng.randrange(10000)),
+                      phone_number=self.phone(), identification_number=self.code(10))
+
+    def count(self, mean):
+        """ Per-operator count around ``mean``: most operators are small, a few run large fleets """
+        if mean <= 0:
+            return 0
+        return min(int(self.rng.expovariate(1.0 / mean) + 0.5), int(mean * 20))
+
+    def operator_chunk(self, size, aircraft_per_operator, pilots_per_operator, contacts_per_operator,
+                       rid_module_ratio):
+        now = timezone.now()
+        addresses, operators = [], []
+        for _ in range(size):
+            country = self.rng.choices(COUNTRIES, COUNTRY_WEIGHTS)[0]
+            address = self.address(country)
+            name = '%s %s %s' % (self.rng.choice(COMPANY_WORDS), self.rng.choice(COMPANY_WORDS),
+                                 self.rng.choice(COMPANY_SUFFIXES))
+            slug = ''.join(ch for ch in name.lower() if ch.isalnum())[:30]
+            addresses.append(address)
+            operators.append(Operator(
+                id=self.uuid(), company_name=name, website='https://%s.example' % slug, email='ops@%s.example' % slug,
+                phone_number=self.phone(), operator_type=self.rng.randrange(5), address=address, country=country,
+                expiration=now + timedelta(days=self.rng.randint(-60, 730)),
+                vat_number=self.code(12) if self.rng.random() < 0.7 else None,
+                company_number=self.code(8) if self.rng.random() < 0.8 else None,
+            ))
+
+        persons, people = [], []
+        aircraft, certificates, modules = [], [], []
+        for operator in operators:
+            for model, mean in ((Contact, contacts_per_operator), (Pilot, pilots_per_operator)):
+                for _ in range(self.count(mean)):
+                    person, address = self.person(), self.address(operator.country)
+                    persons.append(person)
+                    addresses.append(address)
+                    people.append(model(id=self.uuid(), operator=operator, person=person, address=address,
+                                        **({'role_type': self.rng.randrange(2)} if model is Contact
+                                           else {'is_active': self.rng.random() < 0.8})))
+            for _ in range(self.count(aircraft_per_operator)):
+                certificate = None
+                if self.rng.random() < 0.3:
+                    certificate = TypeCertificate(
+                        id=self.uuid(), type_certificate_id='TC-%s' % self.code(6),
+                        type_certificate_issuing_country=operator.country,
+                        type_certificate_holder=self.rng.choice(MANUFACTURERS)[1], type_certificate_holder_country='NA')
+                    certificates.append(certificate)
+                manufacturer = self.rng.choice(self.manufacturers)
+                craft = Aircraft(
+                    id=self.uuid(), operator=operator, manufacturer=manufacturer, mass=self.rng.randint(250, 25000),
+                    is_airworthy=self.rng.random() < 0.9, make=manufacturer.common_name, model=self.rng.choice(MODELS),
+                    category=self.rng.choice([1, 2, 2, 2, 4]), registration_mark='%s-%s' % (operator.country, self.code(5)),
+                    esn=self.code(16, string.hexdigits[:16].upper()), maci_number='MACI-%s' % self.code(8),
+                    type_certificate=certificate, status=int(self.rng.random() < 0.9),
+                    max_certified_takeoff_weight=self.rng.randint(1, 25),
+                )
+                aircraft.append(craft)
+                if self.rng.random() < rid_module_ratio:
+                    modules.append(RIDModule(
+                        id=self.uuid(), rid_id=self.uuid(), operator=operator, aircraft=craft,
+                        module_esn=self.code(16, string.hexdigits[:16].upper()),
+                        status=self.rng.choice(RID_MODULE_STATUSES),
+                        activation_status=self.rng.choice(['temporary', 'permanent']),
+                        last_seen_at=now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 30)),
+                    ))
+
+        self.create(Address, addresses)
+        self.create(Operator, operators)
+        self.create(Person, persons)
+        contacts = self.create(Contact, [item for item in people if isinstance(item, Contact)])
+        pilots = self.create(Pilot, [item for item in people if isinstance(item, Pilot)])
+        self.create(TypeCertificate, certificates)
+        self.create(Aircraft, aircraft)
+        self.create(RIDModule, modules)
+        # bulk_create sends no signals, the search entries and operator summaries are added here.
+        self.create(SearchEntry, [entry for kind, objects in (('operator', operators), ('aircraft', aircraft),
+                                                                ('pilot', pilots))
+                                  for entry in search.entries(kind, objects)])
+        self.create(OperatorSummary, summaries.build(operators, aircraft, modules, pilots, contacts))
+
+        activities = Operator.authorized_activities.through
+        authorizations = Operator.operational_authorizations.through
+        self.create(activities, [activities(operator_id=operator.id, activity_id=activity.id)
+                                 for operator in operators
+                                 for activity in self.rng.sample(self.activities, self.rng.randint(1, 3))])
+        self.create(authorizations, [authorizations(operator_id=operator.id, authorization_id=authorization.id)
+                                     for operator in operators
+                                     for authorization in self.rng.sample(self.authorizations, self.rng.randint(0, 2))])
+        self.create(TestValidity, [
+            TestValidity(id=self.uuid(), pilot=pilot, test=test, taken_at=now - timedelta(days=self.rng.randint(1, 700)),
+                         expiration=now + timedelta(days=self.rng.randint(-30, 700)))
+            for pilot in pilots for test in self.rng.sample(self.tests, self.rng.randint(1, 2))
+        ])
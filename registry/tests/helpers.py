@@ -0,0 +1,41 @@
+"""
+Shared test setup: registry rows for setUpTestData(), where each function fills in the required fields with neutral
+values and keyword arguments override them, and the bearer token of privileged requests.
+"""
+import jwt
+
+from registry.models import Address, Aircraft, Manufacturer, Operator
+
+
+def privileged_token():
+    """ HS256 token with the read:privileged scope, signed with the test secret """
+    token = jwt.encode({'email': 'officer@example.com', 'scope': 'read:privileged'}, 'test-secret', algorithm='HS256')
+    if isinstance(token, bytes):
+        return token.decode('utf-8')
+    return token
+
+
+def create_address(**fields):
+    values = {'address_line_1': '1 Test Street', 'address_line_2': '-', 'address_line_3': '-', 'city': 'Testville',
+              'country': 'GB'}
+    values.update(fields)
+    return Address.objects.create(**values)
+
+
+def create_operator(company_name='Test Ltd', address=None, **fields):
+    """ Operator at address, a new one when it is None """
+    values = {'website': 'https://operator.example', 'email': 'ops@operator.example'}
+    values.update(fields)
+    return Operator.objects.create(company_name=company_name, address=address or create_address(), **values)
+
+
+def create_manufacturer(**fields):
+    values = {'full_name': 'Test Manufacturer', 'common_name': 'Test'}
+    values.update(fields)
+    return Manufacturer.objects.create(**values)
+
+
+def create_aircraft(operator, manufacturer, **fields):
+    values = {'mass': 5, 'model': 'Carrier', 'maci_number': 'MACI0'}
+    values.update(fields)
+    return Aircraft.objects.create(operator=operator, manufacturer=manufacturer, **values)
@@ -24,7 +24,7 @@ def test_create_aircraft():
     operators_url = 'http://localhost:8000/api/v1/operators'
     try:
         response = requests.get(operators_url, headers=headers)
-        operators = response.json() if response.status_code == 200 else []
+        operators = response.json()['results'] if response.status_code == 200 else []
         
         # Find our operator by company name
         operator_id = None
@@ -42,7 +42,7 @@ def test_create_aircraft():
         # Now get a manufacturer ID
         manufacturers_url = 'http://localhost:8000/api/v1/manufacturers'
         response = requests.get(manufacturers_url, headers=headers)
-        manufacturers = response.json() if response.status_code == 200 else []
+        manufacturers = response.json()['results'] if response.status_code == 200 else []
         manufacturer_id = manufacturers[0].get("id") if manufacturers else None
         
         if not manufacturer_id:
@@ -0,0 +1,164 @@
+import json
+
+from django.core import serializers
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry.models import Aircraft, normalize_esn, normalize_registration_mark
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator, privileged_token
+
+PLACEHOLDER = '0' * 48
+
+
+def load_fixture(aircraft):
+    """ Saves aircraft like loaddata does: raw, from a fixture without the normalized columns """
+    records = json.loads(serializers.serialize('json', aircraft))
+    for record in records:
+        record['fields'].pop('esn_normalized')
+        record['fields'].pop('registration_mark_normalized')
+    Aircraft.objects.filter(pk__in=[obj.pk for obj in aircraft]).delete()
+    for obj in serializers.deserialize('json', json.dumps(records)):
+        obj.save()
+
+
+class AircraftESNTests(TestCase):
+    """ ESNs are stored normalized in a unique, indexed column used for exact and prefix lookups """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Serial Ltd')
+        cls.manufacturer = create_manufacturer()
+        cls.aircraft = create_aircraft(cls.operator, cls.manufacturer, model='S1', maci_number='MACI1',
+                                       esn=' 1581f4abc001 ')
+        for i, esn in enumerate(('1581F4ABC002', '1581F5ZZZ001', PLACEHOLDER, PLACEHOLDER, '')):
+            create_aircraft(cls.operator, cls.manufacturer, model='S%d' % (i + 2), maci_number='MACI%d' % (i + 2),
+                            esn=esn)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def item(self, esn, **overrides):
+        item = {'operator': str(self.operator.id), 'manufacturer': str(self.manufacturer.id), 'mass': 5,
+                'model': 'New', 'maci_number': 'MACI-NEW', 'esn': esn}
+        item.update(overrides)
+        return item
+
+    def test_normalize_esn(self):
+        self.assertEqual(normalize_esn(' ab-12 '), 'AB-12')
+        for placeholder in (None, '', '   ', PLACEHOLDER, '000'):
+            self.assertIsNone(normalize_esn(placeholder))
+        self.assertEqual(self.aircraft.esn_normalized, '1581F4ABC001')
+        self.assertEqual(Aircraft.objects.filter(esn_normalized__isnull=True).count(), 3)
+
+    def test_lookup_ignores_case_and_whitespace(self):
+        for esn in ('1581F4ABC001', '1581f4abc001', '%201581f4abc001%20'):
+            response = self.client.get('/api/v1/aircraft/esn/%s' % esn)
+            self.assertEqual(response.status_code, 200, esn)
+            self.assertEqual(response.data['id'], str(self.aircraft.id))
+        self.assertEqual(self.client.get('/api/v1/aircraft/esn/%s' % PLACEHOLDER).status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/aircraft/esn/NOSUCHESN').status_code, 404)
+
+    def test_fixture_loads_are_normalized(self):
+        load_fixture([self.aircraft])
+        self.assertEqual(Aircraft.objects.get(pk=self.aircraft.pk).esn_normalized, '1581F4ABC001')
+        self.assertEqual(self.client.get('/api/v1/aircraft/esn/1581f4abc001').data['id'], str(self.aircraft.id))
+
+    def test_lookups_use_the_index(self):
+        for queryset in (Aircraft.objects.filter(esn_normalized='1581F4ABC001'),
+                         Aircraft.objects.filter(esn_normalized__gte='1581F4', esn_normalized__startswith='1581F4')):
+            self.assertIn('esn_normalized', queryset.explain())
+            self.assertNotIn('SCAN registry_aircraft\n', queryset.explain() + '\n')
+
+    def test_prefix_search(self):
+        response = self.client.get('/api/v1/aircraft', {'esn_prefix': '1581f4'})
+        self.assertEqual(sorted(item['esn'].strip().upper() for item in response.data['results']),
+                         ['1581F4ABC001', '1581F4ABC002'])
+        response = self.client.get('/api/v1/aircraft', {'esn_prefix': '1581'})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_duplicate_esn_is_rejected(self):
+        response = self.client.post('/api/v1/aircraft', self.item('1581F4ABC001 '), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('esn', response.data['errors'])
+        response = self.client.post('/api/v1/aircraft', self.item(PLACEHOLDER), format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_update_to_a_registered_esn_is_rejected(self):
+        other = Aircraft.objects.get(esn='1581F4ABC002')
+        url = '/api/v1/aircraft/%s' % other.id
+        self.assertEqual(self.client.patch(url, {'esn': '1581f4abc001'}, format='json').status_code, 400)
+        self.assertEqual(self.client.patch(url, {'esn': '1581f4abc002'}, format='json').status_code, 200)
+        other.refresh_from_db()
+        self.assertEqual(other.esn_normalized, '1581F4ABC002')
+
+    def test_bulk_duplicates_are_item_errors(self):
+        items = [self.item('BULK1', maci_number='B1'), self.item('bulk1', maci_number='B2'),
+                 self.item('1581F4ABC002', maci_number='B3'), self.item(PLACEHOLDER, maci_number='B4')]
+        response = self.client.post('/api/v1/aircraft', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([item['index'] for item in response.data['results'] if 'errors' in item], [1, 2])
+        self.assertTrue(Aircraft.objects.filter(esn_normalized='BULK1').exists())
+
+    def test_invalid_bulk_items_do_not_claim_their_esn(self):
+        items = [self.item('RETRY1', maci_number='R1', mass='heavy'), self.item('retry1', maci_number='R2')]
+        response = self.client.post('/api/v1/aircraft', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item['index'] for item in response.data['results'] if 'errors' in item], [0])
+        self.assertEqual(Aircraft.objects.get(esn_normalized='RETRY1').maci_number, 'R2')
+
+
+class AircraftRegistrationMarkTests(TestCase):
+    """ Aircraft are found by registration mark whatever the case, spacing and dashes """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Marks Ltd')
+        cls.manufacturer = create_manufacturer()
+
+    def create(self, mark, status=1):
+        return create_aircraft(self.operator, self.manufacturer, esn='', registration_mark=mark, status=status)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_normalize_registration_mark(self):
+        for mark in ('G-DRON', 'g-dron', ' G DRON ', 'gdron', 'G--DR-ON'):
+            self.assertEqual(normalize_registration_mark(mark), 'GDRON')
+        for blank in (None, '', ' - '):
+            self.assertIsNone(normalize_registration_mark(blank))
+
+    def test_lookup(self):
+        aircraft = self.create('G-DRON')
+        self.create('G-OTHR')
+        for mark in ('G-DRON', 'g-dron', 'G%20DRON', 'gdron'):
+            response = self.client.get('/api/v1/aircraft/registration/%s' % mark)
+            self.assertEqual(response.status_code, 200, mark)
+            self.assertEqual(response.data['id'], str(aircraft.id))
+            self.assertEqual(response.data['registration_mark'], 'G-DRON')
+        self.assertEqual(self.client.get('/api/v1/aircraft/registration/G-NONE').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/aircraft/registration/-').status_code, 404)
+
+    def test_changed_mark_is_reindexed(self):
+        aircraft = self.create('G-OLD1')
+        aircraft.registration_mark = 'G-NEW1'
+        aircraft.save()
+        self.assertEqual(self.client.get('/api/v1/aircraft/registration/G-OLD1').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/aircraft/registration/gnew1').data['id'], str(aircraft.id))
+
+    def test_reissued_mark_returns_the_active_aircraft(self):
+        self.create('G-REUS', status=0)
+        active = self.create('G-REUS')
+        self.create('G-REUS', status=0)
+        self.assertEqual(self.client.get('/api/v1/aircraft/registration/G-REUS').data['id'], str(active.id))
+
+    def test_fixture_loads_are_normalized(self):
+        aircraft = self.create('G-ABCD')
+        load_fixture([aircraft])
+        self.assertEqual(Aircraft.objects.get(pk=aircraft.pk).registration_mark_normalized, 'GABCD')
+        self.assertEqual(self.client.get('/api/v1/aircraft/registration/G-ABCD').data['id'], str(aircraft.id))
+
+    def test_lookup_uses_the_index(self):
+        plan = Aircraft.objects.filter(registration_mark_normalized='GDRON').explain()
+        self.assertIn('registration_mark_normalized', plan)
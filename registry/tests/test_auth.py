@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.test import TestCase, override_settings
+from jwt.algorithms import RSAAlgorithm
+from rest_framework.test import APIClient
+
+from registry import auth
+
+URL = '/api/v1/rid-modules/cache-stats'
+
+
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+
+
+def jwks_document(*keys):
+    document = {'keys': []}
+    for kid, private_key in keys:
+        jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update({'kid': kid, 'alg': 'RS256', 'use': 'sig'})
+        document['keys'].append(jwk)
+    return document
+
+
+def signed_token(private_key, kid, **claims):
+    claims.setdefault('aud', 'drone-registry')
+    claims.setdefault('exp', int(time.time()) + 600)
+    claims = {name: value for name, value in claims.items() if value is not None}
+    token = jwt.encode(claims, private_key, algorithm='RS256', headers={'kid': kid})
+    return token.decode('utf-8') if isinstance(token, bytes) else token
+
+
+class TokenVerificationTests(TestCase):
+    """ Bearer tokens are verified against the cached JWKS once, then served from the claims cache """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.key, cls.other_key = rsa_key(), rsa_key()
+
+    def setUp(self):
+        auth.jwks.clear()
+        auth.claims_cache.clear()
+        self.addCleanup(auth.jwks.clear)
+        self.addCleanup(auth.claims_cache.clear)
+        settings = override_settings(REGISTRY_JWT_JWKS=json.dumps(jwks_document(('key-1', self.key))),
+                                     REGISTRY_JWT_AUDIENCE='drone-registry')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+
+    def get(self, token):
+        return self.client.get(URL, HTTP_AUTHORIZATION='Bearer ' + token)
+
+    def test_valid_token(self):
+        self.assertEqual(self.get(signed_token(self.key, 'key-1')).status_code, 200)
+
+    def test_invalid_tokens_are_rejected(self):
+        for token in (signed_token(self.other_key, 'key-1'),
+                      signed_token(self.key, 'key-1', exp=int(time.time()) - 10),
+                      signed_token(self.key, 'key-1', aud='someone-else'),
+                      signed_token(self.key, 'key-9'),
+                      jwt.encode({'scope': 'read:privileged'}, 'test-secret', algorithm='HS256').decode('utf-8')):
+            response = self.get(token)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.data['message'], 'Invalid token')
+
+    def test_one_decode_per_request_and_claims_cached(self):
+        token = signed_token(self.key, 'key-1', scope='read:privileged')
+        with mock.patch('registry.auth.decode_token', wraps=auth.decode_token) as decode, \
+                mock.patch('registry.auth.jwt.decode', wraps=jwt.decode) as verify:
+            self.get(token)
+            self.assertEqual(decode.call_count, 1)
+            self.get(token)
+            self.assertEqual(verify.call_count, 1)
+
+    def test_claims_are_not_cached_past_exp(self):
+        for exp, expected in ((int(time.time()) + 30, 30), (None, 300)):
+            token = signed_token(self.key, 'key-1', exp=exp)
+            auth.decode_token(token)
+            expires, _ = auth.claims_cache.entries[hashlib.sha256(token.encode('utf-8')).hexdigest()]
+            self.assertAlmostEqual(expires - time.monotonic(), expected, delta=2)
+
+    def test_unknown_key_id_reloads_the_key_set(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as handle:
+            json.dump(jwks_document(('key-1', self.key)), handle)
+        self.addCleanup(os.unlink, handle.name)
+        with override_settings(REGISTRY_JWT_JWKS='', REGISTRY_JWT_JWKS_FILE=handle.name,
+                               REGISTRY_JWT_JWKS_REFRESH_INTERVAL=0):
+            self.assertEqual(self.get(signed_token(self.key, 'key-1')).status_code, 200)
+            self.assertEqual(self.get(signed_token(self.other_key, 'key-2')).status_code, 401)
+            with open(handle.name, 'w') as out:
+                json.dump(jwks_document(('key-1', self.key), ('key-2', self.other_key)), out)
+            self.assertEqual(self.get(signed_token(self.other_key, 'key-2')).status_code, 200)
+
+    def test_invalid_keys_are_skipped(self):
+        document = jwks_document(('key-1', self.key))
+        document['keys'].insert(0, {'kid': 'broken', 'kty': 'RSA', 'alg': 'RS256', 'n': 'AQAB'})
+        with override_settings(REGISTRY_JWT_JWKS=json.dumps(document)), self.assertLogs('registry.auth', 'WARNING'):
+            self.assertEqual(self.get(signed_token(self.key, 'key-1')).status_code, 200)
+        self.assertEqual(list(auth.jwks.keys), ['key-1'])
+
+    def test_reloads_are_rate_limited(self):
+        with override_settings(REGISTRY_JWT_JWKS_REFRESH_INTERVAL=60), \
+                mock.patch.object(auth.jwks, 'fetch', wraps=auth.jwks.fetch) as fetch:
+            for _ in range(3):
+                self.get(signed_token(self.other_key, 'key-%d' % _))
+            self.assertEqual(fetch.call_count, 1)
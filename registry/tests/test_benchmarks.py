@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+
+from registry.models import Aircraft, Operator
+from registry.synthetic import RegistryGenerator
+
+
+class SyntheticRegistryTests(TestCase):
+    """ The generator is reproducible and the endpoint benchmark covers the URL configuration """
+
+    def generate(self, seed):
+        with transaction.atomic():
+            RegistryGenerator(seed=seed).generate(operators=5, aircraft_per_operator=3)
+            rows = sorted(Aircraft.objects.values_list('id', 'esn', 'operator_id'))
+            transaction.set_rollback(True)
+        return rows
+
+    def test_same_seed_same_registry(self):
+        first = self.generate(7)
+        self.assertTrue(first)
+        self.assertEqual(self.generate(7), first)
+        self.assertNotEqual(self.generate(8), first)
+
+    def test_generate_command(self):
+        out = StringIO()
+        call_command('generate_registry', operators=12, batch_size=5, seed=3, stdout=out)
+        self.assertEqual(Operator.objects.count(), 12)
+        self.assertIn('Generated', out.getvalue())
+
+    def test_benchmark_covers_endpoints(self):
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as handle:
+            pass
+        self.addCleanup(os.unlink, handle.name)
+        out = StringIO()
+        call_command('benchmark_endpoints', operators=5, requests=2, warmup=0, json_path=handle.name, stdout=out)
+        with open(handle.name) as results:
+            endpoints = {result['endpoint']: result for result in json.load(results)}
+        for endpoint in ('/api/v1/operators', '/api/v1/aircraft/<uuid:pk>', '/api/v1/rid-modules/resolve',
+                         '/api/v1/export/aircraft'):
+            self.assertIn(endpoint, endpoints)
+            self.assertEqual(endpoints[endpoint]['status'], [200])
+            self.assertIn('p99_ms', endpoints[endpoint])
+        # Generated in a rolled-back transaction.
+        self.assertFalse(Operator.objects.exists())
+
+    def test_logging_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_logging', threads=2, records=20, sink_latency=0, stdout=out)
+        for method in ('print', 'sync', 'queued'):
+            self.assertIn(method, out.getvalue())
@@ -0,0 +1,81 @@
+import uuid
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from registry.models import Aircraft
+from registry.tests.helpers import create_address, create_manufacturer, create_operator, privileged_token
+
+
+class BulkAircraftRegistrationTests(TestCase):
+    """ POSTing a list to /aircraft registers every valid item in one transaction """
+
+    url = '/api/v1/aircraft'
+
+    @classmethod
+    def setUpTestData(cls):
+        address = create_address()
+        cls.operators = [create_operator('Fleet %d' % i, address) for i in range(2)]
+        cls.manufacturer = create_manufacturer()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def item(self, i, **overrides):
+        item = {'operator': str(self.operators[i % 2].id), 'manufacturer': str(self.manufacturer.id), 'mass': 5,
+                'model': 'Fleet Model %d' % i, 'maci_number': 'MACI%d' % i, 'esn': 'ESN%04d' % i}
+        item.update(overrides)
+        return item
+
+    def test_batch_uses_constant_queries(self):
+        items = [self.item(i) for i in range(40)]
+        items[3]['type_certificate'] = {'type_certificate_id': 'TC1', 'type_certificate_issuing_country': 'GB',
+                                        'type_certificate_holder': 'Holder', 'type_certificate_holder_country': 'GB'}
+        # Operators, manufacturers, registered ESNs, savepoint, type certificates, aircraft, search entries,
+        # operator summaries (both operators gain 20), release (40 rows fit one SQLite INSERT).
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 40)
+        self.assertEqual(Aircraft.objects.count(), 40)
+        created = Aircraft.objects.get(pk=response.data['results'][3]['id'])
+        self.assertEqual(created.type_certificate.type_certificate_id, 'TC1')
+        self.assertEqual(created.model, 'Fleet Model 3')
+
+    def test_invalid_items_are_reported_and_valid_ones_created(self):
+        items = [self.item(0), self.item(1, operator=str(uuid.uuid4())), self.item(2, mass='heavy'),
+                 self.item(3, registration_mark='G-' + 'X' * 20), self.item(4)]
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 3))
+        results = response.data['results']
+        self.assertEqual([result['index'] for result in results], [0, 1, 2, 3, 4])
+        self.assertIn('id', results[0])
+        self.assertIn('operator', results[1]['errors'])
+        self.assertIn('mass', results[2]['errors'])
+        self.assertIn('registration_mark', results[3]['errors'])
+        self.assertEqual(Aircraft.objects.count(), 2)
+
+    def test_missing_manufacturer_uses_default(self):
+        item = self.item(0)
+        del item['manufacturer']
+        response = self.client.post(self.url, [item], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Aircraft.objects.get().manufacturer, self.manufacturer)
+
+    def test_all_invalid_is_400(self):
+        response = self.client.post(self.url, [self.item(0, mass=None)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertFalse(Aircraft.objects.exists())
+
+    @override_settings(REGISTRY_BULK_MAX_ITEMS=3)
+    def test_batch_size_is_capped(self):
+        response = self.client.post(self.url, [self.item(i) for i in range(4)], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_single_create_still_works(self):
+        response = self.client.post(self.url, self.item(0), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['operator'], self.operators[0].id)
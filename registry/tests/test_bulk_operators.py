@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry.models import Address, Operator
+from registry.serializers import normalize_operator_data
+from registry.tests.helpers import privileged_token
+
+
+def operator_record(i, **overrides):
+    record = {'company_name': 'Import %d' % i, 'website': 'import%d.example' % i, 'email': 'ops%d@import.example' % i,
+              'phone_number': '+44 1234-567%03d' % i, 'operator_type': 'luc',
+              'address': {'line_1': '%d Import Road' % i, 'city': 'Testville', 'country': 'United Kingdom'}}
+    record.update(overrides)
+    return record
+
+
+class BulkOperatorImportTests(TestCase):
+    """ Operators with nested addresses are normalized, validated and bulk-inserted """
+
+    url = '/api/v1/operators'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def test_normalization(self):
+        data = normalize_operator_data(operator_record(1))
+        self.assertEqual(data['operator_type'], 1)
+        self.assertEqual(data['website'], 'https://import1.example')
+        self.assertEqual(data['phone_number'], '+441234567001')
+        self.assertEqual(data['address'], {'address_line_1': '1 Import Road', 'address_line_2': '-',
+                                           'address_line_3': '-', 'postcode': '0', 'city': 'Testville',
+                                           'country': 'GB'})
+
+    def test_batch_inserts_addresses_then_operators(self):
+        records = [operator_record(i) for i in range(30)]
+        # Savepoint, addresses, operators, search entries, operator summaries, release.
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, records, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 30)
+        operator = Operator.objects.select_related('address').get(pk=response.data['results'][7]['id'])
+        self.assertEqual(operator.company_name, 'Import 7')
+        self.assertEqual(operator.address.address_line_1, '7 Import Road')
+        self.assertEqual(operator.address.country, 'GB')
+
+    def test_invalid_records_are_skipped(self):
+        records = [operator_record(0), operator_record(1, email='not-an-email'), operator_record(2, address=None)]
+        response = self.client.post(self.url, records, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['index'] for result in response.data['results'] if 'errors' in result], [1, 2])
+        self.assertEqual(Operator.objects.count(), 1)
+        self.assertEqual(Address.objects.count(), 1)
+
+    def test_import_command(self):
+        records = [operator_record(i) for i in range(25)] + [operator_record(25, website='')]
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as handle:
+            handle.write('\n'.join(json.dumps(record) for record in records) + '\n')
+        self.addCleanup(os.unlink, handle.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_operators', handle.name, batch_size=10, stdout=out, stderr=err)
+        self.assertEqual(Operator.objects.count(), 25)
+        self.assertIn('Imported 25 operators (1 failed)', out.getvalue())
+        self.assertIn('rows/s', out.getvalue())
+        self.assertIn('record 25:', err.getvalue())
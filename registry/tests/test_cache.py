@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from registry.tests.helpers import create_manufacturer
+
+
+class ManufacturerCacheTests(TestCase):
+    """ The manufacturer list is served from the cache until a manufacturer changes """
+
+    url = '/api/v1/manufacturers'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manufacturer = create_manufacturer(full_name='Cached Manufacturer', common_name='Cached')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_second_request_skips_the_database(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    @override_settings(REGISTRY_PROCESS_CACHE_TIMEOUT=0)
+    def test_per_process_backend_keeps_entries_briefly(self):
+        # Other workers never see this worker's version bumps, the entries have to age out quickly.
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertTrue(queries)
+
+    def test_conditional_hit_is_304_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_save_invalidates(self):
+        self.client.get(self.url)
+        self.manufacturer.common_name = 'Renamed'
+        self.manufacturer.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['common_name'], 'Renamed')
+
+    def test_create_and_delete_invalidate(self):
+        self.client.get(self.url)
+        extra = create_manufacturer(full_name='Second Manufacturer', common_name='Second')
+        self.assertEqual(len(self.client.get(self.url).data['results']), 2)
+        extra.delete()
+        self.assertEqual(len(self.client.get(self.url).data['results']), 1)
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'fields': 'id'})
+        self.assertEqual(set(response.data['results'][0]), {'id'})
@@ -0,0 +1,130 @@
+import datetime
+import uuid
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from registry.models import Aircraft, Contact, Operator, Person, Pilot, RIDModule, Tombstone
+from registry.tests.helpers import create_address, create_aircraft, create_manufacturer, create_operator
+
+
+@override_settings(REGISTRY_PAGE_SIZE=2)
+class ChangeFeedTests(TestCase):
+    """ ?updated_since= change feeds: changed rows in (updated_at, id) order merged with tombstones """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.address = create_address()
+        cls.operator = create_operator('Mirror Ltd', cls.address)
+        cls.manufacturer = create_manufacturer()
+        cls.person = Person.objects.create(first_name='Ada', last_name='Sync', email='ada@example.com')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.since = timezone.now()
+
+    def aircraft(self, count):
+        return [create_aircraft(self.operator, self.manufacturer, model='Model %d' % i, maci_number='MACI%d' % i,
+                                esn='')
+                for i in range(count)]
+
+    def feed(self, url, since=None):
+        entries, url = [], '%s?updated_since=%s' % (url, (since or self.since).isoformat().replace('+', '%2B'))
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            entries.extend(response.data['results'])
+            self.assertIsNone(response.data['previous'])
+            watermark, url = response.data['watermark'], response.data['next']
+        return entries, watermark
+
+    def test_changes_and_deletes_in_key_order(self):
+        first, second, third = self.aircraft(3)
+        deleted_id = second.id
+        second.delete()
+        first.model = 'Renamed'
+        first.save()
+
+        entries, watermark = self.feed('/api/v1/aircraft')
+        self.assertEqual([(entry['id'], entry.get('deleted', False)) for entry in entries],
+                         [(str(third.id), False), (str(deleted_id), True), (str(first.id), False)])
+        self.assertEqual(entries[1]['reason'], 'deleted')
+        self.assertEqual(entries[2]['model'], 'Renamed')
+        self.assertEqual(watermark, Aircraft.objects.get(pk=first.pk).updated_at.isoformat())
+
+        # Resuming from the watermark only repeats the boundary row.
+        entries, _ = self.feed('/api/v1/aircraft', Aircraft.objects.get(pk=first.pk).updated_at)
+        self.assertEqual([entry['id'] for entry in entries], [str(first.id)])
+
+    def test_rows_sharing_a_timestamp_are_paged_by_id(self):
+        aircraft = self.aircraft(5)
+        Aircraft.objects.update(updated_at=self.since)
+        Tombstone.objects.create(kind='aircraft', object_id=uuid.uuid4())
+        Tombstone.objects.update(deleted_at=self.since)
+        entries, _ = self.feed('/api/v1/aircraft')
+        expected = sorted([str(item.id) for item in aircraft] + [str(Tombstone.objects.get().object_id)])
+        self.assertEqual([entry['id'] for entry in entries], expected)
+
+    def test_unchanged_feed_keeps_the_watermark(self):
+        entries, watermark = self.feed('/api/v1/operators')
+        self.assertEqual(entries, [])
+        self.assertEqual(watermark, self.since.isoformat())
+
+    def test_cascaded_deletes_leave_tombstones(self):
+        operator = create_operator('Gone Ltd', self.address)
+        pilot = Pilot.objects.create(operator=operator, person=self.person, address=self.address)
+        contact = Contact.objects.create(operator=operator, person=self.person, address=self.address)
+        deleted = (('/api/v1/operators', operator.pk), ('/api/v1/pilots', pilot.pk), ('/api/v1/contacts', contact.pk))
+        operator.delete()
+        for url, pk in deleted:
+            entries, _ = self.feed(url)
+            self.assertEqual([(entry['id'], entry.get('deleted')) for entry in entries], [(str(pk), True)], url)
+
+    def test_decommissioned_modules_are_tombstones(self):
+        active = RIDModule.objects.create(rid_id=uuid.uuid4(), operator=self.operator, module_esn='SYNC000000000001')
+        retired = RIDModule.objects.create(rid_id=uuid.uuid4(), operator=self.operator, module_esn='SYNC000000000002')
+        retired.status = 'decommissioned'
+        retired.save()
+        entries, _ = self.feed('/api/v1/rid-modules')
+        self.assertEqual([(entry['id'], entry.get('reason')) for entry in entries],
+                         [(str(active.id), None), (str(retired.id), 'decommissioned')])
+
+    def test_changes_to_rendered_relations_resend_the_row(self):
+        pilot = Pilot.objects.create(operator=self.operator, person=self.person, address=self.address)
+        aircraft, = self.aircraft(1)
+        module = RIDModule.objects.create(rid_id=uuid.uuid4(), operator=self.operator, aircraft=aircraft,
+                                          module_esn='SYNC000000000003')
+        since = timezone.now()
+        self.person.last_name = 'Lovelace'
+        self.person.save()
+        aircraft.delete()
+        self.assertEqual([entry['id'] for entry in self.feed('/api/v1/pilots', since)[0]], [str(pilot.id)])
+        entries, _ = self.feed('/api/v1/rid-modules', since)
+        self.assertEqual([(entry['id'], entry['aircraft']) for entry in entries], [(str(module.id), None)])
+
+    def test_saves_that_change_nothing_rendered_leave_dependents(self):
+        pilot = Pilot.objects.create(operator=self.operator, person=self.person, address=self.address)
+        since = timezone.now()
+        operator = Operator.objects.get(pk=self.operator.pk)
+        operator.operator_type = 2
+        operator.save()
+        Person.objects.get(pk=self.person.pk).save()
+        self.assertEqual(self.feed('/api/v1/pilots', since)[0], [])
+        operator.company_name = 'Mirror Group'
+        operator.save()
+        self.assertEqual([entry['id'] for entry in self.feed('/api/v1/pilots', since)[0]], [str(pilot.id)])
+
+    def test_filters_and_sparse_fields_apply(self):
+        aircraft, = self.aircraft(1)
+        response = self.client.get('/api/v1/aircraft', {'updated_since': self.since.isoformat(), 'fields': 'id,model',
+                                                         'operator': str(uuid.uuid4())})
+        self.assertEqual(response.data['results'], [])
+        response = self.client.get('/api/v1/aircraft', {'updated_since': self.since.isoformat(), 'fields': 'id'})
+        self.assertEqual(response.data['results'], [{'id': str(aircraft.id)}])
+
+    def test_naive_and_invalid_timestamps(self):
+        self.aircraft(1)
+        naive = (self.since - datetime.timedelta(seconds=1)).replace(tzinfo=None).isoformat()
+        self.assertEqual(len(self.client.get('/api/v1/aircraft', {'updated_since': naive}).data['results']), 1)
+        self.assertEqual(self.client.get('/api/v1/aircraft', {'updated_since': 'yesterday'}).status_code, 400)
@@ -0,0 +1,90 @@
+import uuid
+
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from registry.models import RIDModule
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator
+
+
+class ConditionalGetTests(TestCase):
+    """ ETag / Last-Modified validators and 304 responses on read endpoints """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Cache Ltd')
+        cls.manufacturer = create_manufacturer()
+        cls.aircraft = create_aircraft(cls.operator, cls.manufacturer, esn='ESN0')
+        cls.module = RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator, aircraft=cls.aircraft,
+                                              module_esn='MODULE0')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_detail_if_none_match_is_304_without_serializing(self):
+        url = '/api/v1/operators/%s' % self.operator.id
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(cached.content, b'')
+
+    def test_detail_if_modified_since(self):
+        url = '/api/v1/aircraft/%s' % self.aircraft.id
+        response = self.client.get(url)
+        self.assertEqual(response['Last-Modified'], http_date(self.aircraft.updated_at.timestamp()))
+        cached = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_update_changes_detail_etag(self):
+        url = '/api/v1/operators/%s' % self.operator.id
+        etag = self.client.get(url)['ETag']
+        self.operator.company_name = 'Cache Ltd 2'
+        self.operator.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_nested_update_changes_rid_module_etag(self):
+        url = '/api/v1/rid-modules/%s' % self.module.id
+        etag = self.client.get(url)['ETag']
+        self.aircraft.model = 'Carrier Mk2'
+        self.aircraft.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_esn_detail_is_conditional(self):
+        url = '/api/v1/aircraft/esn/%s' % self.aircraft.esn
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_list_etag_tracks_page_rows(self):
+        url = '/api/v1/aircraft'
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.aircraft.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_list_validators_come_from_the_page(self):
+        url = '/api/v1/rid-modules'
+        response = self.client.get(url, {'fields': 'rid_id,operator'})
+        latest = max(self.module.updated_at, self.operator.updated_at)
+        self.assertEqual(response['Last-Modified'], http_date(latest.timestamp()))
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, {'fields': 'rid_id,operator'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.operator.company_name = 'Cache Ltd 3'
+        self.operator.save()
+        changed = self.client.get(url, {'fields': 'rid_id,operator'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+
+    def test_etag_differs_per_query_string(self):
+        url = '/api/v1/rid-modules'
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, {'fields': 'rid_id'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,67 @@
+import csv
+import json
+import uuid
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from registry.models import RIDModule
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator, privileged_token
+
+
+@override_settings(REGISTRY_EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    """ Streaming NDJSON/CSV exports """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Export, Ltd')
+        cls.aircraft = create_aircraft(cls.operator, create_manufacturer(), model='Exporter', maci_number='MACI1')
+        for i in range(5):
+            RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator,
+                                     aircraft=cls.aircraft if i % 2 else None, module_esn='EXPORT%02d' % i)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_is_default(self):
+        response = self.client.get('/api/v1/export/rid-modules')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        lines = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[1]['aircraft']['model'], 'Exporter')
+        self.assertIsNone(lines[0]['aircraft'])
+
+    def test_csv_flattens_nested_objects(self):
+        response = self.client.get('/api/v1/export/rid-modules', {'format': 'csv'})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(StringIO(self.body(response))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['operator.company_name'], 'Export, Ltd')
+        self.assertEqual(rows[0]['aircraft.model'], '')
+
+    def test_format_suffix(self):
+        response = self.client.get('/api/v1/export/operators.csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="operators.csv"')
+        self.assertEqual(self.body(response).splitlines()[0], 'id,company_name,website,email,phone_number')
+
+    def test_first_row_is_flushed_on_its_own(self):
+        response = self.client.get('/api/v1/export/rid-modules')
+        chunks = list(response.streaming_content)
+        self.assertEqual(chunks[0].count(b'\n'), 1)
+
+    def test_fields(self):
+        response = self.client.get('/api/v1/export/aircraft', {'fields': 'id,model'})
+        self.assertEqual(json.loads(self.body(response).splitlines()[0]), {'id': str(self.aircraft.id), 'model': 'Exporter'})
+
+    def test_requires_auth(self):
+        self.client.credentials()
+        response = self.client.get('/api/v1/export/aircraft')
+        self.assertEqual(response.status_code, 401)
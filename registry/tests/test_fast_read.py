@@ -0,0 +1,62 @@
+import uuid
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from registry.models import Aircraft, Manufacturer, Operator, RIDModule, TypeCertificate
+from registry.serializers import AircraftSerializer, ManufacturerSerializer, OperatorSerializer, RIDModuleSerializer
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator
+
+
+class FastReadSerializerTests(TestCase):
+    """ The compiled values() reader renders byte-identical JSON to the ModelSerializers """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Fast Ltd', phone_number='')
+        manufacturer = create_manufacturer(full_name='Fast Manufacturer', common_name='Fast', acronym='FM')
+        certificate = TypeCertificate.objects.create(type_certificate_id='TC1', type_certificate_issuing_country='GB',
+                                                     type_certificate_holder='Holder',
+                                                     type_certificate_holder_country='GB')
+        with_certificate = create_aircraft(cls.operator, manufacturer, model='Swift', maci_number='MACI1',
+                                           registration_mark='G-FAST', type_certificate=certificate,
+                                           max_certified_takeoff_weight=Decimal('1.385'))
+        create_aircraft(cls.operator, manufacturer, mass=2, model='Bare', maci_number='MACI2', popular_name=None)
+        RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator, aircraft=with_certificate,
+                                 module_esn='FAST0001', notes='Installed')
+        RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator, aircraft=None, module_esn='FAST0002')
+
+    def assertIdentical(self, serializer_class, queryset, fields=None):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True, fields=fields).data)
+        reader = serializer_class.fast_reader(fields)
+        actual = JSONRenderer().render(reader.render(reader.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_operator(self):
+        self.assertIdentical(OperatorSerializer, Operator.objects.order_by('id'))
+
+    def test_aircraft(self):
+        self.assertIdentical(AircraftSerializer, Aircraft.objects.order_by('id'))
+
+    def test_manufacturer(self):
+        self.assertIdentical(ManufacturerSerializer, Manufacturer.objects.order_by('id'))
+
+    def test_rid_module(self):
+        self.assertIdentical(RIDModuleSerializer, RIDModule.objects.order_by('id'))
+
+    def test_sparse_fields(self):
+        self.assertIdentical(AircraftSerializer, Aircraft.objects.order_by('id'), fields=['id', 'type_certificate', 'status'])
+
+    def test_non_utc_timezone(self):
+        with timezone.override('Asia/Dubai'):
+            self.assertIdentical(RIDModuleSerializer, RIDModule.objects.order_by('id'))
+
+    def test_list_endpoint_matches_slow_path(self):
+        client = APIClient()
+        fast = client.get('/api/v1/rid-modules')
+        with override_settings(REGISTRY_FAST_SERIALIZATION=False):
+            slow = client.get('/api/v1/rid-modules')
+        self.assertEqual(fast.content, slow.content)
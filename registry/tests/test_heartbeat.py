@@ -0,0 +1,133 @@
+import datetime
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from registry.cache import rid_cache
+from registry.heartbeat import HeartbeatBuffer
+from registry.models import RIDModule
+from registry.tests.helpers import create_operator, privileged_token
+
+
+class HeartbeatTests(TestCase):
+    """ Sightings are coalesced per module and written with one UPDATE per batch """
+
+    url = '/api/v1/rid-modules/heartbeat'
+
+    @classmethod
+    def setUpTestData(cls):
+        operator = create_operator('Seen Ltd')
+        cls.modules = [RIDModule.objects.create(rid_id=uuid.uuid4(), operator=operator, module_esn='SEEN%04d' % i)
+                       for i in range(30)]
+
+    def setUp(self):
+        cache.clear()
+        rid_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        self.now = timezone.now().replace(microsecond=0)
+
+    def seen(self, module):
+        return RIDModule.objects.values_list('last_seen_at', flat=True).get(pk=module.pk)
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=60)
+    def test_sightings_are_coalesced_until_flush(self):
+        buffer = HeartbeatBuffer()
+        module = self.modules[0]
+        earlier, later = self.now - datetime.timedelta(minutes=5), self.now - datetime.timedelta(minutes=1)
+        buffer.add([('rid', str(module.rid_id), later), ('rid', str(module.rid_id), earlier)])
+        buffer.add([('esn', module.module_esn, earlier)])
+        self.assertIsNone(self.seen(module))
+        self.assertEqual(len(buffer.pending), 2)
+        buffer.stop()
+        self.assertEqual(self.seen(module), later)
+        self.assertEqual(buffer.pending, {})
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=60, REGISTRY_HEARTBEAT_BATCH_SIZE=250)
+    def test_flush_is_one_select_and_one_update(self):
+        buffer = HeartbeatBuffer()
+        buffer.add([('esn', module.module_esn, self.now) for module in self.modules])
+        with self.assertNumQueries(2):
+            self.assertEqual(buffer.flush(), 30)
+        buffer.stop()
+        self.assertEqual(RIDModule.objects.filter(last_seen_at=self.now).count(), 30)
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=0.01)
+    def test_failed_flush_keeps_the_sightings(self):
+        buffer = HeartbeatBuffer()
+        module = self.modules[4]
+        earlier, later = self.now - datetime.timedelta(minutes=5), self.now - datetime.timedelta(minutes=1)
+        with mock.patch.object(buffer, 'write', side_effect=DatabaseError('gone')):
+            with self.assertLogs('registry.heartbeat', 'ERROR'):
+                buffer.add([('esn', module.module_esn, earlier)])
+                buffer.thread.join(0.1)
+            self.assertTrue(buffer.thread.is_alive())
+            buffer.wakeup.set()
+            buffer.thread.join()
+            buffer.merge([('esn', module.module_esn, later)])
+            buffer.merge([('rid', str(module.rid_id), earlier)])
+            with self.assertRaises(DatabaseError):
+                buffer.flush()
+        self.assertEqual(buffer.pending, {('esn', module.module_esn): later, ('rid', str(module.rid_id)): earlier})
+        buffer.flush()
+        self.assertEqual(self.seen(module), later)
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=0)
+    def test_endpoint_updates_last_seen_only(self):
+        module = self.modules[1]
+        before = RIDModule.objects.get(pk=module.pk).updated_at
+        seen_at = self.now - datetime.timedelta(seconds=30)
+        response = self.client.post(self.url, {'sightings': [
+            {'rid_id': str(module.rid_id), 'seen_at': seen_at.isoformat()},
+            {'module_esn': 'NOSUCHESN'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['accepted'], 2)
+        module = RIDModule.objects.get(pk=module.pk)
+        self.assertEqual(module.last_seen_at, seen_at)
+        self.assertEqual(module.updated_at, before)
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=0)
+    def test_module_esns_are_matched_as_stored(self):
+        module = self.modules[4]
+        response = self.client.post(self.url, {'sightings': [
+            {'module_esn': ' %s ' % module.module_esn.lower(), 'seen_at': self.now.isoformat()},
+            {'module_esn': '000'},
+        ]}, format='json')
+        self.assertEqual(response.data['accepted'], 1)
+        self.assertEqual(self.seen(module), self.now)
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=0)
+    def test_last_seen_never_moves_backwards(self):
+        module = self.modules[2]
+        self.client.post(self.url, {'sightings': [{'module_esn': module.module_esn, 'seen_at': self.now.isoformat()}]},
+                         format='json')
+        updated_at = RIDModule.objects.get(pk=module.pk).updated_at
+        for seen_at in (self.now, self.now - datetime.timedelta(hours=1)):
+            self.client.post(self.url, {'sightings': [{'module_esn': module.module_esn,
+                                                       'seen_at': seen_at.isoformat()}]}, format='json')
+        self.assertEqual(self.seen(module), self.now)
+        self.assertEqual(RIDModule.objects.get(pk=module.pk).updated_at, updated_at)
+
+    @override_settings(REGISTRY_HEARTBEAT_FLUSH_INTERVAL=0)
+    def test_future_sightings_are_clamped_and_cache_is_kept(self):
+        module = self.modules[3]
+        self.client.get('/api/v1/rid-modules/by-rid/%s' % module.rid_id)
+        future = (timezone.now() + datetime.timedelta(days=1)).isoformat()
+        self.client.post(self.url, {'sightings': [{'rid_id': str(module.rid_id), 'seen_at': future}]}, format='json')
+        self.assertLessEqual(self.seen(module), timezone.now())
+        self.assertIsNotNone(rid_cache.get('rid', str(module.rid_id)))
+
+    def test_validation(self):
+        module = self.modules[0]
+        both = {'rid_id': str(module.rid_id), 'module_esn': module.module_esn}
+        self.assertEqual(self.client.post(self.url, {'sightings': [both]}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(self.url, {'sightings': []}, format='json').status_code, 400)
+        self.client.credentials()
+        self.assertEqual(self.client.post(self.url, {'sightings': [{'module_esn': 'X'}]}, format='json').status_code,
+                         401)
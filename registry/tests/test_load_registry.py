@@ -0,0 +1,104 @@
+import csv
+import json
+import os
+import tempfile
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from registry.models import Aircraft
+from registry.tests.helpers import create_manufacturer, create_operator
+
+
+def fixture(label, pk, **fields):
+    fields.setdefault('created_at', '2020-01-01T00:00:00+00:00')
+    fields.setdefault('updated_at', '2020-01-01T00:00:00+00:00')
+    return {'model': 'registry.' + label, 'pk': str(pk), 'fields': fields}
+
+
+class LoadRegistryTests(TestCase):
+    """ load_registry streams fixtures and CSV rows into the tables with in-memory foreign key checks """
+
+    def write(self, suffix, content):
+        with tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, newline='') as handle:
+            handle.write(content)
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
+
+    def load(self, *args, **options):
+        out, err = StringIO(), StringIO()
+        call_command('load_registry', *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def index_count(self, table=None):
+        with connection.cursor() as cursor:
+            if table is None:
+                cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'index'")
+            else:
+                cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = %s "
+                               "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%%'", [table])
+            return cursor.fetchone()[0]
+
+    def test_ndjson_fixtures(self):
+        address, operator, manufacturer = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        aircraft = [uuid.uuid4() for _ in range(3)]
+        records = [
+            fixture('address', address, address_line_1='1 Load Lane', address_line_2='', address_line_3='',
+                    postcode='0', city='Testville', country='GB'),
+            fixture('operator', operator, company_name='Loader Ltd', website='', email='', phone_number='',
+                    operator_type=0, address=str(address), country='GB'),
+            fixture('manufacturer', manufacturer, full_name='Loader Aero', common_name='Loader', country='GB'),
+            fixture('aircraft', aircraft[0], operator=str(operator), manufacturer=str(manufacturer), mass=0,
+                    model='L1', maci_number='G-LOAD', esn='ESN1', status=1),
+            fixture('aircraft', aircraft[1], operator=str(operator), manufacturer=str(manufacturer), mass=0,
+                    model='L2', maci_number='G-LODE', esn='ESN2', status=1),
+            fixture('aircraft', aircraft[2], operator=str(uuid.uuid4()), manufacturer=str(manufacturer), mass=0,
+                    model='L3', maci_number='G-LOST', esn='ESN3', status=1),
+            fixture('aircraft', aircraft[0], operator=str(operator), manufacturer=str(manufacturer), mass=0,
+                    model='L1', maci_number='G-LOAD', esn='ESN1', status=1),
+        ]
+        path = self.write('.jsonl', '\n'.join(json.dumps(record) for record in records) + '\n')
+        indexes = self.index_count()
+        out, err = self.load(path, batch_size=1)
+
+        self.assertEqual(self.index_count(), indexes)
+        self.assertEqual(Aircraft.objects.count(), 2)
+        loaded = Aircraft.objects.select_related('operator__address').get(pk=aircraft[1])
+        self.assertEqual(loaded.operator.address.city, 'Testville')
+        self.assertEqual(loaded.created_at.year, 2020)
+        self.assertIn('Loaded 5 rows', out)
+        self.assertIn('record 6 (registry.aircraft): operator', err)
+        self.assertIn('record 7 (registry.aircraft): %s already exists' % aircraft[0], err)
+
+    def test_csv_with_defaults(self):
+        operator = create_operator('Fleet')
+        manufacturer = create_manufacturer()
+        content = StringIO()
+        writer = csv.writer(content)
+        writer.writerow(['operator', 'manufacturer_id', 'mass', 'model', 'maci_number', 'esn'])
+        for i in range(3):
+            writer.writerow([operator.pk, manufacturer.pk, 5, 'CSV %d' % i, 'MACI%d' % i, 'CSVESN%d' % i])
+        writer.writerow([operator.pk, manufacturer.pk, 5, 'CSV copy', 'MACI9', ' csvesn1 '])
+        path = self.write('.csv', content.getvalue())
+        out, err = self.load(path, model='registry.aircraft', keep_indexes=True)
+
+        self.assertEqual(Aircraft.objects.filter(operator=operator).count(), 3)
+        self.assertIn('esn_normalized CSVESN1 already exists', err)
+        aircraft = Aircraft.objects.get(esn='CSVESN1')
+        self.assertEqual(aircraft.esn_normalized, 'CSVESN1')
+        self.assertEqual(aircraft.mass, 5)
+        self.assertIsNotNone(aircraft.created_at)
+
+    def test_only_tables_in_the_input_lose_their_indexes(self):
+        operator = create_operator('Indexed')
+        manufacturer = create_manufacturer()
+        path = self.write('.csv', 'operator,manufacturer,mass,model,maci_number\n%s,%s,5,Indexed,MACI1\n' % (
+            operator.pk, manufacturer.pk))
+        indexes = self.index_count()
+        out, err = self.load(path, model='registry.aircraft')
+
+        self.assertIn('Rebuilding %d indexes' % self.index_count(Aircraft._meta.db_table), out)
+        self.assertEqual(self.index_count(), indexes)
@@ -0,0 +1,105 @@
+import io
+import json
+import logging
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry.logs import AsyncJSONHandler, SamplingFilter, sanitize
+from registry.tests.helpers import privileged_token
+
+
+def make_logger(name, handler):
+    logger = logging.Logger(name)
+    logger.addHandler(handler)
+    return logger
+
+
+class AsyncJSONHandlerTests(TestCase):
+    """ Records are written as JSON lines by the listener thread, sanitized and never blocking the caller """
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = AsyncJSONHandler(stream=self.stream, max_length=20)
+        self.addCleanup(self.handler.stop)
+
+    def lines(self):
+        self.handler.flush()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_json_record_with_sanitized_payload(self):
+        logger = make_logger('registry.views', self.handler)
+        logger.info("Operator %s received", 'registration', extra={'payload': {
+            'email': 'someone@example.com', 'company_name': 'A' * 50, 'address': {'postcode': 'AB1 2CD', 'city': 'X'},
+            'tags': list(range(15))}})
+        [line] = self.lines()
+        self.assertEqual(line['level'], 'INFO')
+        self.assertEqual(line['logger'], 'registry.views')
+        self.assertEqual(line['message'], 'Operator registration received')
+        payload = line['payload']
+        self.assertEqual(payload['email'], '[redacted]')
+        self.assertEqual(payload['address'], {'postcode': '[redacted]', 'city': 'X'})
+        self.assertEqual(payload['company_name'], 'A' * 20 + '... [50 chars]')
+        self.assertEqual(payload['tags'][-1], '... 5 more')
+
+    def test_traceback_is_captured_on_the_calling_thread(self):
+        logger = make_logger('registry.views', self.handler)
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logger.exception("Exception in operator creation")
+        [line] = self.lines()
+        self.assertEqual(line['level'], 'ERROR')
+        self.assertIn('ValueError: boom', line['exception'])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = AsyncJSONHandler(stream=self.stream, queue_size=1)
+        handler.queue.put(None)
+        handler.enqueue(logging.makeLogRecord({'msg': 'dropped'}))
+        self.assertEqual(handler.dropped, 1)
+
+    def test_sampling_per_logger(self):
+        sampling = SamplingFilter({'registry': '0.5', 'registry.views': '0', 'registry.auth': '1'})
+        self.handler.addFilter(sampling)
+        for name in ('registry.views', 'registry.views.operators', 'registry.auth'):
+            make_logger(name, self.handler).info("sampled")
+        make_logger('registry.views', self.handler).warning("kept")
+        lines = self.lines()
+        self.assertEqual([(line['logger'], line['message']) for line in lines],
+                         [('registry.auth', 'sampled'), ('registry.views', 'kept')])
+        self.assertEqual(sampling.rate('registry.heartbeat'), 0.5)
+        self.assertEqual(sampling.rate('other'), 1.0)
+
+    def test_sanitize_query_dict(self):
+        from django.http import QueryDict
+        self.assertEqual(sanitize(QueryDict('email=a@b.c&city=X'), 10), {'email': '[redacted]', 'city': 'X'})
+
+    def test_sanitize_form_encoded_address(self):
+        address = json.dumps({'line_1': '1 Home Road', 'postcode': 'AB1 2CD', 'city': 'X'})
+        self.assertEqual(sanitize({'address': address, 'notes': '{not json'}, 20), {
+            'address': {'line_1': '[redacted]', 'postcode': '[redacted]', 'city': 'X'}, 'notes': '{not json'})
+
+
+class RegistrationLoggingTests(TestCase):
+    """ Rejected registrations are logged through the registry logger, without personal data """
+
+    def test_validation_failure_is_logged(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        with self.assertLogs('registry.views', level='INFO') as logs:
+            response = client.post('/api/v1/operators', {'company_name': 'Logged Ltd', 'email': 'x@example.com'},
+                                   format='json')
+        self.assertEqual(response.status_code, 400)
+        [record] = logs.records
+        self.assertEqual(record.getMessage(), 'Operator registration failed validation')
+        self.assertIn('errors', record.payload)
+
+    def test_received_registration_is_logged_normalized(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        address = json.dumps({'line_1': '1 Home Road', 'city': 'Testville', 'country': 'GB'})
+        with self.assertLogs('registry.views', level='DEBUG') as logs:
+            client.post('/api/v1/operators', {'company_name': 'Form Ltd', 'address': address})
+        [payload] = [record.payload for record in logs.records if record.getMessage() == 'Operator registration received']
+        self.assertEqual(payload['address']['address_line_1'], '1 Home Road')
+        self.assertEqual(sanitize(payload, 100)['address']['address_line_1'], '[redacted]')
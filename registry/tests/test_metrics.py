@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from registry.metrics import request_metrics
+from registry.tests.helpers import create_operator, privileged_token
+
+
+def sample(text, name, **labels):
+    """ Value of the sample whose labels include ``labels`` """
+    for line in text.splitlines():
+        match = re.match(r'^%s\{(.*)\} (\S+)$' % re.escape(name), line)
+        if match and all('%s="%s"' % item in match.group(1) for item in labels.items()):
+            return float(match.group(2))
+    return None
+
+
+class MetricsTests(TestCase):
+    """ The middleware records per-route metrics, exported in the Prometheus text format """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Metrics Ltd')
+
+    def setUp(self):
+        request_metrics.reset()
+        self.client = APIClient()
+
+    def scrape(self):
+        response = self.client.get('/api/v1/metrics', HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_are_recorded_per_route(self):
+        for _ in range(2):
+            self.client.get('/api/v1/operators')
+        self.client.get('/api/v1/operators/%s' % self.operator.pk)
+        self.client.get('/no/such/page')
+        text = self.scrape()
+
+        self.assertEqual(sample(text, 'registry_http_requests_total', route='api/v1/operators', status='200'), 2)
+        self.assertEqual(sample(text, 'registry_http_requests_total', route='api/v1/operators/<uuid:pk>'), 1)
+        self.assertEqual(sample(text, 'registry_http_requests_total', route='unmatched', status='404'), 1)
+        self.assertEqual(sample(text, 'registry_http_request_duration_seconds_bucket', route='api/v1/operators',
+                                le='+Inf'), 2)
+        self.assertEqual(sample(text, 'registry_http_request_duration_seconds_count', route='api/v1/operators'), 2)
+        self.assertGreaterEqual(sample(text, 'registry_db_queries_total', route='api/v1/operators'), 2)
+        self.assertGreater(sample(text, 'registry_http_response_size_bytes_total', route='api/v1/operators'), 0)
+
+    def test_streaming_responses_are_recorded_once_sent(self):
+        response = self.client.get('/api/v1/export/operators', HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        text = self.scrape()
+        self.assertEqual(sample(text, 'registry_http_response_size_bytes_total', route='api/v1/export/operators'),
+                         len(body))
+
+    def test_endpoint_requires_authentication(self):
+        self.assertEqual(self.client.get('/api/v1/metrics').status_code, 401)
+
+    def test_worker_snapshots_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(REGISTRY_METRICS_DIR=directory):
+            self.client.get('/api/v1/operators')
+            other = request_metrics.snapshot()
+            with open(os.path.join(directory, 'metrics-1.json'), 'w') as out:
+                json.dump(other, out)
+            text = self.scrape()
+            self.assertTrue(os.path.exists(os.path.join(directory, 'metrics-%d.json' % os.getpid())))
+        self.assertEqual(sample(text, 'registry_http_requests_total', route='api/v1/operators'), 2)
+
+    def test_snapshots_of_exited_workers_are_removed(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        with tempfile.TemporaryDirectory() as directory, override_settings(REGISTRY_METRICS_DIR=directory):
+            self.client.get('/api/v1/operators')
+            for name in ('metrics-%d.json' % exited.pid, 'metrics-%d.json.1.tmp' % exited.pid):
+                with open(os.path.join(directory, name), 'w') as out:
+                    json.dump(request_metrics.snapshot(), out)
+            text = self.scrape()
+            self.assertEqual(os.listdir(directory), ['metrics-%d.json' % os.getpid()])
+        self.assertEqual(sample(text, 'registry_http_requests_total', route='api/v1/operators'), 1)
@@ -0,0 +1,137 @@
+import uuid
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from registry.models import Aircraft, Contact, OperatorSummary, Person, Pilot, RIDModule
+from registry.synthetic import RegistryGenerator
+from registry.tests.helpers import (create_address, create_aircraft, create_manufacturer, create_operator,
+                                    privileged_token)
+
+FIELDS = ('aircraft_count', 'active_rid_module_count', 'pilot_count', 'contact_count')
+
+
+class OperatorSummaryTests(TestCase):
+    """ OperatorSummary counts follow saves and deletes, and ?include=summary adds them to operators """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.address = create_address()
+        cls.operators = [create_operator('Fleet %d' % i, cls.address) for i in range(2)]
+        cls.manufacturer = create_manufacturer()
+        cls.person = Person.objects.create(first_name='Ada', last_name='Count', email='ada@example.com')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def counts(self, operator):
+        return tuple(OperatorSummary.objects.filter(operator=operator).values_list(*FIELDS).get())
+
+    def aircraft(self, operator, esn):
+        return create_aircraft(operator, self.manufacturer, esn=esn)
+
+    def module(self, aircraft, esn, status='active'):
+        return RIDModule.objects.create(rid_id=uuid.uuid4(), operator=aircraft.operator, aircraft=aircraft,
+                                        module_esn=esn, status=status)
+
+    def test_counts_follow_saves_and_deletes(self):
+        first, second = self.operators
+        aircraft = self.aircraft(first, 'ESN1')
+        self.aircraft(first, 'ESN2')
+        active = self.module(aircraft, 'COUNT00000000001')
+        self.module(aircraft, 'COUNT00000000002', status='lost')
+        Pilot.objects.create(operator=first, person=self.person, address=self.address)
+        contact = Contact.objects.create(operator=first, person=self.person, address=self.address)
+        self.assertEqual(self.counts(first), (2, 1, 1, 1))
+        self.assertEqual(self.counts(second), (0, 0, 0, 0))
+
+        active.status = 'decommissioned'
+        active.save()
+        aircraft.operator = second
+        aircraft.save()
+        aircraft.save()
+        contact.delete()
+        self.assertEqual(self.counts(first), (1, 0, 1, 0))
+        self.assertEqual(self.counts(second), (1, 0, 0, 0))
+
+        second.delete()
+        self.assertFalse(OperatorSummary.objects.filter(operator_id=self.operators[1].pk).exists())
+
+    def test_saves_that_keep_the_operator_do_not_reread_the_row(self):
+        aircraft = Aircraft.objects.get(pk=self.aircraft(self.operators[0], 'ESN1').pk)
+        aircraft.model = 'Renamed'
+        with CaptureQueriesContext(connection) as captured:
+            aircraft.save()
+        self.assertFalse([query for query in captured.captured_queries
+                          if query['sql'].startswith('SELECT "registry_aircraft"')])
+        self.assertEqual(self.counts(self.operators[0]), (1, 0, 0, 0))
+
+    def test_summary_rolls_back_with_the_row(self):
+        # The savepoint stands in for the transaction the save opens on its own outside tests.
+        with mock.patch('registry.summaries.adjust', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.aircraft(self.operators[0], 'ESN1')
+        self.assertFalse(Aircraft.objects.exists())
+
+    def test_bulk_registration_is_counted(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        items = [{'operator': str(self.operators[i % 2].id), 'manufacturer': str(self.manufacturer.id), 'mass': 5,
+                  'model': 'Bulk', 'maci_number': 'MACI%d' % i, 'esn': 'BULK%d' % i} for i in range(5)]
+        self.assertEqual(self.client.post('/api/v1/aircraft', items, format='json').status_code, 201)
+        self.assertEqual([self.counts(operator)[0] for operator in self.operators], [3, 2])
+
+        records = [{'company_name': 'New %d' % i, 'website': 'new.example', 'email': 'ops@new.example',
+                    'operator_type': 2, 'address': {'address_line_1': '1 Way', 'city': 'Testville', 'country': 'GB'}}
+                   for i in range(2)]
+        response = self.client.post('/api/v1/operators', records, format='json')
+        self.assertEqual([self.counts(result['id']) for result in response.data['results']], [(0, 0, 0, 0)] * 2)
+
+    def test_include_summary(self):
+        self.aircraft(self.operators[0], 'ESN1')
+        expected = {str(operator.id): self.counts(operator)[0] for operator in self.operators}
+        for fast in (True, False):
+            for params in ({'include': 'summary'}, {'include': 'summary', 'fields': 'id'}):
+                with override_settings(REGISTRY_FAST_SERIALIZATION=fast):
+                    with CaptureQueriesContext(connection) as plain:
+                        self.client.get('/api/v1/operators', {'fields': params.get('fields', 'id,company_name')})
+                    with CaptureQueriesContext(connection) as included:
+                        response = self.client.get('/api/v1/operators', params)
+                self.assertEqual(len(included), len(plain), (fast, params))
+                self.assertEqual({item['id']: item['summary']['aircraft_count'] for item in response.data['results']},
+                                 expected)
+        response = self.client.get('/api/v1/operators/%s' % self.operators[0].id, {'include': 'summary'})
+        self.assertEqual(response.data['summary']['aircraft_count'], 1)
+        self.assertNotIn('summary', self.client.get('/api/v1/operators').data['results'][0])
+        self.assertEqual(self.client.get('/api/v1/operators', {'include': 'fleet'}).status_code, 400)
+
+    def test_include_missing_summary(self):
+        OperatorSummary.objects.filter(operator=self.operators[0]).delete()
+        url = '/api/v1/operators/%s' % self.operators[0].id
+        response = self.client.get(url, {'include': 'summary'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['summary'])
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, {'include': 'summary'}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        results = self.client.get('/api/v1/operators', {'include': 'summary'}).data['results']
+        self.assertIsNone({item['id']: item['summary'] for item in results}[str(self.operators[0].id)])
+
+    def test_etag_follows_the_summary(self):
+        url = '/api/v1/operators/%s?include=summary' % self.operators[0].id
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        OperatorSummary.objects.filter(operator=self.operators[0]).update(updated_at='2099-01-01T00:00:00Z')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_rebuild_matches_the_generator(self):
+        RegistryGenerator(seed=3).generate(operators=6, aircraft_per_operator=3)
+        generated = sorted(OperatorSummary.objects.values_list('operator', *FIELDS))
+        OperatorSummary.objects.update(aircraft_count=99)
+        out = StringIO()
+        call_command('rebuild_operator_summaries', stdout=out)
+        self.assertIn('Rebuilt 8 operator summaries', out.getvalue())
+        self.assertEqual(sorted(OperatorSummary.objects.values_list('operator', *FIELDS)), generated)
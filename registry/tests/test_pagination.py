@@ -0,0 +1,62 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from registry.models import Aircraft
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator
+
+
+@override_settings(REGISTRY_PAGE_SIZE=3, REGISTRY_MAX_PAGE_SIZE=5)
+class KeysetPaginationTests(TestCase):
+    """ Cursor pagination over the (created_at, id) key on list endpoints """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Paging Ltd')
+        cls.manufacturer = create_manufacturer()
+        cls.aircraft = [create_aircraft(cls.operator, cls.manufacturer, model='Model %d' % i, maci_number='MACI%d' % i)
+                        for i in range(8)]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def walk(self, url):
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_forward_walk_returns_every_row_once_in_key_order(self):
+        ids, pages = self.walk('/api/v1/aircraft')
+        expected = [str(pk) for pk in Aircraft.objects.order_by('created_at', 'id').values_list('id', flat=True)]
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, expected)
+
+    def test_first_page_has_no_previous_link(self):
+        response = self.client.get('/api/v1/aircraft')
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_previous_link_returns_to_first_page(self):
+        first = self.client.get('/api/v1/aircraft')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual([i['id'] for i in back.data['results']], [i['id'] for i in first.data['results']])
+        self.assertIsNone(back.data['previous'])
+
+    def test_limit_is_capped_by_max_page_size(self):
+        response = self.client.get('/api/v1/aircraft', {'limit': 50})
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/v1/aircraft', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_operator_aircraft_is_paginated(self):
+        ids, pages = self.walk('/api/v1/operators/%s/aircraft' % self.operator.id)
+        self.assertEqual(len(ids), 8)
+        self.assertEqual(pages, 3)
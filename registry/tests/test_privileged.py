@@ -0,0 +1,59 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry.models import Activity, Authorization, Contact, Person, Pilot, Test, TestValidity
+from registry.tests.helpers import create_address, create_operator, privileged_token
+
+
+class PrivilegedDetailQueryTests(TestCase):
+    """ Privileged detail endpoints run a fixed number of queries however many relations exist """
+
+    @classmethod
+    def setUpTestData(cls):
+        address = create_address(address_line_1='1 Enforcement Way', postcode='EN1 1AA', city='London')
+        cls.operator = create_operator('Privileged Ltd', address, website='https://privileged.example',
+                                       email='ops@privileged.example', phone_number='+441234567890', operator_type=1)
+        for i in range(4):
+            cls.operator.authorized_activities.add(Activity.objects.create(name='Activity %d' % i))
+            cls.operator.operational_authorizations.add(Authorization.objects.create(title='Authorization %d' % i))
+
+        person = Person.objects.create(first_name='Jane', last_name='Doe', email='jane@example.com',
+                                       phone_number='+441234567891')
+        cls.contact = Contact.objects.create(operator=cls.operator, person=person, address=address, role_type=1)
+        cls.pilot = Pilot.objects.create(operator=cls.operator, person=person, address=address, is_active=True)
+        for i in range(3):
+            TestValidity.objects.create(pilot=cls.pilot, test=Test.objects.create(name='Test %d' % i))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def test_operator_privileged_query_count(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/operators/%s/privilaged' % self.operator.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data['authorized_activities']), ['Activity %d' % i for i in range(4)])
+        self.assertEqual(sorted(response.data['operational_authorizations']),
+                         ['Authorization %d' % i for i in range(4)])
+        self.assertEqual(response.data['address']['city'], 'London')
+
+    def test_contact_privileged_query_count(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/contacts/%s/privilaged' % self.contact.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['company_name'], 'Privileged Ltd')
+        self.assertEqual(response.data['postcode'], 'EN1 1AA')
+        self.assertEqual(len(response.data['authorized_activities']), 4)
+        self.assertEqual(len(response.data['operational_authorizations']), 4)
+
+    def test_pilot_privileged_query_count(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/pilots/%s/privilaged' % self.pilot.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['first_name'], 'Jane')
+        self.assertEqual(sorted(response.data['tests']), ['Test 0', 'Test 1', 'Test 2'])
+
+    def test_privileged_requires_scope(self):
+        self.client.credentials()
+        response = self.client.get('/api/v1/operators/%s/privilaged' % self.operator.id)
+        self.assertEqual(response.status_code, 401)
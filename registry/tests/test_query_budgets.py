@@ -0,0 +1,120 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver
+from rest_framework.test import APIClient
+
+from registry.cache import rid_cache
+from registry.models import Aircraft, Contact, Operator, Pilot, RIDModule
+from registry.synthetic import RegistryGenerator
+from registry.tests.helpers import privileged_token
+
+# Most queries each GET endpoint may run against a cold cache, whatever the number of rows and relations.
+# Lists take their ETag from the rows of the page; new endpoints must be added here.
+QUERY_BUDGETS = {
+    '': 0,
+    'api/v1/': 0,
+    'api/v1/operators': 1,
+    'api/v1/operators/<uuid:pk>': 1,
+    'api/v1/operators/<uuid:pk>/privilaged': 3,
+    'api/v1/operators/<uuid:pk>/rpas': 4,
+    'api/v1/operators/<uuid:pk>/aircraft': 3,
+    'api/v1/aircraft': 1,
+    'api/v1/aircraft/<uuid:pk>': 1,
+    'api/v1/aircraft/esn/<esn>': 1,
+    'api/v1/aircraft/registration/<mark>': 1,
+    'api/v1/aircrafts': 1,
+    'api/v1/aircrafts/<uuid:pk>': 1,
+    'api/v1/aircrafts/esn/<esn>': 1,
+    'api/v1/aircrafts/registration/<mark>': 1,
+    'api/v1/contacts': 1,
+    'api/v1/contacts/<uuid:pk>': 1,
+    'api/v1/contacts/<uuid:pk>/privilaged': 3,
+    'api/v1/pilots': 1,
+    'api/v1/pilots/<uuid:pk>': 1,
+    'api/v1/pilots/<uuid:pk>/privilaged': 2,
+    'api/v1/manufacturers': 1,
+    'api/v1/rid-modules': 1,
+    'api/v1/rid-modules/<uuid:pk>': 1,
+    'api/v1/rid-modules/by-rid/<uuid:rid_id>': 1,
+    'api/v1/rid-modules/by-esn/<str:module_esn>': 1,
+    'api/v1/rid-modules/cache-stats': 0,
+    'api/v1/operators/<uuid:pk>/rid-modules': 1,
+    'api/v1/aircraft/<uuid:pk>/rid-modules': 1,
+    'api/v1/export/operators': 1,
+    'api/v1/export/aircraft': 1,
+    'api/v1/export/rid-modules': 1,
+    'api/v1/search': 2,
+    'api/v1/metrics': 0,
+}
+
+# Required query parameters; the search budget includes the one-off check for the SQLite FTS5 table
+QUERY_STRINGS = {'api/v1/search': '?q=a'}
+
+PK_MODELS = {'operators': Operator, 'aircraft': Aircraft, 'aircrafts': Aircraft, 'contacts': Contact,
+             'pilots': Pilot, 'rid-modules': RIDModule}
+
+
+def get_routes():
+    """ Routes of every GET endpoint in the URL configuration """
+    for pattern in get_resolver().url_patterns:
+        view_class = getattr(getattr(pattern, 'callback', None), 'view_class', None)
+        if not isinstance(pattern, URLPattern) or view_class is None or not hasattr(view_class, 'get'):
+            continue
+        if 'format' in pattern.pattern.converters or str(pattern.pattern).startswith('^'):
+            continue
+        yield str(pattern.pattern)
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every list, detail and privileged endpoint stays within its declared query budget on a registry with many
+    related rows, so an N+1 in a serializer fails here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        RegistryGenerator(seed=18).generate(operators=12, aircraft_per_operator=6, pilots_per_operator=3,
+                                            contacts_per_operator=3, rid_module_ratio=1)
+        # Details are checked on rows with relations to render.
+        cls.module = RIDModule.objects.filter(aircraft__type_certificate__isnull=False).select_related('aircraft').first()
+        cls.pk_values = {Operator: cls.module.operator_id, Aircraft: cls.module.aircraft_id, RIDModule: cls.module.pk,
+                         Pilot: Pilot.objects.filter(testvalidity__isnull=False).first().pk,
+                         Contact: Contact.objects.first().pk}
+
+    def setUp(self):
+        cache.clear()
+        rid_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def url(self, route):
+        values = {'rid_id': self.module.rid_id, 'module_esn': self.module.module_esn, 'esn': self.module.aircraft.esn,
+                  'mark': self.module.aircraft.registration_mark}
+        segment = route.split('/')[2] if route.count('/') >= 2 else ''
+
+        def fill(match):
+            name = match.group('name')
+            return str(self.pk_values[PK_MODELS[segment]] if name == 'pk' else values[name])
+        return '/' + re.sub(r'<(?:[^>:]+:)?(?P<name>[^>]+)>', fill, route) + QUERY_STRINGS.get(route, '')
+
+    def test_every_endpoint_has_a_budget(self):
+        self.assertEqual(sorted(set(get_routes()) - set(QUERY_BUDGETS)), [])
+
+    def test_endpoints_stay_within_budget(self):
+        for route in get_routes():
+            with self.subTest(route=route):
+                url = self.url(route)
+                with CaptureQueriesContext(connection) as captured:
+                    response = self.client.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                self.assertEqual(response.status_code, 200, url)
+                if route not in ('', 'api/v1/', 'api/v1/metrics', 'api/v1/rid-modules/cache-stats') \
+                        and not route.startswith('api/v1/export/'):
+                    self.assertGreater(len(response.content), 100, url)
+                self.assertLessEqual(len(captured), QUERY_BUDGETS[route], '%s ran %d queries:\n%s' % (
+                    url, len(captured), '\n'.join(query['sql'] for query in captured.captured_queries)))
@@ -0,0 +1,66 @@
+import uuid
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from registry.models import RIDModule
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator
+
+
+class RIDModuleResolveTests(TestCase):
+    """ Batch resolution of RID IDs and module ESNs """
+
+    url = '/api/v1/rid-modules/resolve'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Batch Ltd')
+        aircraft = create_aircraft(cls.operator, create_manufacturer(), registration_mark='G-BTCH')
+        cls.modules = [
+            RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator,
+                                     aircraft=aircraft if i % 2 else None, module_esn='BATCH%04d' % i)
+            for i in range(20)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_mixed_batch_in_one_query(self):
+        missing_rid = str(uuid.uuid4())
+        rid_ids = [str(module.rid_id) for module in self.modules[:15]] + [missing_rid]
+        module_esns = [module.module_esn for module in self.modules[15:]] + ['NOSUCHESN']
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {'rid_ids': rid_ids, 'module_esns': module_esns}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(response.data['not_found'], [missing_rid, 'NOSUCHESN'])
+
+        module = response.data['results'][str(self.modules[1].rid_id)]
+        self.assertEqual(module['module_esn'], 'BATCH0001')
+        self.assertEqual(module['operator'], {'id': str(self.operator.id), 'company_name': 'Batch Ltd'})
+        self.assertEqual(module['aircraft']['registration_mark'], 'G-BTCH')
+        self.assertIsNone(response.data['results']['BATCH0016']['aircraft'])
+
+    def test_rid_ids_are_matched_case_insensitively(self):
+        rid_id = str(self.modules[0].rid_id)
+        response = self.client.post(self.url, {'rid_ids': [rid_id.upper()]}, format='json')
+        self.assertIn(rid_id, response.data['results'])
+
+    def test_module_esns_are_matched_as_stored(self):
+        response = self.client.post(self.url, {'module_esns': ['batch0003', '0000']}, format='json')
+        self.assertEqual(response.data['results']['batch0003']['id'], str(self.modules[3].id))
+        self.assertEqual(response.data['not_found'], ['0000'])
+
+    def test_empty_batch_is_rejected(self):
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(REGISTRY_RESOLVE_MAX_IDS=5)
+    def test_batch_size_is_capped(self):
+        response = self.client.post(self.url, {'module_esns': ['ESN%d' % i for i in range(6)]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_rid_id_is_rejected(self):
+        response = self.client.post(self.url, {'rid_ids': ['not-a-uuid']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rid_ids', response.data)
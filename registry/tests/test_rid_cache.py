@@ -0,0 +1,132 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from registry.cache import LRUCache, rid_cache
+from registry.models import RIDModule
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator, privileged_token
+
+
+class RIDResolutionCacheTests(TestCase):
+    """ RID ID / ESN resolution is served from the cache and invalidated on every change """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Resolve Ltd')
+        cls.aircraft = create_aircraft(cls.operator, create_manufacturer())
+        cls.module = RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator, aircraft=cls.aircraft,
+                                              module_esn='ESNCACHE0001')
+
+    def setUp(self):
+        cache.clear()
+        rid_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+        self.rid_url = '/api/v1/rid-modules/by-rid/%s' % self.module.rid_id
+        self.esn_url = '/api/v1/rid-modules/by-esn/%s' % self.module.module_esn
+
+    def test_repeat_lookups_skip_the_database(self):
+        first = self.client.get(self.rid_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.rid_url)
+        self.assertEqual(second.data, first.data)
+        self.client.get(self.esn_url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.esn_url).data['id'], str(self.module.id))
+        stats = rid_cache.stats()
+        self.assertEqual((stats['local_hits'], stats['misses']), (2, 2))
+
+    def test_esn_lookups_share_the_stored_form(self):
+        self.client.get(self.esn_url)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/rid-modules/by-esn/%s' % self.module.module_esn.lower())
+        self.assertEqual(response.data['id'], str(self.module.id))
+        self.assertEqual(self.client.get('/api/v1/rid-modules/by-esn/0000').status_code, 404)
+
+    def test_shared_tier_backs_the_local_tier(self):
+        self.client.get(self.rid_url)
+        rid_cache.local.clear()
+        with self.assertNumQueries(0):
+            self.client.get(self.rid_url)
+        self.assertEqual(rid_cache.stats()['shared_hits'], 1)
+
+    def test_per_process_backend_keeps_shared_entries_briefly(self):
+        key = rid_cache.key('rid', self.module.rid_id)
+        with override_settings(REGISTRY_PROCESS_CACHE_TIMEOUT=0):
+            self.client.get(self.rid_url)
+        self.assertIsNone(cache.get(key))
+        rid_cache.local.clear()
+        self.client.get(self.rid_url)
+        self.assertIsNotNone(cache.get(key))
+
+    def test_changes_during_a_read_are_not_cached_over(self):
+        generation = rid_cache.generation('rid', self.module.rid_id)
+        self.module.save()
+        rid_cache.set('rid', self.module.rid_id, {'id': 'stale'}, generation)
+        self.assertIsNone(rid_cache.get('rid', self.module.rid_id))
+
+        # A read between the change and its commit still sees the old row.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.module.save()
+            generation = rid_cache.generation('rid', self.module.rid_id)
+        rid_cache.set('rid', self.module.rid_id, {'id': 'stale'}, generation)
+        self.assertIsNone(rid_cache.get('rid', self.module.rid_id))
+
+    def test_rid_id_update_invalidates_old_and_new_ids(self):
+        new_rid = uuid.uuid4()
+        self.client.get(self.rid_url)
+        response = self.client.patch('/api/v1/rid-modules/%s/rid-id' % self.module.id, {'rid_id': str(new_rid)},
+                                     format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.rid_url).status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/rid-modules/by-rid/%s' % new_rid).data['id'], str(self.module.id))
+
+    def test_patch_and_delete_invalidate(self):
+        self.client.get(self.esn_url)
+        self.client.patch('/api/v1/rid-modules/%s' % self.module.id, {'firmware_version': '2.0'}, format='json')
+        self.assertEqual(self.client.get(self.esn_url).data['firmware_version'], '2.0')
+        self.client.delete('/api/v1/rid-modules/%s' % self.module.id)
+        self.assertEqual(self.client.get(self.esn_url).data['status'], 'decommissioned')
+
+    def test_related_changes_invalidate(self):
+        self.client.get(self.rid_url)
+        self.operator.company_name = 'Resolve Holdings'
+        self.operator.save()
+        self.assertEqual(self.client.get(self.rid_url).data['operator']['company_name'], 'Resolve Holdings')
+        self.aircraft.delete()
+        self.assertIsNone(self.client.get(self.rid_url).data['aircraft'])
+
+    def test_sparse_requests_bypass_the_cache(self):
+        self.client.get(self.rid_url)
+        response = self.client.get(self.rid_url, {'fields': 'rid_id'})
+        self.assertEqual(set(response.data), {'rid_id'})
+
+    def test_stats_endpoint(self):
+        self.client.get(self.rid_url)
+        self.client.get(self.rid_url)
+        response = self.client.get('/api/v1/rid-modules/cache-stats')
+        self.assertEqual(response.data['misses'], 1)
+        self.assertEqual(response.data['local_hits'], 1)
+        self.assertEqual(response.data['hit_ratio'], 0.5)
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/v1/rid-modules/cache-stats').status_code, 401)
+
+
+class LRUCacheTests(SimpleTestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+    def test_entries_expire(self):
+        lru = LRUCache(maxsize=2, ttl=0.01)
+        lru.set('a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get('a'))
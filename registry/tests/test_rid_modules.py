@@ -0,0 +1,56 @@
+import uuid
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry.models import RIDModule, TypeCertificate
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator
+
+
+class RIDModuleListQueryTests(TestCase):
+    """ RID module listings fetch operator, aircraft and type certificate in one joined query """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('RID Ltd')
+        cls.manufacturer = create_manufacturer()
+        cls.aircraft = create_aircraft(cls.operator, cls.manufacturer)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def add_modules(self, count):
+        for _ in range(count):
+            certificate = TypeCertificate.objects.create(type_certificate_id='TC', type_certificate_issuing_country='GB',
+                                                         type_certificate_holder='Holder',
+                                                         type_certificate_holder_country='GB')
+            aircraft = create_aircraft(self.operator, self.manufacturer, type_certificate=certificate)
+            RIDModule.objects.create(rid_id=uuid.uuid4(), operator=self.operator, aircraft=aircraft,
+                                     module_esn=uuid.uuid4().hex[:16].upper())
+
+    def assertConstantQueries(self, url):
+        self.add_modules(2)
+        with self.assertNumQueries(1):
+            small = self.client.get(url)
+        self.add_modules(10)
+        with self.assertNumQueries(1):
+            large = self.client.get(url)
+        self.assertEqual(small.status_code, 200)
+        self.assertGreater(len(large.data['results']), len(small.data['results']))
+        self.assertIsNotNone(large.data['results'][0]['aircraft']['type_certificate'])
+
+    def test_rid_module_list(self):
+        self.assertConstantQueries('/api/v1/rid-modules')
+
+    def test_operator_rid_modules(self):
+        self.assertConstantQueries('/api/v1/operators/%s/rid-modules' % self.operator.id)
+
+    def test_aircraft_rid_modules(self):
+        url = '/api/v1/aircraft/%s/rid-modules' % self.aircraft.id
+        for _ in range(3):
+            RIDModule.objects.create(rid_id=uuid.uuid4(), operator=self.operator, aircraft=self.aircraft,
+                                     module_esn=uuid.uuid4().hex[:16].upper())
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['operator']['company_name'], 'RID Ltd')
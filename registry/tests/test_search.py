@@ -0,0 +1,88 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry import search
+from registry.models import Person, Pilot, SearchEntry
+from registry.tests.helpers import (create_address, create_aircraft, create_manufacturer, create_operator,
+                                    privileged_token)
+
+
+class SearchTests(TestCase):
+    """ /api/v1/search ranks operators, aircraft and pilots from the full-text index the signals keep current """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.address = create_address()
+        cls.falcon = create_operator('Falcon Survey Ltd', cls.address, company_number='FS123')
+        cls.horizon = create_operator('Horizon Aerial', cls.address, company_number='FALCON9')
+        cls.aircraft = create_aircraft(cls.horizon, create_manufacturer(full_name='Search Aero', common_name='Search'),
+                                       model='Matrice 300 RTK', popular_name='Falcon Eye', maci_number='MACI-7781',
+                                       registration_mark='G-FALC', esn='')
+        cls.person = Person.objects.create(first_name='Priya', last_name='Falconer', email='priya@example.com')
+        cls.pilot = Pilot.objects.create(operator=cls.falcon, person=cls.person, address=cls.address)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + privileged_token())
+
+    def search(self, **params):
+        response = self.client.get('/api/v1/search', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(result['type'], result['id']) for result in response.data['results']]
+
+    def test_ranked_prefix_matches(self):
+        results = self.search(q='falc')
+        self.assertEqual(set(results), {('operator', str(self.falcon.id)), ('operator', str(self.horizon.id)),
+                                        ('aircraft', str(self.aircraft.id)), ('pilot', str(self.pilot.id))})
+        # The company number of Horizon only matches in the details, ranked last.
+        self.assertEqual(results[-1], ('operator', str(self.horizon.id)))
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search(q='falcon survey'), [('operator', str(self.falcon.id))])
+        self.assertEqual(self.search(q='MACI 7781'), [('aircraft', str(self.aircraft.id))])
+        self.assertEqual(self.search(q='falcon nothing'), [])
+
+    def test_type_and_limit(self):
+        self.assertEqual(self.search(q='falc', type='pilot'), [('pilot', str(self.pilot.id))])
+        self.assertEqual(len(self.search(q='falc', limit=2)), 2)
+        for params in ({}, {'q': '--'}, {'q': 'falc', 'type': 'contact'}, {'q': 'falc', 'limit': 500}):
+            self.assertEqual(self.client.get('/api/v1/search', params).status_code, 400, params)
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/v1/search', {'q': 'falcon'}).status_code, 401)
+
+    def test_index_follows_changes(self):
+        self.falcon.company_name = 'Kestrel Survey Ltd'
+        self.falcon.save()
+        self.person.last_name = 'Okafor'
+        self.person.save()
+        self.assertEqual(self.search(q='kestrel'), [('operator', str(self.falcon.id))])
+        self.assertEqual(self.search(q='okafor'), [('pilot', str(self.pilot.id))])
+        self.assertNotIn(('pilot', str(self.pilot.id)), self.search(q='falconer'))
+
+        self.horizon.delete()
+        self.assertEqual(self.search(q='falcon'), [])
+        self.assertFalse(SearchEntry.objects.filter(object_id=self.aircraft.id).exists())
+
+    def test_bulk_registration_is_indexed(self):
+        records = [{'company_name': 'Zephyr Drones %d' % i, 'website': 'zephyr.example', 'email': 'z@zephyr.example',
+                    'operator_type': 2, 'address': {'address_line_1': '1 Way', 'city': 'Testville', 'country': 'GB'}}
+                   for i in range(3)]
+        self.assertEqual(self.client.post('/api/v1/operators', records, format='json').status_code, 201)
+        self.assertEqual(len(self.search(q='zephyr')), 3)
+
+    def test_rebuild_command(self):
+        SearchEntry.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 4 entries', out.getvalue())
+        self.assertEqual(len(self.search(q='falc')), 4)
+
+    def test_like_fallback(self):
+        with mock.patch('registry.search.fts_available', return_value=False):
+            matches = search.search('falcon survey')
+        self.assertEqual([(kind, object_id) for kind, object_id, label, rank in matches], [('operator', self.falcon.id)])
@@ -0,0 +1,60 @@
+import uuid
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from registry.models import RIDModule, TypeCertificate
+from registry.tests.helpers import create_aircraft, create_manufacturer, create_operator
+
+
+class SparseFieldsetTests(TestCase):
+    """ ?fields= trims the response and the SQL behind it """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.operator = create_operator('Sparse Ltd')
+        certificate = TypeCertificate.objects.create(type_certificate_id='TC1', type_certificate_issuing_country='GB',
+                                                     type_certificate_holder='Holder',
+                                                     type_certificate_holder_country='GB')
+        cls.aircraft = create_aircraft(cls.operator, create_manufacturer(), model='Sparrow', maci_number='MACI1',
+                                       registration_mark='G-SPRS', type_certificate=certificate)
+        RIDModule.objects.create(rid_id=uuid.uuid4(), operator=cls.operator, aircraft=cls.aircraft,
+                                 module_esn='SPARSE0001')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list_output_is_trimmed(self):
+        response = self.client.get('/api/v1/aircraft', {'fields': 'id,registration_mark,status'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [{'id': str(self.aircraft.id), 'registration_mark': 'G-SPRS', 'status': 1}])
+
+    def test_projection_reaches_the_sql(self):
+        with self.assertNumQueries(1) as context:
+            self.client.get('/api/v1/aircraft', {'fields': 'id,registration_mark,status'})
+        sql = context.captured_queries[0]['sql']
+        self.assertIn('registration_mark', sql)
+        self.assertNotIn('maci_number', sql)
+        self.assertNotIn('registry_typecertificate', sql)
+
+    def test_unrequested_nested_join_is_skipped(self):
+        with self.assertNumQueries(1) as context:
+            response = self.client.get('/api/v1/rid-modules', {'fields': 'rid_id,operator'})
+        sql = context.captured_queries[0]['sql']
+        self.assertIn('registry_operator', sql)
+        self.assertNotIn('registry_aircraft', sql)
+        self.assertEqual(response.data['results'][0]['operator']['company_name'], 'Sparse Ltd')
+        self.assertEqual(set(response.data['results'][0]), {'rid_id', 'operator'})
+
+    def test_requested_nested_object_is_joined(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/aircraft/%s' % self.aircraft.id, {'fields': 'id,type_certificate'})
+        self.assertEqual(response.data['type_certificate']['type_certificate_id'], 'TC1')
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/v1/aircraft', {'fields': 'id,wingspan'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_without_fields_everything_is_returned(self):
+        response = self.client.get('/api/v1/operators/%s' % self.operator.id)
+        self.assertEqual(set(response.data), {'id', 'company_name', 'website', 'email', 'phone_number'})
@@ -1,13 +1,21 @@
+import calendar
 import datetime
+import hashlib
 import json
 import jwt
+import logging
 
 from datetime import datetime
-from django.core.exceptions import PermissionDenied
-from django.http import Http404
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db.models import Prefetch, Q
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template import loader
-from django.utils import translation
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.views.generic import TemplateView
 from rest_framework import generics, mixins, status, viewsets
 from rest_framework.authentication import (SessionAuthentication,
@@ -18,28 +26,330 @@ from rest_framework.views import APIView
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.exceptions import ValidationError
 
-from registry.models import Activity, Authorization, Contact, Operator, Aircraft, Pilot, Test, TestValidity, Person, Address, Manufacturer, RIDModule
+from registry.models import Activity, Authorization, Contact, Operator, Aircraft, Pilot, Test, TestValidity, Person, Address, Manufacturer, RIDModule, Tombstone, normalize_esn, normalize_registration_mark
 from registry.serializers import (ContactSerializer, OperatorSerializer, PilotSerializer, 
                                   PrivilagedContactSerializer, PrivilagedPilotSerializer,
                                   PrivilagedOperatorSerializer, AircraftSerializer, AircraftESNSerializer,
                                   OperatorCreateSerializer, PilotCreateSerializer, 
                                   ContactCreateSerializer, AircraftCreateSerializer, ManufacturerSerializer,
-                                  RIDModuleSerializer, RIDModuleCreateSerializer, RIDModuleRIDIDUpdateSerializer)
-from django.http import JsonResponse
+                                  RIDModuleSerializer, RIDModuleCreateSerializer, RIDModuleRIDIDUpdateSerializer,
+                                  RIDModuleResolutionSerializer, RIDModuleResolveSerializer,
+                                  RIDModuleHeartbeatSerializer, SearchQuerySerializer, normalize_operator_data,
+                                  requested_fields, requested_includes)
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view
 from six.moves.urllib import request as req
 from functools import wraps
 from django.conf import settings
+from registry import search
 from registry.auth import requires_auth, requires_scope
+from registry.cache import rid_cache, shared_timeout, versioned_key
+from registry.heartbeat import heartbeats
+from registry.metrics import request_metrics
+from registry.pagination import ChangeFeedPagination, Deletion
+from registry.renderers import CSVRenderer, NDJSONRenderer
 
+logger = logging.getLogger(__name__)
 
-class OperatorList(mixins.ListModelMixin,
+
+class SparseQuerysetMixin(object):
+    """
+    Pushes ?fields=a,b,c down to the queryset: only the requested columns are loaded
+    and joins for nested objects that were not requested are dropped.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = requested_fields(self.request)
+        include = requested_includes(self.request)
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, 'sparse_queryset'):
+            return queryset
+        if not requested:
+            # Included fields are relations, joined rather than loaded row by row (unknown names are the
+            # serializer's to reject).
+            include = [name for name in include or () if name in serializer_class.includable]
+            return queryset.select_related(*include) if include else queryset
+        return serializer_class.sparse_queryset(queryset, requested, keep=self.get_sparse_keep(), include=include)
+
+    def get_sparse_keep(self):
+        """ Columns loaded whatever ?fields= says, the paginator reads its ordering key off every row """
+        return tuple(getattr(self.paginator, 'ordering', ()))
+
+
+class BulkCreateMixin(object):
+    """
+    POSTing a JSON list creates every valid item through the serializer's many=True list serializer
+    (see registry.serializers.BulkCreateListSerializer).
+    """
+
+    def bulk_create(self, request):
+        """
+        Create objects from a JSON list. Valid items are created, invalid ones are reported by index;
+        the response is 201 when every item was created, 207 when some failed and 400 when none were created.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        created = serializer.save() if serializer.validated_data else []
+        results = [{'index': index, 'id': str(obj.id)} for index, obj in zip(serializer.valid_indexes, created)]
+        results.extend(serializer.item_errors)
+        results.sort(key=lambda result: result['index'])
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif serializer.item_errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response({'created': len(created), 'failed': len(serializer.item_errors), 'results': results},
+                        status=response_status)
+
+
+class PageNotModified(Exception):
+    """ Raised out of pagination when the page matches the request's validators, carries the 304 (or 412) """
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+class ConditionalGetMixin(object):
+    """
+    Adds strong ETag and Last-Modified validators to GET responses and answers matching
+    If-None-Match / If-Modified-Since with 304 before anything is serialized.
+    Details are validated by the updated_at of the object (and of the nested objects it renders, ?include= ones
+    too), lists by the ids and timestamps of the rows on the page and whether pages follow or precede it: keyset
+    pages are fixed by their cursor, so the page fetch is the only query a matching request costs.
+    """
+    etag_timestamp_fields = ('updated_at',)
+
+    def get_etag_timestamp_fields(self):
+        includable = getattr(self.get_serializer_class(), 'includable', {})
+        return self.etag_timestamp_fields + tuple('%s__updated_at' % name
+                                                  for name in requested_includes(self.request) or ()
+                                                  if name in includable)
+
+    def get_sparse_keep(self):
+        keep = tuple(field for field in self.etag_timestamp_fields if '__' not in field)
+        return super().get_sparse_keep() + keep
+
+    def get_fast_keep(self, reader):
+        # Timestamps of relations the reader already joins come along, the others would cost a join.
+        joined = {column.rsplit('__', 1)[0] for column in reader.columns if '__' in column}
+        keep = tuple(field for field in self.get_etag_timestamp_fields()
+                     if '__' not in field or field.rsplit('__', 1)[0] in joined)
+        return super().get_fast_keep(reader) + keep
+
+    def get_instance_timestamps(self, instance):
+        timestamps = []
+        for path in self.get_etag_timestamp_fields():
+            obj = instance
+            parts = path.split('__')
+            for part in parts[:-1]:
+                # Only relations that were loaded can appear in the response.
+                if obj is None or not type(obj)._meta.get_field(part).is_cached(obj):
+                    obj = None
+                    break
+                try:
+                    obj = getattr(obj, part)
+                except ObjectDoesNotExist:
+                    # A reverse one-to-one without a row (rendered as null).
+                    obj = None
+                    break
+            if obj is not None:
+                timestamps.append(getattr(obj, parts[-1]))
+        return timestamps
+
+    def get_row_timestamps(self, row):
+        if isinstance(row, dict):
+            return [row.get(field) for field in self.get_etag_timestamp_fields()]
+        return self.get_instance_timestamps(row)
+
+    def get_validators(self, request, timestamps, validators):
+        timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+        key = [request.get_full_path(), request.accepted_media_type or '']
+        key.extend(timestamp.isoformat() for timestamp in timestamps)
+        key.extend(str(value) for value in validators)
+        etag = quote_etag(hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest())
+        last_modified = calendar.timegm(max(timestamps).utctimetuple()) if timestamps else None
+        return etag, last_modified
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def conditional_response(self, request, timestamps, validators, respond):
+        etag, last_modified = self.get_validators(request, timestamps, validators)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = respond()
+        return self.set_validators(response, etag, last_modified)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if getattr(self, 'list_validators', False) is not None:
+            return page
+        rows = queryset if page is None else page
+        timestamps = [timestamp for row in rows for timestamp in self.get_row_timestamps(row)]
+        validators = [row['id'] if isinstance(row, dict) else row.pk for row in rows]
+        if page is not None:
+            validators.extend(getattr(self.paginator, name, None) for name in ('has_next', 'has_previous'))
+        self.list_validators = self.get_validators(self.request, timestamps, validators)
+        response = get_conditional_response(self.request, etag=self.list_validators[0],
+                                            last_modified=self.list_validators[1])
+        if response is not None:
+            raise PageNotModified(response)
+        return page
+
+    def list(self, request, *args, **kwargs):
+        # paginate_queryset() fills this in from the page once it is fetched.
+        self.list_validators = None
+        try:
+            response = super().list(request, *args, **kwargs)
+        except PageNotModified as not_modified:
+            response = not_modified.response
+        finally:
+            validators, self.list_validators = self.list_validators, False
+        if validators is None:
+            return response
+        return self.set_validators(response, *validators)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(request, self.get_instance_timestamps(instance), [instance.pk],
+                                         lambda: Response(self.get_serializer(instance).data))
+
+
+class VersionedCacheMixin(object):
+    """
+    Serves GET lists from the Django cache. Entries are keyed by the namespace version, which
+    the model signals in registry.signals bump on every change, and by the full path and media type.
+    Cached validators keep conditional requests off the database too. A per-process cache backend only sees the
+    bumps of its own worker, so entries there are kept for REGISTRY_PROCESS_CACHE_TIMEOUT seconds at most.
+    """
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        key = versioned_key(self.cache_namespace, request.get_full_path(), request.accepted_media_type)
+        entry = cache.get(key)
+        if entry is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code == 200:
+                entry = {'data': response.data, 'etag': response.get('ETag'),
+                         'last_modified': response.get('Last-Modified')}
+                cache.set(key, entry, shared_timeout(settings.REGISTRY_REFERENCE_CACHE_TIMEOUT))
+            return response
+
+        last_modified = parse_http_date_safe(entry['last_modified']) if entry['last_modified'] else None
+        response = get_conditional_response(request, etag=entry['etag'], last_modified=last_modified)
+        if response is None:
+            response = Response(entry['data'])
+        if entry['etag']:
+            response['ETag'] = entry['etag']
+        if entry['last_modified']:
+            response['Last-Modified'] = entry['last_modified']
+        return response
+
+
+class FastListMixin(object):
+    """
+    Serves GET lists through the serializer's compiled fast reader: rows come back from values()
+    and are rendered straight into dicts, no model instances are built.
+    Falls back to the regular ListModelMixin path when REGISTRY_FAST_SERIALIZATION is off.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if not getattr(settings, 'REGISTRY_FAST_SERIALIZATION', True) or not hasattr(serializer_class, 'fast_reader'):
+            return super().list(request, *args, **kwargs)
+        reader = serializer_class.fast_reader(requested_fields(request), requested_includes(request))
+        rows = reader.values(self.filter_queryset(self.get_queryset()), keep=self.get_fast_keep(reader))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.render(page))
+        return Response(reader.render(rows))
+
+    def get_fast_keep(self, reader):
+        """ Columns loaded besides the reader's, the paginator reads its ordering key off every row """
+        return tuple(getattr(self.paginator, 'ordering', ()))
+
+
+class ChangeFeedMixin(object):
+    """
+    ?updated_since=<ISO 8601 datetime> turns a GET list into a change feed for mirrors: the rows created or
+    changed since then (inclusive) in (updated_at, id) order, with a tombstone for every row of tombstone_kind
+    deleted since then. Pages follow registry.pagination.ChangeFeedPagination; other list filters apply to the
+    changed rows.
+    """
+    tombstone_kind = None
+
+    def get_updated_since(self):
+        if not hasattr(self, '_updated_since'):
+            value = self.request.query_params.get('updated_since')
+            since = None
+            if value:
+                # An unencoded '+' in the UTC offset arrives as a space.
+                since = parse_datetime(value) or parse_datetime(value.replace(' ', '+'))
+                if since is None:
+                    raise ValidationError({'updated_since': ['Expected an ISO 8601 date and time.']})
+                if timezone.is_naive(since):
+                    since = timezone.make_aware(since, timezone.utc)
+            self._updated_since = since
+        return self._updated_since
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.get_updated_since() is not None:
+            self._paginator = ChangeFeedPagination()
+        return super().paginator
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        since = self.get_updated_since()
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+        return queryset
+
+    def get_tombstone_querysets(self):
+        """ (queryset, (key field, tie field), reason) of every source of tombstones merged into the feed """
+        deleted = Tombstone.objects.filter(kind=self.tombstone_kind, deleted_at__gte=self.get_updated_since())
+        return [(deleted, ('deleted_at', 'object_id'), 'deleted')]
+
+    def list(self, request, *args, **kwargs):
+        if self.get_updated_since() is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        if getattr(settings, 'REGISTRY_FAST_SERIALIZATION', True) and hasattr(serializer_class, 'fast_reader'):
+            reader = serializer_class.fast_reader(requested_fields(request), requested_includes(request))
+            page = self.paginate_queryset(reader.values(queryset, keep=self.paginator.ordering))
+            render_rows = reader.render
+        else:
+            page = self.paginate_queryset(queryset)
+
+            def render_rows(rows):
+                return self.get_serializer(rows, many=True).data
+        rendered = iter(render_rows([item for item in page if not isinstance(item, Deletion)]))
+        return self.get_paginated_response([item.data() if isinstance(item, Deletion) else next(rendered)
+                                            for item in page])
+
+
+class OperatorList(ChangeFeedMixin,
+                   BulkCreateMixin,
+                   ConditionalGetMixin,
+                   FastListMixin,
+                   SparseQuerysetMixin,
+                   mixins.ListModelMixin,
                   mixins.CreateModelMixin,
                   generics.GenericAPIView):
     """
     List all operators, or create a new operator.
     """
     queryset = Operator.objects.all()
+    tombstone_kind = 'operator'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -51,11 +361,11 @@ class OperatorList(mixins.ListModelMixin,
     
     @requires_auth
     def post(self, request, *args, **kwargs):
-        print("Received POST data:", request.data)
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
         # Create a mutable copy of request data
         # For JSON requests, request.data is already a dict
         # For form data, it might be a QueryDict
-        import copy
         if hasattr(request.data, '_mutable'):
             # QueryDict - convert to regular dict
             data = {}
@@ -72,80 +382,18 @@ class OperatorList(mixins.ListModelMixin,
                 except (json.JSONDecodeError, TypeError):
                     pass
         else:
-            # Already a dict, use deepcopy
-            data = copy.deepcopy(dict(request.data))
-
-        # Handle operator_type conversion
-        if 'operator_type' in data:
-            if isinstance(data['operator_type'], str):
-                type_map = {'na': 0, 'luc': 1, 'non-luc': 2, 'auth': 3, 'dec': 4, 'private': 2}
-                op_type = data['operator_type'].lower()
-                if op_type in type_map:
-                    data['operator_type'] = type_map[op_type]
-
-        # Handle website format
-        if 'website' in data and data['website']:
-            original_website = data['website']
-            if not data['website'].startswith(('http://', 'https://')):
-                data['website'] = 'https://' + data['website']
-            print(f"Website transformation: '{original_website}' -> '{data['website']}'", flush=True)
-        
-        # Handle phone number - normalize if it doesn't start with + or 1
-        if 'phone_number' in data and data['phone_number']:
-            phone = str(data['phone_number']).strip()
-            # Remove any spaces or dashes
-            phone = phone.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-            # If it doesn't start with + and is just digits, it should be valid
-            # The regex allows: optional +, optional 1, then 9-15 digits
-            # So numbers like '0585396050' should work, but let's ensure it's clean
-            data['phone_number'] = phone
-
-        # Handle address fields
-        if 'address' in data:
-            # Ensure address is a dict (not a QueryDict or other type)
-            if not isinstance(data['address'], dict):
-                addr_data = dict(data['address'])
-            else:
-                addr_data = data['address'].copy()
-            
-            # Convert line_1 to address_line_1 if needed
-            if 'line_1' in addr_data and 'address_line_1' not in addr_data:
-                addr_data['address_line_1'] = addr_data.pop('line_1')
-
-            # Set default values for required address fields if missing
-            if 'address_line_2' not in addr_data or not addr_data.get('address_line_2'):
-                addr_data['address_line_2'] = '-'
-            if 'address_line_3' not in addr_data or not addr_data.get('address_line_3'):
-                addr_data['address_line_3'] = '-'
-            
-            # Ensure postcode has a default if missing
-            if 'postcode' not in addr_data or not addr_data.get('postcode'):
-                addr_data['postcode'] = '0'
-
-            # Handle country code conversion
-            if 'country' in addr_data:
-                country_map = {
-                    'uae': 'AE',
-                    'united arab emirates': 'AE',
-                    'usa': 'US',
-                    'united states': 'US',
-                    'uk': 'GB',
-                    'united kingdom': 'GB'
-                }
-                country = str(addr_data['country']).lower()
-                if country in country_map:
-                    addr_data['country'] = country_map[country]
-            
-            # Update the address in data
-            data['address'] = addr_data
+            # Already a dict, normalize_operator_data copies what it changes
+            data = dict(request.data)
+
+        data = normalize_operator_data(data)
+        logger.debug("Operator registration received", extra={'payload': data})
 
         try:
             serializer = self.get_serializer(data=data)
             if not serializer.is_valid():
                 error_details = dict(serializer.errors)
-                print("DEBUG - Validation errors:", error_details, flush=True)
-                print("Validation errors:", error_details)
-                print("Processed data:", data, flush=True)
+                logger.info("Operator registration failed validation",
+                            extra={'payload': {'errors': error_details, 'processed_data': data}})
                 
                 # Format errors for better readability
                 formatted_errors = {}
@@ -179,7 +427,7 @@ class OperatorList(mixins.ListModelMixin,
             
         except ValidationError as e:
             # Handle DRF ValidationError
-            print(f"ValidationError in operator creation: {str(e)}", flush=True)
+            logger.warning("ValidationError in operator creation", extra={'payload': {'errors': e.detail}})
             error_details = dict(e.detail) if hasattr(e, 'detail') else {'error': [str(e)]}
             formatted_errors = {}
             for field, errors in error_details.items():
@@ -195,9 +443,7 @@ class OperatorList(mixins.ListModelMixin,
                 'processed_data': data
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Exception in operator creation: {str(e)}", flush=True)
-            import traceback
-            print(traceback.format_exc(), flush=True)
+            logger.exception("Exception in operator creation")
             return Response({
                 'status': 'error',
                 'message': f'Server error: {str(e)}',
@@ -205,7 +451,9 @@ class OperatorList(mixins.ListModelMixin,
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class OperatorDetail(mixins.RetrieveModelMixin,
+class OperatorDetail(ConditionalGetMixin,
+                     SparseQuerysetMixin,
+                     mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.DestroyModelMixin,
                     generics.GenericAPIView):
@@ -236,7 +484,10 @@ class OperatorDetailPrivilaged(mixins.RetrieveModelMixin,
     """
     Retrieve operator with privileged details.
     """
-    queryset = Operator.objects.all()
+    queryset = Operator.objects.select_related('address').prefetch_related(
+        Prefetch('authorized_activities', queryset=Activity.objects.only('id', 'name')),
+        Prefetch('operational_authorizations', queryset=Authorization.objects.only('id', 'title')),
+    )
     serializer_class = PrivilagedOperatorSerializer
 
     @requires_scope('read:privileged')
@@ -244,7 +495,10 @@ class OperatorDetailPrivilaged(mixins.RetrieveModelMixin,
         return self.retrieve(request, *args, **kwargs)
 
 
-class OperatorAircraft(mixins.RetrieveModelMixin,
+class OperatorAircraft(ConditionalGetMixin,
+                       FastListMixin,
+                       SparseQuerysetMixin,
+                       mixins.ListModelMixin,
                     generics.GenericAPIView):
     """
     Retrieve aircraft for a specific operator.
@@ -260,25 +514,33 @@ class OperatorAircraft(mixins.RetrieveModelMixin,
         else: 
             return Aircraft.objects.filter(operator=o)
 
+    def get_queryset(self):
+        return self.get_Aircraft(self.kwargs['pk'])
+
     def get(self, request, pk, format=None):
-        aircraft = self.get_Aircraft(pk)
-        serializer = AircraftSerializer(aircraft, many=True)
-        return Response(serializer.data)
+        return self.list(request, pk, format=format)
 
 
-class AircraftList(mixins.ListModelMixin,
+class AircraftList(ChangeFeedMixin,
+                   BulkCreateMixin,
+                   ConditionalGetMixin,
+                   FastListMixin,
+                   SparseQuerysetMixin,
+                   mixins.ListModelMixin,
                   mixins.CreateModelMixin,
                   generics.GenericAPIView):
     """
     List all aircraft, or create a new aircraft.
-    Supports filtering by operator via ?operator=<uuid> query parameter.
+    Supports filtering by operator via ?operator=<uuid> and by ESN prefix via ?esn_prefix= query parameters.
     """
     queryset = Aircraft.objects.all()
+    tombstone_kind = 'aircraft'
     
     def get_queryset(self):
         """
-        Optionally filter aircraft by operator query parameter.
+        Optionally filter aircraft by operator and ESN prefix (a manufacturer's serial range) query parameters.
         Example: GET /api/v1/aircraft?operator=566d63bb-cb1c-42dc-9a51-baef0d0a8d04
+        Example: GET /api/v1/aircraft?esn_prefix=1581F4
         """
         queryset = Aircraft.objects.all()
         operator_id = self.request.query_params.get('operator', None)
@@ -286,6 +548,12 @@ class AircraftList(mixins.ListModelMixin,
         if operator_id:
             # Filter aircraft by operator UUID
             queryset = queryset.filter(operator_id=operator_id)
+
+        esn_prefix = self.request.query_params.get('esn_prefix', '').strip().upper()
+        if esn_prefix:
+            # The lower bound gives SQLite, whose LIKE is case-insensitive and skips the index, a range scan;
+            # PostgreSQL uses the varchar_pattern_ops index Django adds to the unique column.
+            queryset = queryset.filter(esn_normalized__gte=esn_prefix, esn_normalized__startswith=esn_prefix)
         
         return queryset
     
@@ -299,15 +567,16 @@ class AircraftList(mixins.ListModelMixin,
     
     @requires_auth
     def post(self, request, *args, **kwargs):
-        print("Received POST data for aircraft:", request.data, flush=True)
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+        logger.debug("Aircraft registration received", extra={'payload': request.data})
         
         try:
             serializer = self.get_serializer(data=request.data)
             if not serializer.is_valid():
                 error_details = dict(serializer.errors)
-                print("DEBUG - Validation errors:", error_details, flush=True)
-                print("Validation errors:", error_details)
-                print("Received data:", dict(request.data) if hasattr(request.data, 'dict') else request.data, flush=True)
+                logger.info("Aircraft registration failed validation",
+                            extra={'payload': {'errors': error_details, 'received_data': request.data}})
                 
                 # Format errors for better readability
                 formatted_errors = {}
@@ -346,7 +615,7 @@ class AircraftList(mixins.ListModelMixin,
             
         except ValidationError as e:
             # Handle DRF ValidationError
-            print(f"ValidationError in aircraft creation: {str(e)}", flush=True)
+            logger.warning("ValidationError in aircraft creation", extra={'payload': {'errors': e.detail}})
             error_details = dict(e.detail) if hasattr(e, 'detail') else {'error': [str(e)]}
             formatted_errors = {}
             for field, errors in error_details.items():
@@ -362,9 +631,7 @@ class AircraftList(mixins.ListModelMixin,
                 'received_data': dict(request.data) if hasattr(request.data, 'dict') else request.data
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Exception in aircraft creation: {str(e)}", flush=True)
-            import traceback
-            print(traceback.format_exc(), flush=True)
+            logger.exception("Exception in aircraft creation")
             return Response({
                 'status': 'error',
                 'message': f'Server error: {str(e)}',
@@ -372,14 +639,16 @@ class AircraftList(mixins.ListModelMixin,
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AircraftDetail(mixins.RetrieveModelMixin,
+class AircraftDetail(ConditionalGetMixin,
+                     SparseQuerysetMixin,
+                     mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.DestroyModelMixin,
                     generics.GenericAPIView):
     """
     Retrieve, update or delete an Aircraft instance.
     """
-    queryset = Aircraft.objects.all()
+    queryset = Aircraft.objects.select_related('type_certificate')
     serializer_class = AircraftSerializer
 
     def get(self, request, *args, **kwargs):
@@ -398,26 +667,69 @@ class AircraftDetail(mixins.RetrieveModelMixin,
         return self.destroy(request, *args, **kwargs)
 
 
-class AircraftESNDetails(mixins.RetrieveModelMixin,
+class AircraftESNDetails(ConditionalGetMixin,
+                         SparseQuerysetMixin,
+                         mixins.RetrieveModelMixin,
                     generics.GenericAPIView):
     """
-    Retrieve aircraft by ESN.
+    Retrieve aircraft by ESN, compared trimmed and upper-cased through the unique esn_normalized index.
+    Placeholder (all-zero) ESNs identify no aircraft.
     """
     queryset = Aircraft.objects.all()
     serializer_class = AircraftESNSerializer
-    lookup_field = 'esn'
+    lookup_field = 'esn_normalized'
+    lookup_url_kwarg = 'esn'
+
+    def get_object(self):
+        esn = normalize_esn(self.kwargs['esn'])
+        if esn is None:
+            raise Http404
+        self.kwargs['esn'] = esn
+        return super().get_object()
 
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
 
-class ContactList(mixins.ListModelMixin,
+class AircraftRegistrationDetails(ConditionalGetMixin,
+                                  SparseQuerysetMixin,
+                                  mixins.RetrieveModelMixin,
+                                  generics.GenericAPIView):
+    """
+    Retrieve aircraft by the registration mark painted on it. Marks are compared upper-cased without whitespace
+    or dashes (g-dron, G DRON and GDRON are the same) through the registration_mark_normalized index. When a mark
+    was reissued, the active aircraft registered last is returned.
+    """
+    queryset = Aircraft.objects.select_related('type_certificate')
+    serializer_class = AircraftSerializer
+
+    def get_object(self):
+        mark = normalize_registration_mark(self.kwargs['mark'])
+        if mark is None:
+            raise Http404
+        queryset = self.filter_queryset(self.get_queryset()).filter(registration_mark_normalized=mark)
+        instance = queryset.order_by('-status', '-created_at').first()
+        if instance is None:
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    def get(self, request, *args, **kwargs):
+        return self.retrieve(request, *args, **kwargs)
+
+
+class ContactList(ChangeFeedMixin,
+                  ConditionalGetMixin,
+                  SparseQuerysetMixin,
+                  mixins.ListModelMixin,
                 mixins.CreateModelMixin,
                 generics.GenericAPIView):
     """
     List all contacts or create a new contact.
     """
-    queryset = Contact.objects.all()
+    queryset = Contact.objects.select_related('operator', 'person')
+    etag_timestamp_fields = ('updated_at', 'person__updated_at', 'operator__updated_at')
+    tombstone_kind = 'contact'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -432,14 +744,15 @@ class ContactList(mixins.ListModelMixin,
         return self.create(request, *args, **kwargs)
 
 
-class ContactDetail(mixins.RetrieveModelMixin,
+class ContactDetail(SparseQuerysetMixin,
+                    mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.DestroyModelMixin,
                     generics.GenericAPIView):
     """
     Retrieve, update or delete a Contact instance.
     """
-    queryset = Contact.objects.all()
+    queryset = Contact.objects.select_related('operator', 'person')
     serializer_class = ContactSerializer
 
     def get(self, request, *args, **kwargs):
@@ -463,7 +776,10 @@ class ContactDetailPrivilaged(mixins.RetrieveModelMixin,
     """
     Retrieve contact with privileged details.
     """
-    queryset = Contact.objects.all()
+    queryset = Contact.objects.select_related('operator', 'address').prefetch_related(
+        Prefetch('operator__authorized_activities', queryset=Activity.objects.only('id', 'name')),
+        Prefetch('operator__operational_authorizations', queryset=Authorization.objects.only('id', 'title')),
+    )
     serializer_class = PrivilagedContactSerializer
 
     @requires_scope('read:privileged')
@@ -471,13 +787,18 @@ class ContactDetailPrivilaged(mixins.RetrieveModelMixin,
         return self.retrieve(request, *args, **kwargs)
 
 
-class PilotList(mixins.ListModelMixin,
+class PilotList(ChangeFeedMixin,
+                ConditionalGetMixin,
+                SparseQuerysetMixin,
+                mixins.ListModelMixin,
                 mixins.CreateModelMixin,
                 generics.GenericAPIView):
     """
     List all pilots or create a new pilot.
     """
-    queryset = Pilot.objects.all()
+    queryset = Pilot.objects.select_related('operator', 'person')
+    etag_timestamp_fields = ('updated_at', 'person__updated_at', 'operator__updated_at')
+    tombstone_kind = 'pilot'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -492,14 +813,15 @@ class PilotList(mixins.ListModelMixin,
         return self.create(request, *args, **kwargs)
 
 
-class PilotDetail(mixins.RetrieveModelMixin,
+class PilotDetail(SparseQuerysetMixin,
+                  mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.DestroyModelMixin,
                     generics.GenericAPIView):
     """
     Retrieve, update or delete a Pilot instance.
     """
-    queryset = Pilot.objects.all()
+    queryset = Pilot.objects.select_related('operator', 'person')
     serializer_class = PilotSerializer
 
     def get(self, request, *args, **kwargs):
@@ -523,7 +845,9 @@ class PilotDetailPrivilaged(mixins.RetrieveModelMixin,
     """
     Retrieve pilot with privileged details.
     """
-    queryset = Pilot.objects.all()
+    queryset = Pilot.objects.select_related('person').prefetch_related(
+        Prefetch('tests', queryset=Test.objects.only('id', 'name')),
+    )
     serializer_class = PrivilagedPilotSerializer
 
     @requires_scope('read:privileged')
@@ -531,13 +855,18 @@ class PilotDetailPrivilaged(mixins.RetrieveModelMixin,
         return self.retrieve(request, *args, **kwargs)
 
 
-class ManufacturerList(mixins.ListModelMixin,
+class ManufacturerList(VersionedCacheMixin,
+                       ConditionalGetMixin,
+                       FastListMixin,
+                       SparseQuerysetMixin,
+                       mixins.ListModelMixin,
                    generics.GenericAPIView):
     """
     List all manufacturers.
     """
     queryset = Manufacturer.objects.all()
     serializer_class = ManufacturerSerializer
+    cache_namespace = 'manufacturers'
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -551,7 +880,11 @@ class APIView(TemplateView):
     template_name = 'registry/api.html'
 
 
-class RIDModuleList(mixins.ListModelMixin,
+class RIDModuleList(ChangeFeedMixin,
+                    ConditionalGetMixin,
+                    FastListMixin,
+                    SparseQuerysetMixin,
+                    mixins.ListModelMixin,
                     mixins.CreateModelMixin,
                     generics.GenericAPIView):
     """
@@ -559,7 +892,9 @@ class RIDModuleList(mixins.ListModelMixin,
     Supports filtering by operator via ?operator=<uuid> query parameter.
     Supports filtering by aircraft via ?aircraft=<uuid> query parameter.
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
+    etag_timestamp_fields = ('updated_at', 'operator__updated_at', 'aircraft__updated_at')
+    tombstone_kind = 'rid_module'
     
     def get_queryset(self):
         """
@@ -567,7 +902,7 @@ class RIDModuleList(mixins.ListModelMixin,
         Example: GET /api/v1/rid-modules?operator=566d63bb-cb1c-42dc-9a51-baef0d0a8d04
         Example: GET /api/v1/rid-modules?aircraft=566d63bb-cb1c-42dc-9a51-baef0d0a8d04
         """
-        queryset = RIDModule.objects.all()
+        queryset = super().get_queryset()
         operator_id = self.request.query_params.get('operator', None)
         aircraft_id = self.request.query_params.get('aircraft', None)
         
@@ -577,6 +912,17 @@ class RIDModuleList(mixins.ListModelMixin,
             queryset = queryset.filter(aircraft_id=aircraft_id)
         
         return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_updated_since() is not None:
+            # The change feed sends decommissioned modules as tombstones.
+            queryset = queryset.exclude(status='decommissioned')
+        return queryset
+
+    def get_tombstone_querysets(self):
+        decommissioned = self.get_queryset().filter(status='decommissioned', updated_at__gte=self.get_updated_since())
+        return super().get_tombstone_querysets() + [(decommissioned, ('updated_at', 'id'), 'decommissioned')]
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -588,13 +934,14 @@ class RIDModuleList(mixins.ListModelMixin,
     
     @requires_auth
     def post(self, request, *args, **kwargs):
-        print("Received POST data for RID module:", request.data, flush=True)
+        logger.debug("RID module registration received", extra={'payload': request.data})
         
         try:
             serializer = self.get_serializer(data=request.data)
             if not serializer.is_valid():
                 error_details = dict(serializer.errors)
-                print("DEBUG - Validation errors:", error_details, flush=True)
+                logger.info("RID module registration failed validation",
+                            extra={'payload': {'errors': error_details, 'received_data': request.data}})
                 
                 formatted_errors = {}
                 for field, errors in error_details.items():
@@ -615,7 +962,7 @@ class RIDModuleList(mixins.ListModelMixin,
             return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
             
         except ValidationError as e:
-            print(f"ValidationError in RID module creation: {str(e)}", flush=True)
+            logger.warning("ValidationError in RID module creation", extra={'payload': {'errors': e.detail}})
             error_details = dict(e.detail) if hasattr(e, 'detail') else {'error': [str(e)]}
             formatted_errors = {}
             for field, errors in error_details.items():
@@ -630,9 +977,7 @@ class RIDModuleList(mixins.ListModelMixin,
                 'errors': formatted_errors,
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Exception in RID module creation: {str(e)}", flush=True)
-            import traceback
-            print(traceback.format_exc(), flush=True)
+            logger.exception("Exception in RID module creation")
             return Response({
                 'status': 'error',
                 'message': f'Server error: {str(e)}',
@@ -640,14 +985,17 @@ class RIDModuleList(mixins.ListModelMixin,
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class RIDModuleDetail(mixins.RetrieveModelMixin,
+class RIDModuleDetail(ConditionalGetMixin,
+                      SparseQuerysetMixin,
+                      mixins.RetrieveModelMixin,
                      mixins.UpdateModelMixin,
                      mixins.DestroyModelMixin,
                      generics.GenericAPIView):
     """
     Retrieve, update or delete a RID Module instance.
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
+    etag_timestamp_fields = ('updated_at', 'operator__updated_at', 'aircraft__updated_at')
     serializer_class = RIDModuleSerializer
     
     def get(self, request, *args, **kwargs):
@@ -678,70 +1026,223 @@ class RIDModuleDetail(mixins.RetrieveModelMixin,
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class RIDModuleByRIDID(mixins.RetrieveModelMixin,
+class RIDResolutionCacheMixin(object):
+    """
+    Resolves RID modules through registry.cache.rid_cache before touching the database.
+    Only the full representation is cached, ?fields= requests go straight to the database.
+    """
+    resolution_kind = None
+
+    def get_lookup_value(self):
+        """ The identifier as stored, which is also the cache key """
+        return self.kwargs[self.lookup_field]
+
+    def retrieve(self, request, *args, **kwargs):
+        value = self.kwargs[self.lookup_field] = self.get_lookup_value()
+        if requested_fields(request) is not None:
+            return super().retrieve(request, *args, **kwargs)
+        data = rid_cache.get(self.resolution_kind, value)
+        if data is None:
+            generation = rid_cache.generation(self.resolution_kind, value)
+            data = self.get_serializer(self.get_object()).data
+            rid_cache.set(self.resolution_kind, value, data, generation)
+        return Response(data)
+
+
+class RIDModuleByRIDID(RIDResolutionCacheMixin,
+                       SparseQuerysetMixin,
+                       mixins.RetrieveModelMixin,
                        generics.GenericAPIView):
     """
     Retrieve RID module by RID ID.
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
     serializer_class = RIDModuleSerializer
     lookup_field = 'rid_id'
+    resolution_kind = 'rid'
     
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
 
-class RIDModuleByESN(mixins.RetrieveModelMixin,
+class RIDModuleByESN(RIDResolutionCacheMixin,
+                     SparseQuerysetMixin,
+                     mixins.RetrieveModelMixin,
                      generics.GenericAPIView):
     """
-    Retrieve RID module by ESN (Electronic Serial Number).
+    Retrieve RID module by ESN (Electronic Serial Number), trimmed and upper-cased as module ESNs are stored.
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
     serializer_class = RIDModuleSerializer
     lookup_field = 'module_esn'
+    resolution_kind = 'esn'
+
+    def get_lookup_value(self):
+        esn = normalize_esn(self.kwargs[self.lookup_field])
+        if esn is None:
+            raise Http404
+        return esn
     
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
 
-class OperatorRIDModules(mixins.ListModelMixin,
+class OperatorRIDModules(ConditionalGetMixin,
+                         FastListMixin,
+                         SparseQuerysetMixin,
+                         mixins.ListModelMixin,
                         generics.GenericAPIView):
     """
     Retrieve all RID modules for a specific operator.
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
+    etag_timestamp_fields = ('updated_at', 'operator__updated_at', 'aircraft__updated_at')
     serializer_class = RIDModuleSerializer
     
     def get_queryset(self):
         operator_id = self.kwargs.get('pk')
-        return RIDModule.objects.filter(operator_id=operator_id)
+        return super().get_queryset().filter(operator_id=operator_id)
     
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
-class AircraftRIDModules(mixins.ListModelMixin,
+class AircraftRIDModules(ConditionalGetMixin,
+                         FastListMixin,
+                         SparseQuerysetMixin,
+                         mixins.ListModelMixin,
                         generics.GenericAPIView):
     """
     Retrieve all RID modules for a specific aircraft.
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
+    etag_timestamp_fields = ('updated_at', 'operator__updated_at', 'aircraft__updated_at')
     serializer_class = RIDModuleSerializer
     
     def get_queryset(self):
         aircraft_id = self.kwargs.get('pk')
-        return RIDModule.objects.filter(aircraft_id=aircraft_id)
+        return super().get_queryset().filter(aircraft_id=aircraft_id)
     
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
+class RIDModuleResolve(generics.GenericAPIView):
+    """
+    Resolve many RID IDs and / or module ESNs with a single query.
+    POST /api/v1/rid-modules/resolve
+    """
+    queryset = RIDModule.objects.all()
+    serializer_class = RIDModuleResolveSerializer
+    pagination_class = None
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        rid_ids = list(dict.fromkeys(str(rid_id) for rid_id in serializer.validated_data['rid_ids']))
+        module_esns = list(dict.fromkeys(serializer.validated_data['module_esns']))
+        # Results are keyed by the ESNs as sent, looked up as stored (trimmed, upper-cased).
+        stored_esns = {esn: normalize_esn(esn) for esn in module_esns}
+
+        reader = RIDModuleResolutionSerializer.fast_reader()
+        rows = reader.values(self.get_queryset().filter(
+            Q(rid_id__in=rid_ids) | Q(module_esn__in=set(stored_esns.values()) - {None})))
+        by_rid_id, by_esn = {}, {}
+        for module in reader.render(rows):
+            by_rid_id[module['rid_id']] = module
+            by_esn[module['module_esn']] = module
+
+        results, not_found = {}, []
+        for identifiers, found, stored in ((rid_ids, by_rid_id, {}), (module_esns, by_esn, stored_esns)):
+            for identifier in identifiers:
+                key = stored.get(identifier, identifier)
+                if key in found:
+                    results[identifier] = found[key]
+                else:
+                    not_found.append(identifier)
+        return Response({'results': results, 'not_found': not_found})
+
+
+class RIDModuleHeartbeat(generics.GenericAPIView):
+    """
+    Record RID module sightings.
+    POST /api/v1/rid-modules/heartbeat
+    Sightings are buffered and written to last_seen_at in batches by registry.heartbeat.
+    """
+    serializer_class = RIDModuleHeartbeatSerializer
+    pagination_class = None
+
+    @requires_auth
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        now = timezone.now()
+        sightings = []
+        for sighting in serializer.validated_data['sightings']:
+            # Receiver clocks drift, a sighting is never recorded as later than its arrival.
+            seen_at = min(sighting.get('seen_at', now), now)
+            if 'rid_id' in sighting:
+                sightings.append(('rid', str(sighting['rid_id']), seen_at))
+                continue
+            # Matched against module ESNs as stored, trimmed and upper-cased; placeholders identify nothing.
+            esn = normalize_esn(sighting['module_esn'])
+            if esn is not None:
+                sightings.append(('esn', esn, seen_at))
+        heartbeats.add(sightings)
+        return Response({'accepted': len(sightings)}, status=status.HTTP_202_ACCEPTED)
+
+
+class RIDModuleCacheStats(generics.GenericAPIView):
+    """
+    Hit / miss counters of the RID resolution cache in this worker.
+    """
+    pagination_class = None
+
+    @requires_auth
+    def get(self, request, *args, **kwargs):
+        return Response(rid_cache.stats())
+
+
+class RegistryMetrics(generics.GenericAPIView):
+    """
+    Per-route request metrics of every worker in the Prometheus text format.
+    """
+    pagination_class = None
+
+    @requires_auth
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class RegistrySearch(generics.GenericAPIView):
+    """
+    Ranked full-text search over operators (company name and number), aircraft (model, popular name, MACI
+    number and registration mark) and pilots (name).
+    GET /api/v1/search?q=<words>[&type=operator,aircraft,pilot][&limit=20]
+    """
+    serializer_class = SearchQuerySerializer
+    pagination_class = None
+
+    @requires_auth
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        matches = search.search(params['q'], kinds=params['type'], limit=params['limit'])
+        return Response({'query': params['q'], 'results': [
+            {'type': kind, 'id': str(object_id), 'label': label, 'rank': round(rank, 6)}
+            for kind, object_id, label, rank in matches]})
+
+
 class RIDModuleRIDIDUpdate(generics.GenericAPIView):
     """
     Update the RID ID of a RID Module.
     PATCH /api/v1/rid-modules/{module_id}/rid-id
     """
-    queryset = RIDModule.objects.all()
+    queryset = RIDModule.objects.select_related('operator', 'aircraft__type_certificate')
     serializer_class = RIDModuleRIDIDUpdateSerializer
     lookup_field = 'pk'
     
@@ -758,3 +1259,55 @@ class RIDModuleRIDIDUpdate(generics.GenericAPIView):
             return Response(response_serializer.data, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RegistryExport(generics.GenericAPIView):
+    """
+    Streams a full table as NDJSON (default) or CSV.
+    Pick the format with ?format=ndjson|csv, a .ndjson/.csv suffix or the Accept header.
+    Rows are read with a server-side cursor in chunks of REGISTRY_EXPORT_CHUNK_SIZE, so memory stays flat.
+    """
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+    pagination_class = None
+    export_name = None
+
+    @requires_auth
+    def get(self, request, *args, **kwargs):
+        chunk_size = getattr(settings, 'REGISTRY_EXPORT_CHUNK_SIZE', 2000)
+        reader = self.get_serializer_class().fast_reader(requested_fields(request), requested_includes(request))
+        queryset = reader.values(self.get_queryset().order_by('created_at', 'id'))
+        renderer = request.accepted_renderer
+        rows = reader.iter_render(queryset.iterator(chunk_size=chunk_size))
+        response = StreamingHttpResponse(renderer.stream(reader.plan, rows, chunk_size),
+                                         content_type='%s; charset=%s' % (renderer.media_type, renderer.charset))
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (self.export_name, renderer.format)
+        # Tell nginx not to buffer the stream, clients should see rows as soon as they are read.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class OperatorExport(RegistryExport):
+    """
+    Export all operators.
+    """
+    queryset = Operator.objects.all()
+    serializer_class = OperatorSerializer
+    export_name = 'operators'
+
+
+class AircraftExport(RegistryExport):
+    """
+    Export all aircraft.
+    """
+    queryset = Aircraft.objects.all()
+    serializer_class = AircraftSerializer
+    export_name = 'aircraft'
+
+
+class RIDModuleExport(RegistryExport):
+    """
+    Export all RID modules with their operator and aircraft.
+    """
+    queryset = RIDModule.objects.all()
+    serializer_class = RIDModuleSerializer
+    export_name = 'rid-modules'
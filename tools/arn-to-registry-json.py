@@ -1,109 +1,203 @@
-import xml.etree.ElementTree as ET
-import uuid
-import os
-import time
-import logging
-import logging.handlers
-import uuid
-
-class ScriptLogger():
-    def __init__(self):
-        self.log_file_name = 'logs/latest.log'
-        self.path = os.getcwd()
-        self.logpath = os.path.join(self.path, 'logs')
-        if not os.path.exists(self.logpath):
-            os.mkdir(self.logpath)
-        self.logging_level = logging.INFO
-        # set TimedRotatingFileHandler for root
-        self.formatter = logging.Formatter('%(asctime)s %(name)s %(levelname)s %(message)s')
-        # use very short interval for this example, typical 'when' would be 'midnight' and no explicit interval
-        self.handler = logging.handlers.TimedRotatingFileHandler(self.log_file_name, when="S", interval=30, backupCount=10)
-        self.handler.setFormatter(self.formatter)
-        self.logger = logging.getLogger() # or pass string to give it a name
-        self.logger.addHandler(self.handler)
-        self.logger.setLevel(self.logging_level)
-    def getLogger(self):
-        return self.logger
-
-class DataFixtureCreator():
-    def create_operator(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.operator", "pk":id, "fields":{"company_name":"", "website":"", "email":"", "phone_number":"", "operator_type":"", "address":"", "operational_authorizations":"", "authorized_activities":"", "vat_number":"", "insurance_number":"", "company_number":"", "country":""}}
-
-    def create_owner(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.person", "pk":id, "fields":{}}
-
-    def create_contact(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.contact", "pk":id, "fields":{"first_name":"", "middle_name":"", "last_name":"", "email":"", "phone_number":"", "identification_number":""}}
-
-    def create_address(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.address", "pk":id, "fields":{"address_line_1":"", "address_line_2":"", "address_line_3":"", "postcode":"", "city":"", "country":""}}
-
-    def create_manufacturer(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.address", "pk":id, "fields":{"full_name":"", "common_name":"", "address":"","acronym":"", "role":"", "country":""}}
-
-
-    def create_type_certificate(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.typecertificate", "pk":id, "fields":{"type_certificate_id":"", "type_certificate_issuing_country":"", "type_certificate_holder":"", "type_certificate_holder_country":""}}
-
-
-    def create_aircraft(self):
-        id = str(uuid.uuid4())
-        return {"model":"registry.aircraft", "pk":id, "fields":{"operator":"","mass":0,"is_airworthy":1, "make":"", "model":"","master_series":"","series":"","popular_name":"", "manufacturer":"", "category":"","registration_mark":"", "sub_category":"", "icao_aircraft_type_designator":"", "max_certified_takeoff_weight":0,"esn":0, "maci_number":"" , "status":1 }}
-
-
-
-if __name__ == "__main__":    
-    myLogger = ScriptLogger()
-    logger = myLogger.getLogger()
-    myDataFixtureCreator = DataFixtureCreator()
-    output_data = []
-
-    # Global lookup for Aircraft
-    TAG_DICT = {'IRCA_ID':"", "REGISTRATION_MARK":"registration_mark", "MANUFACTURER":"" ,"MAKE":"make", "MODEL":"model","SERIES1":"master_series", "SERIES2":"series","BAPTISM":"popular_name", "SER_NUM":"","OWNER_NAME":"", "OWNER_ADD_1":"address_line_1", "OWNER_ADD_2":"address_line_2", "OWNER_ADD_3":"address_line_3","OWNER_STATE":"", "OPERATOR_NAME":"", "OPERATOR_ADD_1":"address_line_1", "OPERATOR_ADD_2":"address_line_2", "OPERATOR_ADD_3":"address_line_3","OPERATOR_STATE":"", "AUTHORITY":"", "CONTACT":"", "NAT_REG":"", "REGISTRATION_DATE":"", "UPDATE_DATE":""}
-
-    IGNORE_TAG_LIST = ['OWNER_ADD','OPERATOR_ADD']
-
-    # root = ET.parse('icao.xml').getroot()
-    root = ET.parse('ICAO.xml').getroot()
-    
-    search_keys = TAG_DICT.keys();
-    for t in root.findall('.//AIRCRAFT/*'):
-        address_tree = t.getchildren()
-
-        if address_tree:
-            address = myDataFixtureCreator.create_address()
-            for child in address_tree:
-                if child.tag not in search_keys and \
-                    child.tag not in IGNORE_TAG_LIST:
-                        logger.info("%s tag not in Tag Dict and IGNORE LIST" % child.tag)
-                else:
-                    # create JSON
-                    second_level_children = child.getchildren()
-                    if second_level_children: 
-                        # address entities 
-                        for cur_second_level_children in second_level_children: 
-                            # print(TAG_DICT[cur_second_level_children.tag], cur_second_level_children.text)
-                            address['fields'][TAG_DICT[cur_second_level_children.tag]] = cur_second_level_children.text
-                    else:
-                        pass
-            output_data.append(address)
-
-        else:
-            if not t.tag in search_keys:
-                logger.info("%s tag not in Tag Dict" % t.tag)
-                
-            else:
-                # pass
-                print(t.tag, t.text)
-                aircraft = myDataFixtureCreator.create_aircraft()
-                # check if the keys exist
-
-                # create JSON
-
-    # print(output_data)
+"""
+Converts an ICAO / national aircraft register XML export (ARN) into registry fixtures.
+
+The register is read with iterparse and every AIRCRAFT element is cleared once converted, so memory does not
+grow with the number of aircraft; only the keys of the distinct operators and manufacturers are kept, to
+de-duplicate them. Records are written as newline-delimited JSON fixtures (one Django serialized object per
+line, in foreign-key order) and can be loaded with ``python manage.py load_registry registry.jsonl``.
+
+    python tools/arn-to-registry-json.py ICAO.xml -o registry.jsonl
+
+Progress and the conversion rate go to stderr.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+logger = logging.getLogger('arn-to-registry-json')
+
+AIRCRAFT_TAG = 'AIRCRAFT'
+
+# Leaf tags of an AIRCRAFT element, mapped onto Aircraft fields where there is one
+AIRCRAFT_TAGS = {'IRCA_ID': 'maci_number', 'REGISTRATION_MARK': 'registration_mark', 'MANUFACTURER': None,
+                 'MAKE': 'make', 'MODEL': 'model', 'SERIES1': 'master_series', 'SERIES2': 'series',
+                 'BAPTISM': 'popular_name', 'SER_NUM': 'esn', 'OWNER_NAME': None, 'OWNER_STATE': None,
+                 'OPERATOR_NAME': None, 'OPERATOR_STATE': None, 'AUTHORITY': None, 'CONTACT': None,
+                 'NAT_REG': None, 'REGISTRATION_DATE': None, 'UPDATE_DATE': None}
+
+# Address containers and the Address field each of their children maps onto
+ADDRESS_TAGS = {
+    'OWNER_ADD': {'OWNER_ADD_1': 'address_line_1', 'OWNER_ADD_2': 'address_line_2', 'OWNER_ADD_3': 'address_line_3'},
+    'OPERATOR_ADD': {'OPERATOR_ADD_1': 'address_line_1', 'OPERATOR_ADD_2': 'address_line_2',
+                     'OPERATOR_ADD_3': 'address_line_3'},
+}
+
+# Column widths the fixtures must respect (PostgreSQL enforces them on load)
+MAX_LENGTHS = {'registration_mark': 10, 'esn': 48, 'address_line_1': 140, 'address_line_2': 140,
+               'address_line_3': 140, 'company_name': 280, 'full_name': 140, 'common_name': 140,
+               'model': 280, 'make': 280, 'master_series': 280, 'series': 280, 'popular_name': 280,
+               'maci_number': 280}
+
+
+def text(value):
+    return value.strip() if value and value.strip() else ''
+
+
+def clip(fields):
+    for name, length in MAX_LENGTHS.items():
+        if isinstance(fields.get(name), str):
+            fields[name] = fields[name][:length]
+    return fields
+
+
+def country_code(*values):
+    """ First value that looks like an ISO 3166 alpha-2 code, 'NA' otherwise """
+    for value in values:
+        if len(value) == 2 and value.isalpha():
+            return value.upper()
+    return 'NA'
+
+
+def timestamp(value, default):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return default
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.isoformat()
+
+
+class FixtureWriter(object):
+    """
+    Writes fixtures as they are produced. Operators and manufacturers are de-duplicated by name
+    (and address for operators): their keys stay in memory, one entry per distinct operator or manufacturer.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.now = datetime.now(timezone.utc).isoformat()
+        self.operators = {}
+        self.manufacturers = {}
+        self.counts = {'address': 0, 'operator': 0, 'manufacturer': 0, 'aircraft': 0}
+
+    def write(self, model, fields, created_at=None):
+        pk = str(uuid.uuid4())
+        fields['created_at'] = created_at or self.now
+        fields['updated_at'] = self.now
+        self.out.write(json.dumps({'model': 'registry.' + model, 'pk': pk, 'fields': clip(fields)},
+                                  ensure_ascii=False, separators=(',', ':')))
+        self.out.write('\n')
+        self.counts[model] += 1
+        return pk
+
+    def operator(self, name, address, country):
+        key = (name, address.get('address_line_1', ''), address.get('address_line_2', ''), country)
+        pk = self.operators.get(key)
+        if pk is None:
+            address_pk = self.write('address', {
+                'address_line_1': address.get('address_line_1', ''), 'address_line_2': address.get('address_line_2', ''),
+                'address_line_3': address.get('address_line_3', ''), 'postcode': '0', 'city': '',
+                'country': country,
+            })
+            pk = self.operators[key] = self.write('operator', {
+                'company_name': name, 'website': '', 'email': '', 'phone_number': '', 'operator_type': 0,
+                'address': address_pk, 'country': country,
+            })
+        return pk
+
+    def manufacturer(self, name, make, country):
+        pk = self.manufacturers.get(name)
+        if pk is None:
+            pk = self.manufacturers[name] = self.write('manufacturer', {
+                'full_name': name, 'common_name': make or name, 'country': country,
+            })
+        return pk
+
+    def aircraft(self, element, unknown_tags):
+        values, addresses = {}, {}
+        for child in element:
+            if child.tag in ADDRESS_TAGS:
+                lines = ADDRESS_TAGS[child.tag]
+                addresses[child.tag] = {lines[line.tag]: text(line.text) for line in child if line.tag in lines}
+            elif child.tag in AIRCRAFT_TAGS:
+                values[child.tag] = text(child.text)
+            elif child.tag not in unknown_tags:
+                unknown_tags.add(child.tag)
+                logger.info("%s tag not in AIRCRAFT_TAGS or ADDRESS_TAGS", child.tag)
+
+        # The operator flies the aircraft; registers that only record an owner get the owner instead.
+        if values.get('OPERATOR_NAME'):
+            name, address, state = values['OPERATOR_NAME'], addresses.get('OPERATOR_ADD', {}), values.get('OPERATOR_STATE', '')
+        else:
+            name, address, state = values.get('OWNER_NAME', ''), addresses.get('OWNER_ADD', {}), values.get('OWNER_STATE', '')
+        country = country_code(state, values.get('NAT_REG', ''))
+        operator = self.operator(name or 'Unknown operator', address, country)
+
+        manufacturer_name = values.get('MANUFACTURER') or values.get('MAKE') or 'Unknown manufacturer'
+        manufacturer = self.manufacturer(manufacturer_name, values.get('MAKE', ''), country)
+
+        fields = {field: values[tag] for tag, field in AIRCRAFT_TAGS.items() if field and values.get(tag)}
+        fields.update({'operator': operator, 'manufacturer': manufacturer, 'mass': 0, 'is_airworthy': True,
+                       'status': 1})
+        fields.setdefault('model', values.get('MAKE', '') or 'Unknown')
+        fields.setdefault('maci_number', values.get('REGISTRATION_MARK', ''))
+        created_at = timestamp(values.get('REGISTRATION_DATE', ''), None)
+        self.write('aircraft', fields, created_at)
+
+
+def convert(source, out, progress_every=10000, err=sys.stderr):
+    writer = FixtureWriter(out)
+    unknown_tags = set()
+    start = time.perf_counter()
+    # Open elements, innermost last
+    parents = []
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag != AIRCRAFT_TAG:
+            continue
+        writer.aircraft(element, unknown_tags)
+        # Drop the converted subtree from whatever element holds it, AIRCRAFT need not sit directly under the root.
+        element.clear()
+        if parents:
+            parents[-1].clear()
+        if progress_every and writer.counts['aircraft'] % progress_every == 0:
+            report(writer, start, err)
+    report(writer, start, err, final=True)
+    return writer.counts
+
+
+def report(writer, start, err, final=False):
+    elapsed = time.perf_counter() - start
+    rows = sum(writer.counts.values())
+    rate = rows / elapsed if elapsed else 0
+    counts = ', '.join('%d %s' % (count, model) for model, count in writer.counts.items())
+    err.write('%s%s in %.1fs, %.0f rows/s\n' % ('Done: ' if final else '', counts, elapsed, rate))
+    err.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('source', nargs='?', default='ICAO.xml', help='Register XML file (default ICAO.xml)')
+    parser.add_argument('-o', '--output', default='-', help='NDJSON fixture file, "-" for stdout (default)')
+    parser.add_argument('--progress-every', type=int, default=10000, help='Aircraft between progress lines')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    if args.output == '-':
+        convert(args.source, sys.stdout, args.progress_every)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            convert(args.source, out, args.progress_every)
+
+
+if __name__ == "__main__":
+    main()